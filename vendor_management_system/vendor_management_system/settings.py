@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 from datetime import timedelta
 
@@ -26,6 +28,9 @@ SECRET_KEY = "django-insecure-4gn(sirdt2*19v#cy6xd8hv^mk)5vx&ejjf6ph0i)3r_3q5mx2
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# Running under "manage.py test".
+TESTING = sys.argv[1:2] == ["test"]
+
 ALLOWED_HOSTS = []
 
 
@@ -39,10 +44,12 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    "rest_framework_simplejwt.token_blacklist",
     "vendors",
 ]
 
 MIDDLEWARE = [
+    "vendors.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -76,11 +83,72 @@ WSGI_APPLICATION = "vendor_management_system.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# The profile is selected with the VMS_DATABASE_PROFILE environment variable.
+
+DATABASE_PROFILE = os.environ.get("VMS_DATABASE_PROFILE", "sqlite")
+
+if DATABASE_PROFILE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("POSTGRES_DB", "vendor_management"),
+            "USER": os.environ.get("POSTGRES_USER", "postgres"),
+            "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+            "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
+            "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+            # Persistent connections, checked before reuse.
+            "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CONN_MAX_AGE", "600")),
+            "CONN_HEALTH_CHECKS": True,
+            # Run the grouped vendor metric aggregates per partition once the
+            # purchase orders are partitioned (partition_purchase_orders).
+            "OPTIONS": {"options": "-c enable_partitionwise_aggregate=on"},
+            # Server-side cursors stream the export querysets. Disable them
+            # behind a transaction-pooling PgBouncer.
+            "DISABLE_SERVER_SIDE_CURSORS": os.environ.get(
+                "POSTGRES_DISABLE_SERVER_SIDE_CURSORS"
+            )
+            == "1",
+        }
+    }
+elif DATABASE_PROFILE == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": 60,
+            "OPTIONS": {
+                # Seconds to wait on a locked database before failing.
+                "timeout": 20,
+            },
+        }
     }
+else:
+    raise ValueError(f"Unknown VMS_DATABASE_PROFILE {DATABASE_PROFILE!r}")
+
+# Applied to every new SQLite connection (see vendors.db). WAL lets readers run
+# alongside the single writer, NORMAL sync is durable in WAL mode except on
+# power loss, and the mmap size is in bytes.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 20000,
+    "mmap_size": 256 * 1024 * 1024,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# The local-memory backend evicts least recently used entries past MAX_ENTRIES.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "vendor_performance": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "vendor-performance",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
 }
 
 
@@ -126,15 +194,103 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
+# Page size of the keyset-paginated list endpoints (?page_size= up to the max)
+API_PAGE_SIZE = 100
+API_MAX_PAGE_SIZE = 1000
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "vendors.authentication.CachedJWTAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "vendors.instrumentation.InstrumentedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ],
 }
 
+# Per request instrumentation (vendors.instrumentation): query count, SQL and
+# serialization time and duplicated statements in a Server-Timing header, and
+# histograms served by GET /api/_metrics/. Off unless VMS_API_INSTRUMENTATION=1.
+API_INSTRUMENTATION = os.environ.get("VMS_API_INSTRUMENTATION") == "1"
+# A statement run this many times in one request is reported as an N+1 pattern.
+API_INSTRUMENTATION_DUPLICATE_THRESHOLD = 5
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=3),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
 }
+
+# JWT authentication caches (vendors.authentication): user rows are cached per
+# process for JWT_USER_CACHE_TTL seconds, the blacklisted token ids are
+# reloaded in the background every JWT_BLACKLIST_REFRESH_INTERVAL seconds. The
+# test suite loads them once: a reload thread would outlive the tests' data.
+JWT_USER_CACHE_TTL = 60
+JWT_USER_CACHE_MAX_ENTRIES = 10000
+JWT_BLACKLIST_REFRESH_INTERVAL = None if TESTING else 30
+
+# Vendor metrics
+# When deferred, purchase order writes only queue their vendor and the
+# process_metrics_queue command recomputes queued vendors every interval.
+VENDOR_METRICS_DEFERRED = False
+VENDOR_METRICS_QUEUE_INTERVAL = 5.0
+
+# Weights of the rates in Vendor.performance_score. After changing them run
+# recompute_vendor_metrics to rescore the stored vendors.
+VENDOR_SCORE_WEIGHTS = {
+    "on_time_delivery_rate": 0.4,
+    "quality_rating_avg": 0.3,
+    "fulfillment_rate": 0.3,
+}
+
+# Largest ``limit`` of GET /api/vendors/ranking/
+VENDOR_RANKING_MAX_LIMIT = 100
+
+# Bulk purchase order ingestion (POST /api/purchase_orders/bulk/)
+PURCHASE_ORDER_BULK_MAX_ROWS = 10000
+PURCHASE_ORDER_BULK_BATCH_SIZE = 500
+PURCHASE_ORDER_BULK_BATCH_SIZE_MAX = 5000
+
+# Period of the HistoricalPerfomance rows written by snapshot_vendor_performance
+VENDOR_PERFORMANCE_SNAPSHOT_INTERVAL = "day"
+
+# Rows fetched per database round trip by the streaming export endpoints
+EXPORT_CHUNK_SIZE = 2000
+
+# Cache alias and timeout (seconds) of the vendor performance payloads
+VENDOR_PERFORMANCE_CACHE = "vendor_performance"
+VENDOR_PERFORMANCE_CACHE_TIMEOUT = 300
+
+# Cache alias and timeout (seconds) of the /api/analytics/ reports, which are
+# also recomputed whenever a purchase order changes
+ANALYTICS_CACHE = "default"
+ANALYTICS_CACHE_TIMEOUT = 300
+
+# Periodic jobs of the run_scheduler command: name -> dotted path of the task
+# and either an "interval" in seconds or a five field "cron" expression in
+# TIME_ZONE. Several scheduler nodes can share the job table, each run is
+# locked by one node for at most SCHEDULER_LOCK_TIMEOUT seconds.
+SCHEDULER_JOBS = {
+    "snapshot_vendor_kpis": {
+        "task": "vendors.jobs.snapshot_vendor_kpis",
+        "cron": "55 23 * * *",
+    },
+    # With a VENDOR_PERFORMANCE_CACHE shared by the app servers, the performance
+    # payloads can be kept warm more often than VENDOR_PERFORMANCE_CACHE_TIMEOUT:
+    # "warm_vendor_performance": {
+    #     "task": "vendors.jobs.warm_vendor_performance",
+    #     "interval": 240,
+    # },
+}
+SCHEDULER_WORKERS = 4
+SCHEDULER_POLL_INTERVAL = 5.0
+SCHEDULER_LOCK_TIMEOUT = 3600
+
+# Columnar archive of old completed purchase orders (archive_purchase_orders),
+# disabled while None. Archived purchase orders are only found by po_number
+# while it points at their segment files.
+PURCHASE_ORDER_ARCHIVE_DIR = None
+# Completed purchase orders issued more than this many days ago are archived
+PURCHASE_ORDER_ARCHIVE_HORIZON_DAYS = 365
+PURCHASE_ORDER_ARCHIVE_SEGMENT_ROWS = 100000
@@ -1,6 +1,7 @@
 from django.contrib import admin
-from .models import Vendor, PurchaseOrder, HistoricalPerfomance
+from .models import Vendor, PurchaseOrder, HistoricalPerfomance, ScheduledJob
 
 admin.site.register(Vendor)
 admin.site.register(PurchaseOrder)
 admin.site.register(HistoricalPerfomance)
+admin.site.register(ScheduledJob)
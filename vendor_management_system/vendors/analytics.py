@@ -0,0 +1,262 @@
+import hashlib
+import math
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+from .conditional import LIST_VERSION
+from .metrics import SECONDS_PER_DAY
+from .models import PurchaseOrder, ON_TIME_GRACE_PERIOD
+
+try:
+    import numpy as np
+except ImportError:  # optional, see requirements-analytics.txt
+    np = None
+
+# Purchase order columns the reports are computed from, read once per report.
+COLUMNS = (
+    "vendor_id",
+    "status",
+    "issue_date",
+    "delivery_date",
+    "acknowledgment_date",
+    "quality_rating",
+)
+DEFAULT_PERCENTILES = (50.0, 75.0, 90.0, 95.0, 99.0)
+
+
+def available():
+    return np is not None
+
+
+# POSIX seconds of a column of raw datetime values, NaN for NULL. SQLite
+# returns ISO strings (UTC), parsed by numpy in one call; drivers returning
+# datetime objects are converted one value at a time.
+def _timestamps(values):
+    if any(isinstance(value, str) for value in values):
+        parsed = np.array(values, dtype="datetime64[us]")
+        seconds = parsed.astype(np.int64) / 1e6
+        seconds[np.isnat(parsed)] = np.nan
+        return seconds
+    return np.array(
+        [value.timestamp() if value is not None else math.nan for value in values]
+    )
+
+
+@dataclass
+class PurchaseOrderColumns:
+    # One array per column, a row per purchase order. Vendors are coded as
+    # indexes into the sorted ``vendor_ids`` so that grouping by vendor is a
+    # bincount. Datetimes are POSIX seconds, missing values NaN.
+    vendor_ids: "np.ndarray"
+    vendor: "np.ndarray"
+    completed: "np.ndarray"
+    issue: "np.ndarray"
+    delivery: "np.ndarray"
+    acknowledgment: "np.ndarray"
+    quality_rating: "np.ndarray"
+
+    @classmethod
+    def load(cls, queryset=None, chunk_size=20000):
+        if queryset is None:
+            queryset = PurchaseOrder.objects.all()
+        # Raw cursor rows skip Django's per value converters, the columns of
+        # each fetched chunk are converted by numpy instead.
+        sql, params = queryset.order_by().values_list(*COLUMNS).query.sql_with_params()
+        chunks = {name: [] for name in COLUMNS}
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(sql, params)
+            while rows := cursor.fetchmany(chunk_size):
+                cls._add_chunk(chunks, rows)
+        cls._add_chunk(chunks, [])
+        vendor_ids, vendor = np.unique(
+            np.concatenate(chunks["vendor_id"]), return_inverse=True
+        )
+        columns = {name: np.concatenate(chunks[name]) for name in COLUMNS[1:]}
+        return cls(
+            vendor_ids=vendor_ids,
+            vendor=vendor,
+            completed=columns["status"],
+            issue=columns["issue_date"],
+            delivery=columns["delivery_date"],
+            acknowledgment=columns["acknowledgment_date"],
+            quality_rating=columns["quality_rating"],
+        )
+
+    @staticmethod
+    def _add_chunk(chunks, chunk):
+        # Transpose the rows of a chunk into one array per column.
+        if not chunk:
+            for name, dtype in zip(COLUMNS, (np.int64, bool) + (float,) * 4):
+                chunks[name].append(np.empty(0, dtype=dtype))
+            return
+        vendor, status, issue, delivery, acknowledgment, rating = zip(*chunk)
+        chunks["vendor_id"].append(np.array(vendor, dtype=np.int64))
+        chunks["status"].append(np.array(status) == "completed")
+        chunks["issue_date"].append(_timestamps(issue))
+        chunks["delivery_date"].append(_timestamps(delivery))
+        chunks["acknowledgment_date"].append(_timestamps(acknowledgment))
+        chunks["quality_rating"].append(np.array(rating, dtype=float))
+
+    def __len__(self):
+        return len(self.vendor)
+
+    def on_time(self):
+        grace = ON_TIME_GRACE_PERIOD.total_seconds()
+        return self.completed & (self.delivery <= self.issue + grace)
+
+    def response_days(self):
+        # Days from issue to acknowledgment of the completed, acknowledged
+        # orders (as in the vendor metrics), NaN for the other rows.
+        days = (self.acknowledgment - self.issue) / SECONDS_PER_DAY
+        return np.where(self.completed, days, np.nan)
+
+    def rated(self):
+        return self.completed & ~np.isnan(self.quality_rating)
+
+    def months(self):
+        # Month of the issue date (UTC) of each row, as datetime64[M].
+        seconds = np.floor(self.issue).astype(np.int64)
+        return seconds.astype("datetime64[s]").astype("datetime64[M]")
+
+    def group_kpis(self, groups, group_count):
+        # The vendor metric counters and rates summed per group index.
+        def total(mask=None, values=None):
+            weights = None
+            if values is not None:
+                weights = np.where(mask, values, 0.0)
+            elif mask is not None:
+                weights = mask.astype(float)
+            return np.bincount(groups, weights=weights, minlength=group_count)
+
+        responses = self.response_days()
+        responded = ~np.isnan(responses)
+        rated = self.rated()
+        counters = {
+            "total_pos": total(),
+            "completed_pos": total(self.completed),
+            "on_time_pos": total(self.on_time()),
+            "quality_rating_sum": total(rated, self.quality_rating),
+            "quality_rating_count": total(rated),
+            "response_time_sum": total(responded, responses),
+            "response_time_count": total(responded),
+        }
+        rates = {
+            "on_time_delivery_rate": 100
+            * _ratio(counters["on_time_pos"], counters["completed_pos"]),
+            "quality_rating_avg": _ratio(
+                counters["quality_rating_sum"], counters["quality_rating_count"]
+            ),
+            "average_response_time": _ratio(
+                counters["response_time_sum"], counters["response_time_count"]
+            ),
+            "fulfillment_rate": 100
+            * _ratio(counters["completed_pos"], counters["total_pos"]),
+        }
+        return counters, rates
+
+    def vendor_kpis(self):
+        return self.group_kpis(self.vendor, len(self.vendor_ids))
+
+
+# Element-wise numerator / denominator, 0 where the denominator is 0, like the
+# rate properties of VendorMetrics.
+def _ratio(numerator, denominator):
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros_like(numerator, dtype=float),
+        where=denominator > 0,
+    )
+
+
+def describe(values, percentiles):
+    # Count, mean and the percentiles (linear interpolation) of ``values``.
+    if not len(values):
+        return {
+            "count": 0,
+            "mean": None,
+            "percentiles": {f"p{p:g}": None for p in percentiles},
+        }
+    results = np.percentile(values, percentiles)
+    return {
+        "count": int(len(values)),
+        "mean": float(values.mean()),
+        "percentiles": {f"p{p:g}": float(v) for p, v in zip(percentiles, results)},
+    }
+
+
+# Percentiles of the response time in days, over the completed and
+# acknowledged purchase orders and over the vendors' average response times.
+def response_time_report(columns, percentiles=DEFAULT_PERCENTILES):
+    responses = columns.response_days()
+    counters, rates = columns.vendor_kpis()
+    responding = counters["response_time_count"] > 0
+    return {
+        "purchase_orders": describe(responses[~np.isnan(responses)], percentiles),
+        "vendors": describe(rates["average_response_time"][responding], percentiles),
+    }
+
+
+# Histogram of the vendors' on-time delivery rates in ``bins`` equal bins from
+# 0 to 100, over the vendors with completed purchase orders.
+def on_time_histogram_report(columns, bins=10):
+    counters, rates = columns.vendor_kpis()
+    on_time = rates["on_time_delivery_rate"][counters["completed_pos"] > 0]
+    counts, edges = np.histogram(on_time, bins=bins, range=(0.0, 100.0))
+    return {
+        "vendors": int(len(on_time)),
+        "mean": float(on_time.mean()) if len(on_time) else None,
+        "bins": [
+            {"from": float(low), "to": float(high), "vendors": int(count)}
+            for low, high, count in zip(edges[:-1], edges[1:], counts)
+        ],
+    }
+
+
+# KPIs of the purchase orders issued in each month, oldest first, with the
+# number of vendors the month's orders went to.
+def monthly_cohort_report(columns):
+    months, month = np.unique(columns.months(), return_inverse=True)
+    counters, rates = columns.group_kpis(month, len(months))
+    vendor_months = np.unique(month * len(columns.vendor_ids) + columns.vendor)
+    vendors = np.bincount(
+        vendor_months // max(len(columns.vendor_ids), 1), minlength=len(months)
+    )
+    return [
+        {
+            "month": str(months[index]),
+            "vendors": int(vendors[index]),
+            "total_pos": int(counters["total_pos"][index]),
+            "completed_pos": int(counters["completed_pos"][index]),
+            **{field: float(values[index]) for field, values in rates.items()},
+        }
+        for index in range(len(months))
+    ]
+
+
+REPORTS = {
+    "response_times": response_time_report,
+    "on_time_histogram": on_time_histogram_report,
+    "cohorts": monthly_cohort_report,
+}
+
+
+# Run the report ``name`` over the purchase orders of ``queryset``. Results are
+# cached under the version of the rows (MAX(updated_at) and COUNT(*), see
+# conditional.py), so any write to them recomputes the report.
+def run_report(name, queryset=None, **params):
+    if queryset is None:
+        queryset = PurchaseOrder.objects.all()
+    version = queryset.order_by().aggregate(**LIST_VERSION)
+    key = hashlib.md5(
+        repr((name, str(queryset.query), sorted(params.items()), version)).encode()
+    ).hexdigest()
+    cache = caches[settings.ANALYTICS_CACHE]
+    result = cache.get(f"analytics:{key}")
+    if result is None:
+        result = REPORTS[name](PurchaseOrderColumns.load(queryset), **params)
+        cache.set(f"analytics:{key}", result, settings.ANALYTICS_CACHE_TIMEOUT)
+    return result
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class VendorsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vendors'
+
+    def ready(self):
+        from . import authentication  # noqa: F401, connects the user cache receivers
+        from .db import configure_sqlite_connection
+
+        connection_created.connect(configure_sqlite_connection)
@@ -0,0 +1,286 @@
+import json
+import os
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+
+from .models import (
+    ArchivedPurchaseOrderRollup,
+    METRIC_COUNTER_FIELDS,
+    PurchaseOrder,
+    PurchaseOrderArchiveSegment,
+    PurchaseOrderLineItem,
+    archive_enabled,
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional, see requirements-analytics.txt
+    np = None
+
+# Columns of an archived purchase order. Only completed orders are archived,
+# so the status is not stored.
+DATETIME_COLUMNS = (
+    "order_date",
+    "delivery_date",
+    "issue_date",
+    "acknowledgment_date",
+    "updated_at",
+)
+COLUMNS = (
+    ("id", "vendor_id", "po_number", "quantity", "quality_rating", "items")
+    + DATETIME_COLUMNS
+)
+# Rows of ``items`` compressed together, the unit decompressed by a lookup.
+ITEMS_BLOCK_ROWS = 256
+
+
+def available():
+    return np is not None
+
+
+def archive_dir():
+    return Path(settings.PURCHASE_ORDER_ARCHIVE_DIR)
+
+
+def segment_paths(name):
+    # Rows, compressed items blocks and po_number index of a segment.
+    return tuple(
+        archive_dir() / f"{name}.{part}.npy" for part in ("rows", "items", "index")
+    )
+
+
+def _datetimes(values):
+    return np.array(
+        [
+            value.astimezone(dt_timezone.utc).replace(tzinfo=None) if value else None
+            for value in values
+        ],
+        dtype="datetime64[us]",
+    )
+
+
+def _datetime(value):
+    if np.isnat(value):
+        return None
+    return value.astype(datetime).replace(tzinfo=dt_timezone.utc)
+
+
+# Compressed blocks of ITEMS_BLOCK_ROWS JSON encoded ``items`` values, as one
+# byte array and the offsets of the blocks in it.
+def _items_blocks(items):
+    blocks = [
+        zlib.compress(
+            json.dumps(items[start : start + ITEMS_BLOCK_ROWS]).encode(), level=9
+        )
+        for start in range(0, len(items), ITEMS_BLOCK_ROWS)
+    ]
+    offsets = np.cumsum([0] + [len(block) for block in blocks], dtype=np.int64)
+    return np.frombuffer(b"".join(blocks), dtype=np.uint8), offsets
+
+
+# Write the rows (dicts of COLUMNS) as segment ``name``, in three .npy files
+# that lookups memory-map: the rows as uncompressed fixed size records (with
+# the offsets of their items block), the items blocks, and the po_numbers
+# (UTF-8, sorted) with their row. Files are renamed into place once complete.
+def write_segment(name, rows):
+    rows_path, items_path, index_path = segment_paths(name)
+    rows_path.parent.mkdir(parents=True, exist_ok=True)
+    po_numbers = np.array([row["po_number"].encode() for row in rows], dtype=bytes)
+    items, items_offsets = _items_blocks([row["items"] for row in rows])
+    blocks = np.arange(len(rows)) // ITEMS_BLOCK_ROWS
+    records = np.empty(
+        len(rows),
+        dtype=[
+            ("id", np.int64),
+            ("vendor_id", np.int64),
+            ("po_number", po_numbers.dtype),
+            ("quantity", np.int64),
+            ("quality_rating", float),
+            ("items_start", np.int64),
+            ("items_end", np.int64),
+            *[(name, "datetime64[us]") for name in DATETIME_COLUMNS],
+        ],
+    )
+    for column in ("id", "vendor_id", "quantity"):
+        records[column] = [row[column] for row in rows]
+    records["po_number"] = po_numbers
+    records["quality_rating"] = np.array(
+        [row["quality_rating"] for row in rows], dtype=float
+    )
+    records["items_start"] = items_offsets[blocks]
+    records["items_end"] = items_offsets[blocks + 1]
+    for column in DATETIME_COLUMNS:
+        records[column] = _datetimes([row[column] for row in rows])
+    index = np.empty(
+        len(rows), dtype=[("po_number", po_numbers.dtype), ("row", np.uint32)]
+    )
+    index["po_number"] = po_numbers
+    index["row"] = np.arange(len(rows))
+    index.sort(order="po_number")
+
+    paths = {items_path: items, index_path: index, rows_path: records}
+    for path, array in paths.items():
+        with open(f"{path}.tmp", "wb") as file:
+            np.save(file, array)
+    for path in paths:
+        os.replace(f"{path}.tmp", path)
+    return sum(path.stat().st_size for path in paths)
+
+
+# Rollup counters of ``rows`` per vendor, as PurchaseOrder.metric_contribution.
+def rollup_counters(rows):
+    counters = {}
+    purchase_order = PurchaseOrder()
+    for row in rows:
+        contribution = purchase_order.metric_contribution(
+            (
+                row["vendor_id"],
+                "completed",
+                row["delivery_date"],
+                row["issue_date"],
+                row["quality_rating"],
+                row["acknowledgment_date"],
+            ),
+        )
+        totals = counters.setdefault(
+            row["vendor_id"], dict.fromkeys(METRIC_COUNTER_FIELDS, 0)
+        )
+        for field, value in contribution.items():
+            totals[field] += value
+    return counters
+
+
+def _add_to_rollups(counters):
+    rollups = ArchivedPurchaseOrderRollup.objects.select_for_update().in_bulk(
+        list(counters)
+    )
+    created, updated = [], []
+    for vendor_id, totals in counters.items():
+        rollup = rollups.get(vendor_id)
+        if rollup is None:
+            created.append(ArchivedPurchaseOrderRollup(vendor_id=vendor_id, **totals))
+            continue
+        for field, value in totals.items():
+            setattr(rollup, field, getattr(rollup, field) + value)
+        updated.append(rollup)
+    ArchivedPurchaseOrderRollup.objects.bulk_create(created)
+    ArchivedPurchaseOrderRollup.objects.bulk_update(updated, METRIC_COUNTER_FIELDS)
+
+
+def archivable(before):
+    return PurchaseOrder.objects.filter(status="completed", issue_date__lt=before)
+
+
+@dataclass
+class ArchiveResult:
+    segments: int = 0
+    purchase_orders: int = 0
+    bytes: int = 0
+
+
+# Move the completed purchase orders issued before ``before`` into segments of
+# at most ``segment_rows`` rows. Per segment, one transaction reads and locks
+# the rows, writes the files, adds the rows' counters to the vendor rollups,
+# deletes the rows and their line items and registers the segment. The rows
+# are deleted without the purchase order signals, the vendors' stored metrics
+# are unchanged: what leaves the live aggregates enters the rollups.
+def archive_purchase_orders(before, segment_rows=None):
+    segment_rows = segment_rows or settings.PURCHASE_ORDER_ARCHIVE_SEGMENT_ROWS
+    result = ArchiveResult()
+    while True:
+        with transaction.atomic():
+            rows = list(
+                archivable(before)
+                .select_for_update()
+                .order_by("issue_date", "id")
+                .values(*COLUMNS)[:segment_rows]
+            )
+            if not rows:
+                return result
+            number = PurchaseOrderArchiveSegment.objects.aggregate(Max("pk"))
+            name = f"segment-{(number['pk__max'] or 0) + 1:06d}"
+            size = write_segment(name, rows)
+            _add_to_rollups(rollup_counters(rows))
+            # The rows read are the archivable ones up to the last (issue_date,
+            # id), deleted by that range rather than by a list of ids.
+            last = rows[-1]
+            archived = archivable(before).filter(
+                Q(issue_date__lt=last["issue_date"])
+                | Q(issue_date=last["issue_date"], id__lte=last["id"])
+            )
+            PurchaseOrderLineItem.objects.filter(purchase_order__in=archived).delete()
+            deleted = archived._raw_delete(archived.db)
+            if deleted != len(rows):
+                raise RuntimeError(
+                    f"Archived {len(rows)} purchase orders but deleted {deleted}."
+                )
+            PurchaseOrderArchiveSegment.objects.create(
+                name=name,
+                row_count=len(rows),
+                size_bytes=size,
+                first_issue_date=rows[0]["issue_date"],
+                last_issue_date=rows[-1]["issue_date"],
+            )
+        result.segments += 1
+        result.purchase_orders += len(rows)
+        result.bytes += size
+
+
+# Segment files are immutable once registered, so their memory maps can be
+# kept. A lookup only pages in the index entries it compares, one record and
+# one items block.
+@lru_cache(maxsize=1024)
+def _memory_map(path):
+    return np.load(path, mmap_mode="r")
+
+
+def _find_row(index, po_number):
+    numbers = index["po_number"]
+    if len(po_number) > numbers.dtype.itemsize:
+        return None
+    position = int(np.searchsorted(numbers, po_number))
+    if position < len(numbers) and numbers[position] == po_number:
+        return int(index["row"][position])
+    return None
+
+
+def _purchase_order(record, items, row):
+    block = items[record["items_start"] : record["items_end"]].tobytes()
+    quality_rating = float(record["quality_rating"])
+    return PurchaseOrder(
+        id=int(record["id"]),
+        vendor_id=int(record["vendor_id"]),
+        po_number=record["po_number"].decode(),
+        quantity=int(record["quantity"]),
+        quality_rating=None if np.isnan(quality_rating) else quality_rating,
+        items=json.loads(zlib.decompress(block))[row % ITEMS_BLOCK_ROWS],
+        status="completed",
+        **{name: _datetime(record[name]) for name in DATETIME_COLUMNS},
+    )
+
+
+# The archived purchase order ``po_number`` as an unsaved PurchaseOrder, or
+# None. Each segment is searched with a binary search of its memory-mapped
+# index, newest segment first.
+def find_archived_purchase_order(po_number):
+    if np is None or not archive_enabled():
+        return None
+    key = po_number.encode()
+    names = PurchaseOrderArchiveSegment.objects.order_by("-pk").values_list(
+        "name", flat=True
+    )
+    for name in names:
+        rows_path, items_path, index_path = segment_paths(name)
+        row = _find_row(_memory_map(index_path), key)
+        if row is not None:
+            return _purchase_order(
+                _memory_map(rows_path)[row], _memory_map(items_path), row
+            )
+    return None
@@ -0,0 +1,172 @@
+from django.http import Http404, HttpResponse
+from django.shortcuts import aget_object_or_404
+from django.utils.http import parse_etags
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+
+from .authentication import AsyncJWTAuthentication
+from .cache import performance_cache
+from .conditional import LIST_VERSION, Validators, arow_version
+from .instrumentation import InstrumentedJSONRenderer
+from .metrics import acompute_vendor_metrics
+from .models import Vendor, PurchaseOrder
+from .pagination import KeysetPagination
+from .serializers import VendorSerializer, PurchaseOrderSerializer
+from .views import ValuesListMixin
+
+
+class AsyncAPIView(View):
+    # Read-only API view running on the event loop under ASGI. It mirrors the
+    # DRF views it shadows: JWT authentication, IsAuthenticated, DRF error
+    # bodies and the same JSON rendering, but every database access goes
+    # through the async ORM so a request never holds a worker thread.
+    http_method_names = ["get", "options"]
+    authentication = AsyncJWTAuthentication()
+    renderer = InstrumentedJSONRenderer()
+    serializer_class = None
+
+    def get_serializer_class(self):
+        return self.serializer_class
+
+    def get_serializer_context(self):
+        return {"request": self.request, "view": self}
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("context", self.get_serializer_context())
+        return self.get_serializer_class()(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        return queryset
+
+    def render(self, data, status=status.HTTP_200_OK, headers=None):
+        response = HttpResponse(
+            self.renderer.render(data) if data is not None else b"",
+            content_type=self.renderer.media_type,
+            status=status,
+            headers=headers,
+        )
+        response["Vary"] = "Accept"
+        return response
+
+    def handle_exception(self, exc):
+        if isinstance(exc, Http404):
+            exc = exceptions.NotFound(*exc.args)
+        if not isinstance(exc, exceptions.APIException):
+            raise exc
+        headers = {}
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            exc.status_code = status.HTTP_401_UNAUTHORIZED
+            headers["WWW-Authenticate"] = self.authentication.authenticate_header(
+                self.request
+            )
+        data = exc.detail
+        if not isinstance(data, (list, dict)):
+            data = {"detail": data}
+        return self.render(data, status=exc.status_code, headers=headers)
+
+    def precondition_response(self, validators):
+        # Bodiless 304 or 412 answer of a conditional request, if any.
+        status_code = validators.precondition_status(self.request)
+        if status_code:
+            return self.render(None, status=status_code, headers=validators.headers())
+        return None
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.request = Request(request)
+        try:
+            result = await self.authentication.aauthenticate(request)
+            if result is None:
+                raise exceptions.NotAuthenticated()
+            self.request.user, self.request.auth = result
+            return await super().dispatch(self.request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+
+class AsyncListAPIView(ValuesListMixin, AsyncAPIView):
+    pagination_class = KeysetPagination
+    keyset_ordering = ("id",)
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    async def get_validators(self):
+        return None
+
+    async def get(self, request, *args, **kwargs):
+        validators = await self.get_validators()
+        headers = {}
+        if validators is not None:
+            response = self.precondition_response(validators)
+            if response is not None:
+                return response
+            headers.update(validators.headers())
+        paginator = self.pagination_class()
+        serializer = self.get_values_serializer()
+        rows = serializer.values(
+            self.filter_queryset(self.get_queryset()), self.keyset_ordering
+        )
+        page = await paginator.apaginate_queryset(rows, request, view=self)
+        headers.update(paginator.get_paginated_headers())
+        return self.render(serializer.serialize(page), headers=headers)
+
+
+# Async view for listing vendors
+class AsyncVendorListAPIView(AsyncListAPIView):
+    serializer_class = VendorSerializer
+
+    def get_queryset(self):
+        return Vendor.objects.all()
+
+
+# Async view for retrieving a vendor
+class AsyncVendorRetrieveAPIView(AsyncAPIView):
+    serializer_class = VendorSerializer
+
+    async def get(self, request, pk):
+        updated_at = await arow_version(Vendor.objects.all(), pk)
+        if updated_at is None:
+            raise Http404("No Vendor matches the given query.")
+        validators = Validators(request, self.renderer.format, updated_at)
+        response = self.precondition_response(validators)
+        if response is not None:
+            return response
+        vendor = await aget_object_or_404(Vendor, pk=pk)
+        return self.render(
+            self.get_serializer(vendor).data, headers=validators.headers()
+        )
+
+
+# Async view for listing the purchase orders of a vendor
+class AsyncPurchaseOrderByVendorAPIView(AsyncListAPIView):
+    serializer_class = PurchaseOrderSerializer
+    keyset_ordering = ("issue_date", "id")
+
+    def get_queryset(self):
+        return PurchaseOrder.objects.filter(vendor_id=self.kwargs["vendor_id"])
+
+    async def get_validators(self):
+        version = await self.get_queryset().aaggregate(**LIST_VERSION)
+        return Validators.from_list_version(self.request, self.renderer.format, version)
+
+
+# Async view for retrieving vendor performance metrics
+class AsyncVendorPerformanceAPIView(AsyncAPIView):
+    serializer_class = VendorSerializer
+
+    async def get(self, request, pk):
+        entry = await performance_cache.aget(pk)
+        if entry is None:
+            vendor = await aget_object_or_404(Vendor, pk=pk)
+            metrics = await acompute_vendor_metrics(vendor)
+            serializer = self.get_serializer(metrics.apply_to(vendor))
+            entry = await performance_cache.aset(pk, serializer.data)
+        payload, etag = entry
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return self.render(
+                None, status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+        return self.render(payload, headers={"ETag": etag})
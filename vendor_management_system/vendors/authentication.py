@@ -0,0 +1,237 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+logger = logging.getLogger(__name__)
+
+# User columns cached per user id, everything authorization needs.
+USER_FIELDS = ("username", "is_active", "is_staff", "is_superuser")
+
+
+class ActiveUserCache:
+    # Bounded per-process LRU of user rows by id, each kept for ``ttl`` seconds.
+    # Saving or deleting a user drops its entry in this process, other
+    # processes see the change once their entry expires.
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            record, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return record
+
+    def set(self, user_id, record):
+        with self._lock:
+            self._entries[user_id] = (record, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RevokedTokens:
+    # JTIs of the unexpired blacklisted tokens, held in memory. The set is
+    # loaded on first use and then reloaded by a background thread once older
+    # than JWT_BLACKLIST_REFRESH_INTERVAL seconds (never if None), so checking
+    # a token never waits on a query. Tokens revoked by this process are
+    # visible immediately.
+    def __init__(self):
+        self._jtis = frozenset()
+        self._revoked_here = {}
+        self._loaded_at = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def __contains__(self, jti):
+        return jti in self._jtis or jti in self._revoked_here
+
+    def load(self):
+        now = timezone.now()
+        jtis = frozenset(
+            BlacklistedToken.objects.filter(token__expires_at__gt=now).values_list(
+                "token__jti", flat=True
+            )
+        )
+        with self._lock:
+            self._revoked_here = {
+                jti: expires_at
+                for jti, expires_at in self._revoked_here.items()
+                if expires_at > now and jti not in jtis
+            }
+            self._jtis = jtis
+            self._loaded_at = time.monotonic()
+
+    def load_or_keep(self):
+        try:
+            self.load()
+        except DatabaseError as exc:
+            # Keep serving the previous set and retry after another interval.
+            logger.warning(f"Could not load the token blacklist: {exc}")
+            self._loaded_at = time.monotonic()
+
+    def _background_load(self):
+        try:
+            self.load_or_keep()
+        finally:
+            self._refreshing = False
+            connection.close()
+
+    def refresh_if_stale(self):
+        interval = settings.JWT_BLACKLIST_REFRESH_INTERVAL
+        if interval is None:
+            return
+        with self._lock:
+            if self._refreshing or time.monotonic() - self._loaded_at < interval:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_load, daemon=True).start()
+
+    def ensure_loaded(self):
+        if self._loaded_at is None:
+            self.load_or_keep()
+        else:
+            self.refresh_if_stale()
+
+    async def aensure_loaded(self):
+        if self._loaded_at is None:
+            await sync_to_async(self.load_or_keep)()
+        else:
+            self.refresh_if_stale()
+
+    def revoke(self, token):
+        jti = token[api_settings.JTI_CLAIM]
+        expires_at = datetime_from_epoch(token["exp"])
+        outstanding, _ = OutstandingToken.objects.get_or_create(
+            jti=jti,
+            defaults={
+                "user_id": token.get(api_settings.USER_ID_CLAIM),
+                "token": str(token),
+                "expires_at": expires_at,
+            },
+        )
+        BlacklistedToken.objects.get_or_create(token=outstanding)
+        with self._lock:
+            self._revoked_here[jti] = expires_at
+
+
+user_cache = ActiveUserCache(
+    settings.JWT_USER_CACHE_TTL, settings.JWT_USER_CACHE_MAX_ENTRIES
+)
+revoked_tokens = RevokedTokens()
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+
+class CachedTokenUser(TokenUser):
+    # Stateless user built from the token, with the username and permission
+    # flags of the cached user row.
+    def __init__(self, token, record):
+        super().__init__(token)
+        self.username = record["username"]
+        self.is_active = record["is_active"]
+        self.is_staff = record["is_staff"]
+        self.is_superuser = record["is_superuser"]
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    # JWTAuthentication without per-request queries: revoked tokens are checked
+    # against the in-memory blacklist and users are resolved from the TTL
+    # cache, so only a cache miss reads auth_user.
+    def get_user_id(self, validated_token):
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti in revoked_tokens:
+            raise AuthenticationFailed(_("Token is blacklisted"), code="token_not_valid")
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def user_from_record(self, validated_token, record):
+        if record is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not record["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return CachedTokenUser(validated_token, record)
+
+    def user_rows(self, user_id):
+        return self.user_model.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).values(*USER_FIELDS)
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Needs the password hash of the user, not cached.
+            return super().get_user(validated_token)
+        revoked_tokens.ensure_loaded()
+        user_id = self.get_user_id(validated_token)
+        record = user_cache.get(user_id)
+        if record is None:
+            record = self.user_rows(user_id).first()
+            if record is not None:
+                user_cache.set(user_id, record)
+        return self.user_from_record(validated_token, record)
+
+
+class AsyncJWTAuthentication(CachedJWTAuthentication):
+    # CachedJWTAuthentication for async views: the token checks are pure CPU,
+    # only a user cache miss goes through the async ORM.
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return await sync_to_async(super().get_user)(validated_token)
+        await revoked_tokens.aensure_loaded()
+        user_id = self.get_user_id(validated_token)
+        record = user_cache.get(user_id)
+        if record is None:
+            record = await self.user_rows(user_id).afirst()
+            if record is not None:
+                user_cache.set(user_id, record)
+        return self.user_from_record(validated_token, record)
@@ -0,0 +1,126 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from vendors.line_items import create_line_items
+from vendors.models import Vendor, PurchaseOrder
+from vendors.recompute import recompute_vendors
+
+# Benchmark modules runnable with ``manage.py benchmark <name>``. Each exposes
+# ``help``, ``add_arguments(parser)`` and ``run(stdout, **options)``.
+BENCHMARKS = [
+    "analytics",
+    "api_suite",
+    "asgi_throughput",
+    "bulk_ingest",
+    "list_serialization",
+    "sqlite_concurrency",
+]
+
+
+@contextmanager
+def rolled_back():
+    # Run a benchmark against the configured database and discard its writes.
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+class Timer:
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.started
+
+
+def client_host():
+    # A Host header the configured ALLOWED_HOSTS accept, "localhost" being
+    # accepted when DEBUG is on and ALLOWED_HOSTS is empty.
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*" and not host.startswith("."):
+            return host
+    return "localhost"
+
+
+def api_client():
+    user = get_user_model().objects.create_user(
+        username=f"benchmark-{time.time_ns()}", password=None
+    )
+    client = APIClient(HTTP_HOST=client_host())
+    client.force_authenticate(user)
+    return client
+
+
+def create_vendors(count):
+    return Vendor.objects.bulk_create(
+        Vendor(
+            name="Benchmark Vendor",
+            contact_details="1234567890",
+            address="Benchmark St",
+            vendor_code=f"BENCH-{time.time_ns()}-{index}",
+        )
+        for index in range(count)
+    )
+
+
+def purchase_order_rows(vendor_ids, count, item_count=1):
+    order_date = timezone.now().replace(microsecond=0)
+    for index in range(count):
+        yield {
+            "vendor": vendor_ids[index % len(vendor_ids)],
+            "order_date": order_date.isoformat(),
+            "delivery_date": order_date.isoformat(),
+            "items": [
+                {"sku": f"SKU-{item}", "quantity": 1} for item in range(item_count)
+            ],
+            "quantity": item_count,
+            "status": "completed" if index % 2 else "pending",
+        }
+
+
+# Bulk insert ``order_count`` purchase orders with ``item_count`` line items
+# each, spread over ``vendor_count`` new vendors, with a reproducible mix of
+# statuses, ratings, delays and acknowledgments, then compute the vendor
+# metrics once. Returns the vendor ids.
+def seed_dataset(vendor_count, order_count, item_count=1, seed=0):
+    rng = random.Random(seed)
+    vendors = create_vendors(vendor_count)
+    now = timezone.now()
+    po_numbers = PurchaseOrder.generate_po_numbers(order_count)
+    purchase_orders = []
+    for index in range(order_count):
+        completed = rng.random() < 0.6
+        purchase_orders.append(
+            PurchaseOrder(
+                po_number=po_numbers[index],
+                vendor=vendors[index % vendor_count],
+                order_date=now,
+                delivery_date=now + timedelta(days=rng.choice([1, 3, 10])),
+                items=[
+                    {"sku": f"SKU-{rng.randrange(1000)}", "quantity": rng.randint(1, 5)}
+                    for _ in range(item_count)
+                ],
+                quantity=item_count,
+                status="completed" if completed else "pending",
+                quality_rating=rng.choice([None, 3.0, 4.0, 5.0]) if completed else None,
+                acknowledgment_date=(
+                    now + timedelta(hours=rng.randint(1, 72))
+                    if rng.random() < 0.7
+                    else None
+                ),
+            )
+        )
+    PurchaseOrder.objects.bulk_create(purchase_orders, batch_size=1000)
+    create_line_items(purchase_orders, batch_size=1000)
+    vendor_ids = [vendor.pk for vendor in vendors]
+    recompute_vendors(vendor_ids)
+    return vendor_ids
@@ -0,0 +1,82 @@
+import math
+
+from django.core.management.base import CommandError
+
+from vendors import analytics
+from vendors.analytics import np
+from vendors.models import PurchaseOrder, Vendor
+
+from . import Timer, rolled_back, seed_dataset
+
+help = (
+    "Compare the vendor response time percentiles and on-time histogram "
+    "computed with numpy from one read of the purchase order columns against "
+    "the per-vendor calculate_* methods."
+)
+
+
+def add_arguments(parser):
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--vendors", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def orm_reports(vendor_ids):
+    # One aggregate query per vendor (Vendor.compute_metrics, the query of each
+    # calculate_* method), then the distributions of the per-vendor rates.
+    response_times, on_time_rates = [], []
+    for vendor in Vendor.objects.filter(pk__in=vendor_ids).order_by("pk"):
+        metrics = vendor.compute_metrics()
+        if metrics.response_time_count:
+            response_times.append(metrics.average_response_time)
+        if metrics.completed_pos:
+            on_time_rates.append(metrics.on_time_delivery_rate)
+    return (
+        analytics.describe(np.array(response_times), analytics.DEFAULT_PERCENTILES),
+        np.histogram(on_time_rates, bins=10, range=(0.0, 100.0))[0].tolist(),
+    )
+
+
+def numpy_reports(vendor_ids):
+    columns = analytics.PurchaseOrderColumns.load(
+        PurchaseOrder.objects.filter(vendor_id__in=vendor_ids)
+    )
+    histogram = analytics.on_time_histogram_report(columns)
+    return (
+        analytics.response_time_report(columns)["vendors"],
+        [row["vendors"] for row in histogram["bins"]],
+    )
+
+
+def same_reports(first, second):
+    (first_times, first_bins), (second_times, second_bins) = first, second
+    if first_bins != second_bins or first_times["count"] != second_times["count"]:
+        return False
+    return all(
+        math.isclose(first_times["percentiles"][key], value, rel_tol=1e-9)
+        for key, value in second_times["percentiles"].items()
+        if value is not None
+    )
+
+
+def run(stdout, orders, vendors, seed, **options):
+    if not analytics.available():
+        raise CommandError("This benchmark needs numpy: pip install numpy")
+    results = {}
+    with rolled_back():
+        vendor_ids = seed_dataset(vendors, orders, seed=seed)
+        reports = []
+        for name, path in [("orm_per_vendor", orm_reports), ("numpy", numpy_reports)]:
+            with Timer() as timer:
+                reports.append(path(vendor_ids))
+            results[name] = {"orders": orders, "seconds": timer.elapsed}
+    if not same_reports(*reports):
+        raise CommandError("The ORM and numpy reports differ.")
+
+    for name, result in results.items():
+        stdout.write(
+            f"{name}: {result['orders']} orders in {result['seconds'] * 1000:.1f}ms"
+        )
+    orm, vectorized = results["orm_per_vendor"], results["numpy"]
+    stdout.write(f"speedup: {orm['seconds'] / vectorized['seconds']:.1f}x")
+    return results
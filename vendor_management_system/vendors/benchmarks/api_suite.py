@@ -0,0 +1,407 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from vendors import analytics, urls as vendor_urls
+from vendors.models import Vendor, PurchaseOrder
+from vendors.snapshots import snapshot_vendor_performance
+
+from . import client_host, purchase_order_rows, rolled_back, seed_dataset
+
+help = (
+    "Latency and query counts of every vendors API endpoint, the purchase "
+    "order metric signal and the calculate_* methods on a synthetic dataset, "
+    "optionally compared against a previous run."
+)
+
+PASSWORD = "benchmark-password"
+
+
+def add_arguments(parser):
+    parser.add_argument("--vendors", type=int, default=50)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument(
+        "--items", type=int, default=3, help="Line items in each purchase order JSON."
+    )
+    parser.add_argument(
+        "--bulk-rows", type=int, default=100, help="Rows of each bulk request."
+    )
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument(
+        "--baseline", help="Fail on regressions against this results JSON file."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown of the mean latency (0.25 = 25%%).",
+    )
+
+
+class Dataset:
+    # The seeded rows the cases pick their targets from, round robin so that
+    # a run is reproducible.
+    def __init__(self, user, vendor_ids, bulk_rows):
+        self.user = user
+        self.vendor_ids = vendor_ids
+        self.bulk_rows = bulk_rows
+        purchase_orders = PurchaseOrder.objects.filter(
+            vendor_id__in=vendor_ids
+        ).order_by("pk")
+        self.po_ids = list(purchase_orders.values_list("pk", flat=True))
+        self.po_numbers = list(purchase_orders.values_list("po_number", flat=True))
+        self.calls = 0
+
+    def pick(self, values):
+        self.calls += 1
+        return values[self.calls % len(values)]
+
+    def vendor(self):
+        return self.pick(self.vendor_ids)
+
+    def purchase_order(self):
+        return self.pick(self.po_ids)
+
+    def purchase_orders(self):
+        start = self.calls % len(self.po_ids)
+        self.calls += 1
+        return (self.po_ids * 2)[start : start + self.bulk_rows]
+
+    def purchase_order_data(self, count=1):
+        return list(purchase_order_rows(self.vendor_ids, count))
+
+    def vendor_data(self):
+        return {
+            "name": "Benchmark Vendor",
+            "contact_details": "1234567890",
+            "address": "Benchmark St",
+            "vendor_code": f"BENCH-NEW-{time.time_ns()}",
+        }
+
+    def tokens(self):
+        return RefreshToken.for_user(self.user)
+
+
+def _login(dataset):
+    return {"data": {"username": dataset.user.username, "password": PASSWORD}}
+
+
+def _logout(dataset):
+    # Logging out revokes the access token, so use a fresh pair.
+    token = dataset.tokens()
+    return {
+        "data": {"refresh_token": str(token)},
+        "credentials": {"HTTP_AUTHORIZATION": f"Bearer {token.access_token}"},
+    }
+
+
+def _vendor(dataset):
+    return {"kwargs": {"pk": dataset.vendor()}}
+
+
+def _purchase_order(dataset):
+    return {"kwargs": {"pk": dataset.purchase_order()}}
+
+
+def _purchase_order_update(dataset):
+    return {
+        "kwargs": {"pk": dataset.purchase_order()},
+        "data": dict(dataset.purchase_order_data()[0], status="completed"),
+    }
+
+
+# (url name, method) -> builder returning the url ``kwargs``, request ``data``,
+# query ``params`` and, to replace the default token, ``credentials`` of one
+# call. Every url of
+# vendors/urls.py needs at least one case, see check_coverage().
+CASES = {
+    ("token_obtain_pair", "post"): _login,
+    ("token_refresh", "post"): lambda d: {"data": {"refresh": str(d.tokens())}},
+    ("my-token_obtain_pair", "post"): _login,
+    ("auth_logout", "post"): _logout,
+    ("vendor-list-create", "get"): lambda d: {},
+    ("vendor-list-create", "post"): lambda d: {"data": d.vendor_data()},
+    ("vendor-scorecard-export", "get"): lambda d: {"params": {"format": "csv"}},
+    ("vendor-ranking", "get"): lambda d: {"params": {"min_orders": 1, "limit": 20}},
+    ("vendor-retrieve-update-destroy", "get"): _vendor,
+    ("vendor-retrieve-update-destroy", "put"): lambda d: dict(
+        _vendor(d), data=d.vendor_data()
+    ),
+    ("vendor-retrieve-update-destroy", "delete"): _vendor,
+    ("purchase-order-list-create", "get"): lambda d: {},
+    ("purchase-order-list-create", "post"): lambda d: {
+        "data": d.purchase_order_data()[0]
+    },
+    ("purchase-order-bulk-create", "post"): lambda d: {
+        "data": d.purchase_order_data(d.bulk_rows)
+    },
+    ("purchase-order-bulk-acknowledge", "post"): lambda d: {
+        "data": {"ids": d.purchase_orders()}
+    },
+    ("purchase-order-bulk-complete", "post"): lambda d: {
+        "data": {"ids": d.purchase_orders(), "quality_rating": 4.0}
+    },
+    ("purchase-order-export", "get"): lambda d: {"params": {"format": "ndjson"}},
+    ("purchase-order-retrieve-update-destroy", "get"): _purchase_order,
+    ("purchase-order-retrieve-update-destroy", "put"): _purchase_order_update,
+    ("purchase-order-retrieve-update-destroy", "delete"): _purchase_order,
+    ("purchase-order-by-vendor", "get"): lambda d: {
+        "kwargs": {"vendor_id": d.vendor()}
+    },
+    ("purchase-order-by-number", "get"): lambda d: {
+        "kwargs": {"po_number": d.pick(d.po_numbers)}
+    },
+    ("purchase-order-sku-summary", "get"): lambda d: {
+        "kwargs": {"sku": f"SKU-{d.pick(range(1000))}"},
+        "params": {"status": "pending"},
+    },
+    ("vendor-performance", "get"): _vendor,
+    ("vendor-performance-cache-stats", "get"): lambda d: {},
+    ("vendor-performance-history", "get"): lambda d: dict(
+        _vendor(d), params={"bucket": "week"}
+    ),
+    ("acknowledge-purchase-order", "put"): _purchase_order,
+    ("request-metrics", "get"): lambda d: {},
+    ("analytics-response-times", "get"): lambda d: {},
+    ("analytics-on-time-histogram", "get"): lambda d: {"params": {"bins": 20}},
+    ("analytics-cohorts", "get"): lambda d: {},
+    ("async-vendor-list", "get"): lambda d: {},
+    ("async-vendor-retrieve", "get"): _vendor,
+    ("async-vendor-performance", "get"): _vendor,
+    ("async-purchase-order-by-vendor", "get"): lambda d: {
+        "kwargs": {"vendor_id": d.vendor()}
+    },
+}
+
+
+def check_coverage():
+    url_names = {pattern.name for pattern in vendor_urls.urlpatterns}
+    missing = url_names - {name for name, _ in CASES}
+    if missing:
+        raise CommandError(f"No benchmark case for: {', '.join(sorted(missing))}")
+
+
+def summarize(durations, queries):
+    durations = sorted(durations)
+    return {
+        "iterations": len(durations),
+        "mean_ms": statistics.fmean(durations) * 1000,
+        "p50_ms": durations[len(durations) // 2] * 1000,
+        "p95_ms": durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+        * 1000,
+        "min_ms": durations[0] * 1000,
+        "queries": max(queries),
+    }
+
+
+# Run ``call`` ``iterations`` times after one warm-up call, each in its own
+# rolled back savepoint so that writes do not change the dataset.
+def measure(call, iterations):
+    durations, queries = [], []
+    for iteration in range(iterations + 1):
+        with rolled_back():
+            prepared = call.prepare()
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                call(prepared)
+                elapsed = time.perf_counter() - started
+        if iteration:
+            durations.append(elapsed)
+            queries.append(len(captured))
+    return summarize(durations, queries)
+
+
+class EndpointCall:
+    def __init__(self, client, dataset, url_name, method, builder):
+        self.client = client
+        self.dataset = dataset
+        self.url_name = url_name
+        self.method = method
+        self.builder = builder
+
+    def prepare(self):
+        return self.builder(self.dataset)
+
+    def __call__(self, prepared):
+        url = reverse(self.url_name, kwargs=prepared.get("kwargs"))
+        client = self.client
+        if "credentials" in prepared:
+            client = APIClient(HTTP_HOST=client_host())
+            client.credentials(**prepared["credentials"])
+        request = getattr(client, self.method)
+        if self.method == "get":
+            response = request(url, prepared.get("params"))
+        else:
+            response = request(url, prepared.get("data"), format="json")
+        if response.status_code >= 400:
+            raise CommandError(
+                f"{self.method.upper()} {url} returned {response.status_code}: "
+                f"{response.content[:200]!r}"
+            )
+        if response.streaming:
+            b"".join(response.streaming_content)
+
+
+class MetricSignalCall:
+    # Save a purchase order so that its vendor metrics change, the write path
+    # of the post_save metric receiver.
+    def __init__(self, dataset, completed):
+        self.dataset = dataset
+        self.completed = completed
+
+    def prepare(self):
+        purchase_order = PurchaseOrder.objects.get(pk=self.dataset.purchase_order())
+        if self.completed:
+            purchase_order.status = (
+                "pending" if purchase_order.status == "completed" else "completed"
+            )
+            purchase_order.quality_rating = 4.0
+        else:
+            purchase_order = PurchaseOrder(
+                vendor_id=purchase_order.vendor_id,
+                order_date=purchase_order.order_date,
+                delivery_date=purchase_order.delivery_date,
+                items=purchase_order.items,
+                quantity=purchase_order.quantity,
+                status="completed",
+            )
+        return purchase_order
+
+    def __call__(self, purchase_order):
+        purchase_order.save()
+
+
+class VendorMethodCall:
+    def __init__(self, dataset, method):
+        self.dataset = dataset
+        self.method = method
+
+    def prepare(self):
+        return Vendor.objects.get(pk=self.dataset.vendor())
+
+    def __call__(self, vendor):
+        getattr(vendor, self.method)()
+
+
+def load_baseline(path):
+    try:
+        with open(path) as baseline_file:
+            return json.load(baseline_file)["results"]
+    except (OSError, ValueError, KeyError) as exc:
+        raise CommandError(f"Cannot read baseline {path}: {exc}")
+
+
+# Names of the results slower than the baseline mean by more than
+# ``threshold``, or running more queries than in the baseline.
+def find_regressions(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if result["mean_ms"] > previous["mean_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: mean {result['mean_ms']:.2f}ms, "
+                f"baseline {previous['mean_ms']:.2f}ms"
+            )
+        if result["queries"] > previous["queries"]:
+            regressions.append(
+                f"{name}: {result['queries']} queries, "
+                f"baseline {previous['queries']}"
+            )
+    return regressions
+
+
+def run(
+    stdout,
+    vendors,
+    orders,
+    items,
+    bulk_rows,
+    iterations,
+    seed,
+    output=None,
+    baseline=None,
+    threshold=0.25,
+    **options,
+):
+    check_coverage()
+    baseline_results = load_baseline(baseline) if baseline else None
+    results = {}
+    with rolled_back():
+        user = get_user_model().objects.create_superuser(
+            username=f"benchmark-{time.time_ns()}", password=PASSWORD
+        )
+        vendor_ids = seed_dataset(vendors, orders, item_count=items, seed=seed)
+        for days in range(30):
+            snapshot_vendor_performance("day", timezone.now() - timedelta(days=days))
+        dataset = Dataset(user, vendor_ids, bulk_rows)
+        client = APIClient(HTTP_HOST=client_host())
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {dataset.tokens().access_token}"
+        )
+
+        calls = {}
+        for (url_name, method), builder in CASES.items():
+            name = f"{method.upper()} {url_name}"
+            if url_name.startswith("analytics-") and not analytics.available():
+                stdout.write(f"{name}: skipped, numpy is not installed")
+                continue
+            calls[name] = EndpointCall(client, dataset, url_name, method, builder)
+        calls["signal post_save create"] = MetricSignalCall(dataset, completed=False)
+        calls["signal post_save complete"] = MetricSignalCall(dataset, completed=True)
+        for method in (
+            "calculate_on_time_delivery_rate",
+            "calculate_quality_rating_average",
+            "calculate_average_response_time",
+            "calculate_fulfillment_rate",
+        ):
+            calls[f"Vendor.{method}"] = VendorMethodCall(dataset, method)
+
+        for name, call in calls.items():
+            results[name] = measure(call, iterations)
+            result = results[name]
+            stdout.write(
+                f"{name}: mean {result['mean_ms']:.2f}ms, "
+                f"p95 {result['p95_ms']:.2f}ms, {result['queries']} queries"
+            )
+
+    report = {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "vendors": vendors,
+            "orders": orders,
+            "items": items,
+            "bulk_rows": bulk_rows,
+            "iterations": iterations,
+            "seed": seed,
+        },
+        "results": results,
+    }
+    if output:
+        with open(output, "w") as output_file:
+            json.dump(report, output_file, indent=2, sort_keys=True)
+        stdout.write(f"Results written to {output}")
+    if baseline_results is not None:
+        regressions = find_regressions(results, baseline_results, threshold)
+        if regressions:
+            raise CommandError(
+                "Regressions against the baseline:\n" + "\n".join(regressions)
+            )
+        stdout.write(f"No regression over {threshold:.0%} against {baseline}.")
+    return report
@@ -0,0 +1,201 @@
+import asyncio
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from vendors.models import Vendor, PurchaseOrder
+
+from . import seed_dataset
+
+help = (
+    "Requests per second and latency percentiles of the sync and async read "
+    "endpoints served by uvicorn at high concurrency."
+)
+
+# Endpoint -> (sync url name, async url name, takes a vendor id).
+ENDPOINTS = {
+    "vendor_list": ("vendor-list-create", "async-vendor-list", None),
+    "vendor_detail": (
+        "vendor-retrieve-update-destroy",
+        "async-vendor-retrieve",
+        "pk",
+    ),
+    "vendor_performance": ("vendor-performance", "async-vendor-performance", "pk"),
+    "purchase_orders_by_vendor": (
+        "purchase-order-by-vendor",
+        "async-purchase-order-by-vendor",
+        "vendor_id",
+    ),
+}
+
+
+def add_arguments(parser):
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument(
+        "--duration", type=float, default=5.0, help="Seconds per endpoint and mode."
+    )
+    parser.add_argument("--vendors", type=int, default=50)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--endpoint",
+        choices=list(ENDPOINTS),
+        action="append",
+        dest="endpoints",
+        help="Only benchmark the given endpoint (can be repeated).",
+    )
+
+
+def start_server(port):
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "vendor_management_system.asgi:application",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env=os.environ.copy(),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise CommandError("uvicorn exited during startup.")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise CommandError("uvicorn did not start listening within 30s.")
+
+
+async def read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed by the server.")
+    status_code = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    return status_code
+
+
+async def client(port, requests, deadline, latencies, failures):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        index = 0
+        while time.perf_counter() < deadline:
+            request = requests[index % len(requests)]
+            index += 1
+            started = time.perf_counter()
+            writer.write(request)
+            status_code = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status_code != 200:
+                failures.append(status_code)
+    finally:
+        writer.close()
+
+
+async def load(port, requests, concurrency, duration):
+    latencies, failures = [], []
+    started = time.perf_counter()
+    deadline = started + duration
+    # Each connection starts at a different url so the vendors are spread.
+    await asyncio.gather(
+        *(
+            client(
+                port,
+                requests[offset:] + requests[:offset],
+                deadline,
+                latencies,
+                failures,
+            )
+            for offset in range(concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "failures": len(failures),
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else None,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else None,
+    }
+
+
+def build_requests(url_name, kwarg, vendor_ids, token):
+    urls = (
+        [reverse(url_name, kwargs={kwarg: vendor_id}) for vendor_id in vendor_ids]
+        if kwarg
+        else [reverse(url_name)]
+    )
+    return [
+        (
+            f"GET {url} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Authorization: Bearer {token}\r\n\r\n"
+        ).encode()
+        for url in urls
+    ]
+
+
+def run(stdout, concurrency, duration, vendors, orders, port, endpoints=None, **options):
+    # The server runs in a uvicorn subprocess.
+    if importlib.util.find_spec("uvicorn") is None:
+        raise CommandError("This benchmark needs uvicorn: pip install uvicorn")
+
+    # The server process only sees committed rows, so the seed data is
+    # committed and removed again afterwards.
+    user = get_user_model().objects.create_user(
+        username=f"benchmark-{time.time_ns()}", password=None
+    )
+    vendor_ids = seed_dataset(vendors, orders)
+    token = str(AccessToken.for_user(user))
+    server = start_server(port)
+    results = {}
+    try:
+        for name in endpoints or ENDPOINTS:
+            sync_name, async_name, kwarg = ENDPOINTS[name]
+            results[name] = {}
+            for mode, url_name in (("sync", sync_name), ("async", async_name)):
+                requests = build_requests(url_name, kwarg, vendor_ids, token)
+                result = asyncio.run(load(port, requests, concurrency, duration))
+                results[name][mode] = result
+                stdout.write(
+                    f"{name} [{mode}]: {result['requests_per_second']:.0f} req/s, "
+                    f"p50 {result['p50_ms']:.1f}ms, p99 {result['p99_ms']:.1f}ms, "
+                    f"{result['failures']} failures"
+                )
+    finally:
+        server.terminate()
+        server.wait()
+        PurchaseOrder.objects.filter(vendor_id__in=vendor_ids).delete()
+        Vendor.objects.filter(pk__in=vendor_ids).delete()
+        user.delete()
+    return results
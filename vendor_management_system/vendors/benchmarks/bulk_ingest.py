@@ -0,0 +1,44 @@
+from django.urls import reverse
+
+from . import Timer, api_client, create_vendors, purchase_order_rows, rolled_back
+
+help = "Compare POST /api/purchase_orders/bulk/ with one POST per purchase order."
+
+
+def add_arguments(parser):
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--vendors", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=500)
+
+
+def run(stdout, rows, vendors, batch_size, **options):
+    results = {}
+    with rolled_back():
+        client = api_client()
+        vendor_ids = [vendor.pk for vendor in create_vendors(vendors)]
+        data = list(purchase_order_rows(vendor_ids, rows))
+
+        url = reverse("purchase-order-list-create")
+        with Timer() as single:
+            for row in data:
+                client.post(url, row, format="json")
+        results["single_posts"] = {"rows": rows, "seconds": single.elapsed}
+
+        url = reverse("purchase-order-bulk-create") + f"?batch_size={batch_size}"
+        with Timer() as bulk:
+            response = client.post(url, data, format="json")
+        assert response.status_code == 201, response.content
+        results["bulk_post"] = {"rows": rows, "seconds": bulk.elapsed}
+
+    for name, result in results.items():
+        result["rows_per_second"] = result["rows"] / result["seconds"]
+        stdout.write(
+            f"{name}: {result['rows']} rows in {result['seconds']:.3f}s "
+            f"({result['rows_per_second']:.0f} rows/s)"
+        )
+    speedup = (
+        results["bulk_post"]["rows_per_second"]
+        / results["single_posts"]["rows_per_second"]
+    )
+    stdout.write(f"speedup: {speedup:.1f}x")
+    return results
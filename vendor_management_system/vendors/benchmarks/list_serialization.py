@@ -0,0 +1,76 @@
+from django.core.management import CommandError
+from rest_framework.renderers import JSONRenderer
+
+from vendors.fast_serializers import values_serializer
+from vendors.models import PurchaseOrder
+from vendors.serializers import PurchaseOrderSerializer
+
+from . import Timer, rolled_back, seed_dataset
+
+help = (
+    "Compare rendering a purchase order list with PurchaseOrderSerializer and "
+    "with its ValuesSerializer."
+)
+
+
+def add_arguments(parser):
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--vendors", type=int, default=10)
+    parser.add_argument("--items", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def model_serializer(queryset):
+    rows = list(queryset.all())
+    with Timer() as serialize:
+        content = JSONRenderer().render(PurchaseOrderSerializer(rows, many=True).data)
+    return content, serialize.elapsed
+
+
+def fast_serializer(queryset):
+    serializer = values_serializer(PurchaseOrderSerializer)
+    rows = list(serializer.values(queryset))
+    with Timer() as serialize:
+        content = JSONRenderer().render(serializer.serialize(rows))
+    return content, serialize.elapsed
+
+
+def run(stdout, rows, vendors, items, iterations, seed, **options):
+    results = {}
+    with rolled_back():
+        vendor_ids = seed_dataset(vendors, rows, item_count=items, seed=seed)
+        queryset = PurchaseOrder.objects.filter(vendor_id__in=vendor_ids).order_by(
+            "issue_date", "id"
+        )
+        contents = set()
+        for name, path in [
+            ("model_serializer", model_serializer),
+            ("values_serializer", fast_serializer),
+        ]:
+            totals, serializing = [], []
+            for _ in range(iterations):
+                with Timer() as total:
+                    content, serialize_seconds = path(queryset)
+                totals.append(total.elapsed)
+                serializing.append(serialize_seconds)
+            contents.add(content)
+            results[name] = {
+                "rows": rows,
+                "seconds": min(totals),
+                "serialize_seconds": min(serializing),
+            }
+    if len(contents) != 1:
+        raise CommandError("The serializers rendered different content.")
+
+    for name, result in results.items():
+        stdout.write(
+            f"{name}: {result['rows']} rows in {result['seconds'] * 1000:.1f}ms, "
+            f"{result['serialize_seconds'] * 1000:.1f}ms serializing"
+        )
+    model, fast = results["model_serializer"], results["values_serializer"]
+    stdout.write(
+        f"speedup: {model['seconds'] / fast['seconds']:.1f}x overall, "
+        f"{model['serialize_seconds'] / fast['serialize_seconds']:.1f}x serializing"
+    )
+    return results
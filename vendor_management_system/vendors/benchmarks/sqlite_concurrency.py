@@ -0,0 +1,106 @@
+import os
+import sqlite3
+import tempfile
+import threading
+
+from django.conf import settings
+
+from vendors.db import apply_sqlite_pragmas
+
+from . import Timer
+
+help = (
+    "Concurrent purchase order write throughput on a SQLite file with the "
+    "default connection settings versus the SQLITE_PRAGMAS profile."
+)
+
+# Each write mirrors the purchase order write path: insert the row and bump
+# the vendor counters in one transaction.
+SCHEMA = """
+CREATE TABLE vendor (id INTEGER PRIMARY KEY, total_pos INTEGER NOT NULL);
+CREATE TABLE purchase_order (
+    id INTEGER PRIMARY KEY,
+    vendor_id INTEGER NOT NULL REFERENCES vendor (id),
+    items TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+INSERT INTO vendor (id, total_pos) VALUES (1, 0);
+"""
+
+# Python's sqlite3 default: rollback journal, FULL sync, 5s busy timeout.
+DEFAULT_PROFILE = {"timeout": 5.0, "pragmas": {}}
+
+
+def sqlite_profile():
+    return {
+        "timeout": settings.SQLITE_PRAGMAS.get("busy_timeout", 5000) / 1000,
+        "pragmas": settings.SQLITE_PRAGMAS,
+    }
+
+
+def add_arguments(parser):
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200, help="Writes per thread.")
+
+
+def _writer(path, profile, writes, errors):
+    connection = sqlite3.connect(
+        path, timeout=profile["timeout"], isolation_level=None
+    )
+    apply_sqlite_pragmas(connection.cursor(), profile["pragmas"])
+    try:
+        for _ in range(writes):
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute(
+                    "INSERT INTO purchase_order (vendor_id, items, status) "
+                    "VALUES (1, '[]', 'pending')"
+                )
+                connection.execute("UPDATE vendor SET total_pos = total_pos + 1")
+                connection.execute("COMMIT")
+            except sqlite3.OperationalError:
+                errors.append(1)
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+    finally:
+        connection.close()
+
+
+def measure(profile, threads, writes):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmark.sqlite3")
+        setup = sqlite3.connect(path)
+        apply_sqlite_pragmas(setup.cursor(), profile["pragmas"])
+        setup.executescript(SCHEMA)
+        setup.close()
+        errors = []
+        workers = [
+            threading.Thread(target=_writer, args=(path, profile, writes, errors))
+            for _ in range(threads)
+        ]
+        with Timer() as timer:
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        committed = threads * writes - len(errors)
+        return {
+            "committed": committed,
+            "locked_errors": len(errors),
+            "seconds": timer.elapsed,
+            "writes_per_second": committed / timer.elapsed,
+        }
+
+
+def run(stdout, threads, writes, **options):
+    results = {
+        "default": measure(DEFAULT_PROFILE, threads, writes),
+        "profile": measure(sqlite_profile(), threads, writes),
+    }
+    for name, result in results.items():
+        stdout.write(
+            f"{name}: {result['committed']} writes in {result['seconds']:.3f}s "
+            f"({result['writes_per_second']:.0f}/s), "
+            f"{result['locked_errors']} 'database is locked' errors"
+        )
+    return results
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+class PerformanceCache:
+    # Read-through cache of serialized vendor performance payloads and their
+    # ETags, stored in the Django cache selected by VENDOR_PERFORMANCE_CACHE.
+    key_prefix = "vendor-performance"
+
+    def __init__(self, alias):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def key(self, vendor_id):
+        return f"{self.key_prefix}:{vendor_id}"
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, vendor_id):
+        entry = self.backend.get(self.key(vendor_id))
+        self._count(entry is not None)
+        return entry
+
+    def entry(self, payload):
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return (payload, f'"{hashlib.md5(encoded).hexdigest()}"')
+
+    def set(self, vendor_id, payload):
+        entry = self.entry(payload)
+        self.backend.set(
+            self.key(vendor_id), entry, settings.VENDOR_PERFORMANCE_CACHE_TIMEOUT
+        )
+        return entry
+
+    def set_many(self, payloads):
+        # Store the payloads of several vendors (vendor id -> payload) at once.
+        entries = {
+            vendor_id: self.entry(payload) for vendor_id, payload in payloads.items()
+        }
+        self.backend.set_many(
+            {self.key(vendor_id): entry for vendor_id, entry in entries.items()},
+            settings.VENDOR_PERFORMANCE_CACHE_TIMEOUT,
+        )
+        return entries
+
+    async def aget(self, vendor_id):
+        entry = await self.backend.aget(self.key(vendor_id))
+        self._count(entry is not None)
+        return entry
+
+    async def aset(self, vendor_id, payload):
+        entry = self.entry(payload)
+        await self.backend.aset(
+            self.key(vendor_id), entry, settings.VENDOR_PERFORMANCE_CACHE_TIMEOUT
+        )
+        return entry
+
+    def invalidate(self, *vendor_ids):
+        keys = [self.key(vendor_id) for vendor_id in vendor_ids if vendor_id]
+        if not keys:
+            return
+        self.backend.delete_many(keys)
+        # Drop whatever a concurrent reader cached from pre-commit data.
+        transaction.on_commit(lambda: self.backend.delete_many(keys))
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+        }
+
+
+performance_cache = PerformanceCache(settings.VENDOR_PERFORMANCE_CACHE)
@@ -0,0 +1,55 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+# Version of a list of rows: the newest updated_at moves on inserts and updates,
+# the count on deletes. Served by an index on (filtered column, updated_at).
+LIST_VERSION = {"last_modified": Max("updated_at"), "count": Count("pk")}
+
+
+class Validators:
+    # ETag and Last-Modified of a response, derived from the version marker of
+    # the resource instead of its content, so that conditional requests are
+    # answered before the resource is fetched and serialized. The ETag is weak
+    # and also covers the query string and the renderer of the response.
+    def __init__(self, request, renderer_format, last_modified, *marker):
+        self.last_modified = last_modified
+        key = "|".join(
+            str(part)
+            for part in (
+                last_modified.isoformat() if last_modified else "",
+                *marker,
+                request.get_full_path(),
+                renderer_format,
+            )
+        )
+        self.etag = f'W/"{hashlib.md5(key.encode()).hexdigest()}"'
+
+    @classmethod
+    def from_list_version(cls, request, renderer_format, version):
+        return cls(request, renderer_format, version["last_modified"], version["count"])
+
+    def precondition_status(self, request):
+        # 304 or 412 when the request's If-* headers are answered without a
+        # body, otherwise None.
+        timestamp = int(self.last_modified.timestamp()) if self.last_modified else None
+        response = get_conditional_response(
+            request, etag=self.etag, last_modified=timestamp
+        )
+        return None if response is None else response.status_code
+
+    def headers(self):
+        headers = {"ETag": self.etag}
+        if self.last_modified:
+            headers["Last-Modified"] = http_date(self.last_modified.timestamp())
+        return headers
+
+
+def row_version(queryset, pk):
+    return queryset.filter(pk=pk).values_list("updated_at", flat=True).first()
+
+
+async def arow_version(queryset, pk):
+    return await queryset.filter(pk=pk).values_list("updated_at", flat=True).afirst()
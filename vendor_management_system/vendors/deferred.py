@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cache import performance_cache
+from .models import Vendor, VendorMetricsQueue, metrics_deferred
+from .recompute import recompute_vendors
+
+logger = logging.getLogger(__name__)
+
+# Vendor ids touched by the current thread's transactions, flushed to the queue
+# table once on commit however many purchase orders were written.
+_pending = threading.local()
+
+
+class PendingVendors:
+    # The vendor ids marked in one transaction or savepoint, and its on_commit
+    # callback. Rolling the savepoint back discards the callback with its ids.
+    def __init__(self):
+        self.vendor_ids = set()
+        self.flushed = False
+
+    def __call__(self):
+        self.flushed = True
+        flush_dirty_vendors(self.vendor_ids)
+
+
+def mark_vendors_dirty(vendor_ids):
+    vendor_ids = {vendor_id for vendor_id in vendor_ids if vendor_id}
+    if not vendor_ids:
+        return
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        flush_dirty_vendors(vendor_ids)
+        return
+    # Django replaces its list of commit callbacks on commit and on (savepoint)
+    # rollback, which starts new sets of pending ids, one per savepoint.
+    hooks, scopes = getattr(_pending, "state", (None, None))
+    if hooks is not connection.run_on_commit:
+        scopes = {}
+        _pending.state = (connection.run_on_commit, scopes)
+    scope = tuple(connection.savepoint_ids)
+    pending = scopes.get(scope)
+    if pending is None or pending.flushed:
+        pending = scopes[scope] = PendingVendors()
+        transaction.on_commit(pending)
+    pending.vendor_ids.update(vendor_ids)
+
+
+# Refresh the stored metrics of vendors after a bulk write that bypassed the
+# purchase order signals: queue them in deferred mode, recompute them otherwise.
+def refresh_vendor_metrics(vendor_ids):
+    if metrics_deferred():
+        # The performance endpoint computes live metrics, drop its payloads now.
+        performance_cache.invalidate(*vendor_ids)
+        mark_vendors_dirty(vendor_ids)
+    else:
+        recompute_vendors(vendor_ids)
+
+
+def flush_dirty_vendors(vendor_ids):
+    if not vendor_ids:
+        return
+    queued_at = timezone.now()
+    # Vendors deleted since they were marked have nothing left to recompute.
+    entries = [
+        VendorMetricsQueue(vendor_id=vendor_id, queued_at=queued_at)
+        for vendor_id in Vendor.objects.filter(pk__in=vendor_ids).values_list(
+            "pk", flat=True
+        )
+    ]
+    if not entries:
+        return
+    VendorMetricsQueue.objects.bulk_create(
+        entries,
+        update_conflicts=True,
+        unique_fields=["vendor"],
+        update_fields=["queued_at"],
+    )
+
+
+def _recompute_chunk(vendor_ids):
+    try:
+        return recompute_vendors(vendor_ids)
+    finally:
+        connection.close()
+
+
+# Recompute every queued vendor once. Entries re-queued while the batch was
+# being processed are kept for the next run.
+def process_queue(workers=1, chunk_size=500):
+    started_at = timezone.now()
+    vendor_ids = list(
+        VendorMetricsQueue.objects.filter(queued_at__lte=started_at)
+        .order_by("queued_at")
+        .values_list("vendor_id", flat=True)
+    )
+    if not vendor_ids:
+        return 0
+    chunks = [
+        vendor_ids[start : start + chunk_size]
+        for start in range(0, len(vendor_ids), chunk_size)
+    ]
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            processed = sum(executor.map(_recompute_chunk, chunks))
+    else:
+        processed = 0
+        for chunk in chunks:
+            processed += recompute_vendors(chunk)
+    VendorMetricsQueue.objects.filter(
+        vendor_id__in=vendor_ids, queued_at__lte=started_at
+    ).delete()
+    return processed
+
+
+def run_worker(interval, workers=1, chunk_size=500, stop_event=None):
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        started = time.monotonic()
+        processed = process_queue(workers=workers, chunk_size=chunk_size)
+        if processed:
+            logger.info(f"Recomputed metrics for {processed} queued vendors")
+        stop_event.wait(max(0.0, interval - (time.monotonic() - started)))
@@ -0,0 +1,141 @@
+import csv
+import json
+import zlib
+
+from django.conf import settings
+from django.db import models
+from rest_framework import serializers
+
+from .fast_serializers import current_timezone, datetime_converter
+from .metrics import VendorMetrics, iter_vendor_metrics
+from .models import Vendor, PurchaseOrder
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+PURCHASE_ORDER_EXPORT_FIELDS = [
+    field.attname for field in PurchaseOrder._meta.concrete_fields
+]
+
+VENDOR_SCORECARD_FIELDS = [
+    "id",
+    "vendor_code",
+    "name",
+    "total_pos",
+    "completed_pos",
+    "on_time_delivery_rate",
+    "quality_rating_avg",
+    "average_response_time",
+    "fulfillment_rate",
+    "performance_score",
+]
+
+# Converter of each exported column, datetimes getting the same representation
+# as in the API serializers.
+def purchase_order_export_converters():
+    convert_datetime = datetime_converter(
+        serializers.DateTimeField(), current_timezone()
+    )
+    return [
+        convert_datetime if isinstance(field, models.DateTimeField) else None
+        for field in PurchaseOrder._meta.concrete_fields
+    ]
+
+
+def iter_purchase_order_rows(queryset):
+    rows = queryset.order_by("pk").values_list(*PURCHASE_ORDER_EXPORT_FIELDS)
+    columns = list(
+        zip(PURCHASE_ORDER_EXPORT_FIELDS, purchase_order_export_converters())
+    )
+    for row in rows.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        yield {
+            field: value if value is None or convert is None else convert(value)
+            for (field, convert), value in zip(columns, row)
+        }
+
+
+# Merge-join vendors and their set-wise computed metrics, both streamed in
+# vendor id order, so memory stays flat whatever the number of vendors.
+def iter_vendor_scorecard_rows(vendors=None):
+    vendors = Vendor.objects.all() if vendors is None else vendors
+    metrics_rows = iter_vendor_metrics(vendors, chunk_size=settings.EXPORT_CHUNK_SIZE)
+    metrics = next(metrics_rows, None)
+    rows = vendors.order_by("pk").values_list("pk", "vendor_code", "name")
+    for vendor_id, vendor_code, name in rows.iterator(
+        chunk_size=settings.EXPORT_CHUNK_SIZE
+    ):
+        while metrics is not None and metrics.vendor_id < vendor_id:
+            metrics = next(metrics_rows, None)
+        if metrics is not None and metrics.vendor_id == vendor_id:
+            vendor_metrics = metrics
+        else:
+            vendor_metrics = VendorMetrics(vendor_id)
+        yield {
+            "id": vendor_id,
+            "vendor_code": vendor_code,
+            "name": name,
+            "total_pos": vendor_metrics.total_pos,
+            "completed_pos": vendor_metrics.completed_pos,
+            "on_time_delivery_rate": vendor_metrics.on_time_delivery_rate,
+            "quality_rating_avg": vendor_metrics.quality_rating_avg,
+            "average_response_time": vendor_metrics.average_response_time,
+            "fulfillment_rate": vendor_metrics.fulfillment_rate,
+            "performance_score": vendor_metrics.performance_score,
+        }
+
+
+class _LineBuffer:
+    # File-like object handing back what csv.writer writes.
+    def write(self, value):
+        return value
+
+
+def _ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, separators=(",", ":")) + "\n"
+
+
+def _csv_lines(rows, fields):
+    writer = csv.writer(_LineBuffer())
+    yield writer.writerow(fields)
+    for row in rows:
+        values = [row[field] for field in fields]
+        yield writer.writerow(
+            [
+                json.dumps(value) if isinstance(value, (dict, list)) else value
+                for value in values
+            ]
+        )
+
+
+def _batched(lines, size=64 * 1024):
+    # Join lines into ~64KB chunks to keep the per-chunk overhead low.
+    batch, length = [], 0
+    for line in lines:
+        batch.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(batch).encode()
+            batch, length = [], 0
+    if batch:
+        yield "".join(batch).encode()
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_rows(rows, fields, export_format, gzip=False):
+    if export_format == "csv":
+        lines = _csv_lines(rows, fields)
+    else:
+        lines = _ndjson_lines(rows)
+    chunks = _batched(lines)
+    return _gzipped(chunks) if gzip else chunks
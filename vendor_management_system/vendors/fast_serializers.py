@@ -0,0 +1,113 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .instrumentation import timed_serialization
+
+
+# The time zone DateTimeField.enforce_timezone converts to, looked up once per
+# list instead of once per value.
+def current_timezone():
+    return timezone.get_current_timezone() if settings.USE_TZ else None
+
+
+# Same output as DateTimeField.to_representation for ISO 8601 formatted fields
+# and aware values, with the format and time zone resolved up front.
+def datetime_converter(field, tz):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    tz = field.timezone if hasattr(field, "timezone") else tz
+    if output_format is None or output_format.lower() != ISO_8601 or tz is None:
+        return field.to_representation
+
+    def convert(value):
+        if value.utcoffset() is None:
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+# Converter of a serializer field applied to a non null column value, None when
+# the database value is already what the field would return.
+def field_converter(field, tz):
+    if isinstance(field, serializers.DateTimeField):
+        return datetime_converter(field, tz)
+    if isinstance(field, serializers.FloatField):
+        return float
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return None
+    if isinstance(field, serializers.JSONField) and not field.binary:
+        return None
+    if type(field) in (serializers.CharField, serializers.IntegerField):
+        return None
+    return field.to_representation
+
+
+class ValuesSerializer:
+    # Read path of a ModelSerializer for list responses. Rows are fetched with
+    # .values() and turned into dicts by converters chosen once per field, so
+    # no model instance is built and no DRF field runs per row. The output is
+    # the same as ``serializer_class(rows, many=True).data``.
+    def __init__(self, serializer_class, fields=None):
+        serializer = serializer_class(context={"fields": fields})
+        opts = serializer.Meta.model._meta
+        self.fields = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            try:
+                column = opts.get_field(field.source).attname
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name} is not a model column."
+                )
+            self.fields.append((name, column, field))
+        self.columns = tuple(column for _, column, _ in self.fields)
+        self._plans = {}
+
+    def values(self, queryset, extra_columns=()):
+        # ``extra_columns`` are also selected, e.g. the keyset ordering fields.
+        columns = self.columns + tuple(
+            column for column in extra_columns if column not in self.columns
+        )
+        return queryset.values(*columns)
+
+    def get_plan(self):
+        # (name, column, converter) of each field for the current time zone.
+        tz = current_timezone()
+        plan = self._plans.get(tz)
+        if plan is None:
+            plan = self._plans[tz] = tuple(
+                (name, column, field_converter(field, tz))
+                for name, column, field in self.fields
+            )
+        return plan
+
+    def _serialize(self, rows):
+        plan = self.get_plan()
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in plan:
+                value = row[column]
+                if value is not None and convert is not None:
+                    value = convert(value)
+                item[name] = value
+            data.append(item)
+        return data
+
+    def serialize(self, rows):
+        return timed_serialization(self._serialize, rows)
+
+
+# ValuesSerializer of a serializer class and ``fields`` tuple, built once.
+@lru_cache(maxsize=None)
+def values_serializer(serializer_class, fields=None):
+    return ValuesSerializer(serializer_class, fields)
@@ -0,0 +1,307 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Stats of the request being handled, None outside InstrumentationMiddleware.
+# A context variable also follows the request into sync_to_async threads.
+_current = ContextVar("vendors_request_stats", default=None)
+
+
+class RequestStats:
+    # SQL and timing figures of one request, filled by record_query and
+    # timed_serialization while the request is handled.
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total_time = 0.0
+        self.query_count = 0
+        self.db_time = 0.0
+        self.slowest_query_time = 0.0
+        self.slowest_query = None
+        self.statements = Counter()
+        self.serialize_time = 0.0
+        self.serializing = False
+
+    def add_query(self, sql, duration):
+        self.query_count += 1
+        self.db_time += duration
+        self.statements[sql] += 1
+        if duration > self.slowest_query_time:
+            self.slowest_query_time = duration
+            self.slowest_query = sql
+
+    def duplicates(self, threshold):
+        # SQL statements (parameters left out) run at least ``threshold`` times,
+        # the usual sign of an N+1 query pattern.
+        return {
+            sql: count for sql, count in self.statements.items() if count >= threshold
+        }
+
+    def finish(self):
+        self.total_time = time.perf_counter() - self.started
+        return self
+
+    def server_timing(self, duplicates):
+        queries = "query" if self.query_count == 1 else "queries"
+        entries = [
+            f'db;dur={self.db_time * 1000:.3f};desc="{self.query_count} {queries}"',
+            f"db-slowest;dur={self.slowest_query_time * 1000:.3f}",
+            f"serialize;dur={self.serialize_time * 1000:.3f}",
+            f"total;dur={self.total_time * 1000:.3f}",
+        ]
+        if duplicates:
+            repeated = sum(duplicates.values())
+            entries.append(
+                f'n-plus-one;desc="{len(duplicates)} statements run {repeated} times"'
+            )
+        return ", ".join(entries)
+
+
+# Database execute wrapper timing every query run for an instrumented request.
+def record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add_query(sql, time.perf_counter() - started)
+
+
+# Install record_query on the given connection, or on the open connections of
+# this thread. It goes first so the wrappers pushed and popped by
+# connection.execute_wrapper() blocks stay last.
+def install_query_recorder(sender=None, connection=None, **kwargs):
+    targets = [connection] if connection else connections.all(initialized_only=True)
+    for target in targets:
+        if record_query not in target.execute_wrappers:
+            target.execute_wrappers.insert(0, record_query)
+
+
+# Call ``func`` and add its duration to the serialization time of the current
+# request. Nested calls (a list serializer rendering its rows, the renderer
+# encoding serializer output) are only counted once.
+def timed_serialization(func, *args, **kwargs):
+    stats = _current.get()
+    if stats is None or stats.serializing:
+        return func(*args, **kwargs)
+    stats.serializing = True
+    started = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        stats.serialize_time += time.perf_counter() - started
+        stats.serializing = False
+
+
+class TimedRepresentationMixin:
+    # Counts to_representation in the serialization time of the request.
+    def to_representation(self, instance):
+        return timed_serialization(super().to_representation, instance)
+
+
+class InstrumentedJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return timed_serialization(
+            super().render, data, accepted_media_type, renderer_context
+        )
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def samples(self):
+        # (le, cumulative count) pairs, ending with +Inf.
+        total = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            yield bound, total
+
+
+def _labels(**labels):
+    escaped = (
+        str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        for value in labels.values()
+    )
+    return ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped))
+
+
+class RequestMetrics:
+    # Per process histograms and counters of the instrumented requests, by
+    # method and route, rendered in the Prometheus text format. They are
+    # cumulative since the process started; rate() over them gives the figures
+    # of a rolling window.
+    histograms = {
+        "vms_http_request_duration_seconds": (
+            "Wall time of the request.",
+            DURATION_BUCKETS,
+            "total_time",
+        ),
+        "vms_http_request_db_duration_seconds": (
+            "Time spent running SQL queries.",
+            DURATION_BUCKETS,
+            "db_time",
+        ),
+        "vms_http_request_serialize_duration_seconds": (
+            "Time spent serializing and rendering the response.",
+            DURATION_BUCKETS,
+            "serialize_time",
+        ),
+        "vms_http_request_queries": (
+            "SQL queries run by the request.",
+            QUERY_COUNT_BUCKETS,
+            "query_count",
+        ),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {name: {} for name in self.histograms}
+            self._requests = Counter()
+            self._duplicates = Counter()
+            self._slowest = {}
+
+    def observe(self, method, route, status, stats, duplicates):
+        key = (method, route)
+        with self._lock:
+            for name, (_, buckets, attribute) in self.histograms.items():
+                histogram = self._histograms[name].get(key)
+                if histogram is None:
+                    histogram = self._histograms[name][key] = Histogram(buckets)
+                histogram.observe(getattr(stats, attribute))
+            self._requests[(method, route, status)] += 1
+            self._duplicates[key] += sum(duplicates.values())
+            self._slowest[key] = max(
+                self._slowest.get(key, 0.0), stats.slowest_query_time
+            )
+
+    def render(self):
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP vms_http_requests_total Instrumented requests.",
+                "# TYPE vms_http_requests_total counter",
+            ]
+            for (method, route, status), count in sorted(self._requests.items()):
+                labels = _labels(method=method, route=route, status=status)
+                lines.append(f"vms_http_requests_total{{{labels}}} {count}")
+            for name, (help_text, _, _) in self.histograms.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for key, histogram in sorted(self._histograms[name].items()):
+                    labels = _labels(method=key[0], route=key[1])
+                    for bound, count in histogram.samples():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {count}")
+            lines += [
+                "# HELP vms_http_request_duplicate_queries_total Queries run by "
+                "statements repeated at least "
+                "API_INSTRUMENTATION_DUPLICATE_THRESHOLD times in a request.",
+                "# TYPE vms_http_request_duplicate_queries_total counter",
+            ]
+            for (method, route), count in sorted(self._duplicates.items()):
+                labels = _labels(method=method, route=route)
+                lines.append(
+                    f"vms_http_request_duplicate_queries_total{{{labels}}} {count}"
+                )
+            lines += [
+                "# HELP vms_http_request_slowest_query_seconds Slowest SQL query seen.",
+                "# TYPE vms_http_request_slowest_query_seconds gauge",
+            ]
+            for (method, route), value in sorted(self._slowest.items()):
+                labels = _labels(method=method, route=route)
+                lines.append(
+                    f"vms_http_request_slowest_query_seconds{{{labels}}} {value}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+class InstrumentationMiddleware:
+    # Records the queries, SQL time, duplicated statements, serialization time
+    # and wall time of each request, returns them in a Server-Timing header and
+    # adds them to request_metrics. Enabled by API_INSTRUMENTATION.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.API_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.duplicate_threshold = settings.API_INSTRUMENTATION_DUPLICATE_THRESHOLD
+        connection_created.connect(
+            install_query_recorder, dispatch_uid="vendors.install_query_recorder"
+        )
+        install_query_recorder()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats.finish())
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats.finish())
+
+    def finish(self, request, response, stats):
+        duplicates = stats.duplicates(self.duplicate_threshold)
+        match = request.resolver_match
+        route = match.route if match else "<unmatched>"
+        response["Server-Timing"] = stats.server_timing(duplicates)
+        request_metrics.observe(
+            request.method, route, response.status_code, stats, duplicates
+        )
+        if duplicates:
+            sql, count = max(duplicates.items(), key=lambda item: item[1])
+            logger.warning(
+                "%s %s ran the same query %d times: %s",
+                request.method,
+                request.path,
+                count,
+                sql,
+            )
+        return response
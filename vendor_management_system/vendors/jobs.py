@@ -0,0 +1,50 @@
+from django.conf import settings
+
+from .cache import performance_cache
+from .metrics import VendorMetrics, compute_metrics_by_vendor
+from .models import Vendor
+from .serializers import VendorSerializer
+from .snapshots import snapshot_vendor_performance
+
+
+# Tasks of SCHEDULER_JOBS are called without arguments, the message they return
+# is stored as the job's last result.
+
+# HistoricalPerfomance rows of every vendor for the current period.
+def snapshot_vendor_kpis():
+    interval = settings.VENDOR_PERFORMANCE_SNAPSHOT_INTERVAL
+    written = snapshot_vendor_performance(interval)
+    return f"Stored {interval} snapshots for {written} vendor(s)."
+
+
+# Store the payload of GET /api/vendors/<id>/performance/ of every vendor in
+# the performance cache, with one grouped aggregate per chunk of vendors. The
+# vendors written while their chunk was computed are skipped: their payload
+# may predate a purchase order write that already invalidated it.
+def warm_vendor_performance(chunk_size=1000):
+    vendors = Vendor.objects.order_by("pk")
+    warmed = 0
+    last_pk = 0
+    while True:
+        chunk = list(vendors.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return f"Warmed the performance payloads of {warmed} vendor(s)."
+        by_vendor = compute_metrics_by_vendor(
+            Vendor.objects.filter(pk__in=[vendor.pk for vendor in chunk])
+        )
+        for vendor in chunk:
+            by_vendor.get(vendor.pk, VendorMetrics(vendor.pk)).apply_to(vendor)
+        payloads = VendorSerializer(chunk, many=True).data
+        updated_at = dict(
+            Vendor.objects.filter(pk__in=[vendor.pk for vendor in chunk]).values_list(
+                "pk", "updated_at"
+            )
+        )
+        fresh = {
+            vendor.pk: payload
+            for vendor, payload in zip(chunk, payloads)
+            if updated_at.get(vendor.pk) == vendor.updated_at
+        }
+        performance_cache.set_many(fresh)
+        warmed += len(fresh)
+        last_pk = chunk[-1].pk
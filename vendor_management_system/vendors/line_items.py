@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .models import PurchaseOrder, PurchaseOrderLineItem, parse_line_items
+
+
+# Line item rows of (purchase order id, vendor id, items) triples.
+def build_line_items(rows):
+    return [
+        PurchaseOrderLineItem(
+            purchase_order_id=purchase_order_id,
+            vendor_id=vendor_id,
+            sku=sku,
+            quantity=quantity,
+        )
+        for purchase_order_id, vendor_id, items in rows
+        for sku, quantity in parse_line_items(items)
+    ]
+
+
+# Index the line items of newly inserted purchase orders, one INSERT per batch
+# and none when they have no SKU lines.
+def create_line_items(purchase_orders, batch_size=None):
+    line_items = build_line_items(
+        (purchase_order.pk, purchase_order.vendor_id, purchase_order.items)
+        for purchase_order in purchase_orders
+    )
+    if line_items:
+        PurchaseOrderLineItem.objects.bulk_create(line_items, batch_size=batch_size)
+    return len(line_items)
+
+
+def replace_line_items(purchase_orders):
+    purchase_orders = list(purchase_orders)
+    with transaction.atomic():
+        PurchaseOrderLineItem.objects.filter(
+            purchase_order_id__in=[po.pk for po in purchase_orders]
+        ).delete()
+        return create_line_items(purchase_orders)
+
+
+# Rebuild the index of the purchase orders in ``queryset`` from their items,
+# for rows written without the model signals (raw SQL, fixtures, update()).
+# Without a queryset the whole index is rebuilt, dropping orphaned rows too.
+# Returns the number of indexed line items.
+def rebuild_line_items(queryset=None, batch_size=1000):
+    line_items = PurchaseOrderLineItem.objects.all()
+    if queryset is None:
+        queryset = PurchaseOrder.objects.all()
+    else:
+        line_items = line_items.filter(
+            purchase_order_id__in=queryset.order_by().values("pk")
+        )
+    rows = queryset.order_by().values_list("pk", "vendor_id", "items")
+    indexed = 0
+    with transaction.atomic():
+        line_items.delete()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) == batch_size:
+                indexed += len(
+                    PurchaseOrderLineItem.objects.bulk_create(build_line_items(batch))
+                )
+                batch = []
+        if batch:
+            indexed += len(
+                PurchaseOrderLineItem.objects.bulk_create(build_line_items(batch))
+            )
+    return indexed
+
+
+# Totals of one SKU over the line items in ``line_items``, overall and per
+# vendor, largest quantity first. A grouped scan of the (sku, vendor) index.
+def sku_summary(sku, line_items=None):
+    if line_items is None:
+        line_items = PurchaseOrderLineItem.objects.all()
+    vendors = list(
+        line_items.filter(sku=sku)
+        .values("vendor_id")
+        .annotate(
+            line_items=Count("pk"),
+            purchase_orders=Count("purchase_order_id", distinct=True),
+            total_quantity=Sum("quantity"),
+        )
+        .order_by("vendor_id")
+    )
+    for row in vendors:
+        row["vendor"] = row.pop("vendor_id")
+        row["total_quantity"] = row["total_quantity"] or 0
+    vendors.sort(key=lambda row: -row["total_quantity"])
+    return {
+        "sku": sku,
+        "line_items": sum(row["line_items"] for row in vendors),
+        # A purchase order belongs to one vendor, so the counts add up.
+        "purchase_orders": sum(row["purchase_orders"] for row in vendors),
+        "total_quantity": sum(row["total_quantity"] for row in vendors),
+        "vendors": vendors,
+    }
@@ -0,0 +1,63 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from vendors import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the completed purchase orders older than the archive horizon into "
+        "compressed columnar segment files, keeping their counters in per-vendor "
+        "rollups and their po_number retrievable."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=settings.PURCHASE_ORDER_ARCHIVE_HORIZON_DAYS,
+            help="Archive the completed orders issued more than this many days ago.",
+        )
+        parser.add_argument(
+            "--segment-rows",
+            type=int,
+            default=settings.PURCHASE_ORDER_ARCHIVE_SEGMENT_ROWS,
+            help="Purchase orders per segment file and transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the purchase orders that would be archived.",
+        )
+
+    def handle(self, *args, older_than, segment_rows, dry_run=False, **options):
+        if not archive.available():
+            raise CommandError("Archiving requires numpy: pip install numpy")
+        if not settings.PURCHASE_ORDER_ARCHIVE_DIR:
+            raise CommandError("Set PURCHASE_ORDER_ARCHIVE_DIR to enable archiving.")
+        if older_than < 0 or segment_rows < 1:
+            raise CommandError(
+                "--older-than must not be negative, --segment-rows positive."
+            )
+        before = timezone.now() - timedelta(days=older_than)
+        if dry_run:
+            count = archive.archivable(before).count()
+            self.stdout.write(
+                f"{count} completed purchase order(s) issued before "
+                f"{before:%Y-%m-%d %H:%M} would be archived."
+            )
+            return
+        started = time.monotonic()
+        result = archive.archive_purchase_orders(before, segment_rows)
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {result.purchase_orders} purchase order(s) in "
+                f"{result.segments} segment(s), {result.bytes / 1024:.1f} KiB "
+                f"({elapsed:.2f}s)."
+            )
+        )
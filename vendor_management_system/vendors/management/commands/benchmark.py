@@ -0,0 +1,19 @@
+from importlib import import_module
+
+from django.core.management.base import BaseCommand
+
+from vendors.benchmarks import BENCHMARKS
+
+
+class Command(BaseCommand):
+    help = "Run a vendors benchmark against the configured database."
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest="benchmark", required=True)
+        for name in BENCHMARKS:
+            module = import_module(f"vendors.benchmarks.{name}")
+            module.add_arguments(subparsers.add_parser(name, help=module.help))
+
+    def handle(self, *args, benchmark, stdout=None, stderr=None, **options):
+        module = import_module(f"vendors.benchmarks.{benchmark}")
+        module.run(self.stdout, **options)
@@ -0,0 +1,81 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from vendors.partitioning import (
+    UNIQUENESS_WARNING,
+    layout_statements,
+    partition_row_counts,
+    purchase_order_table,
+    read_layout,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the purchase order table as a PostgreSQL table hash partitioned "
+        "by vendor, copying the existing rows, or back into a single table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--partitions",
+            type=int,
+            default=16,
+            help="Number of hash partitions, 0 to merge back into a single table.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print the SQL statements without running them.",
+        )
+        parser.add_argument(
+            "--status",
+            action="store_true",
+            help="Show the current partitions and their row counts.",
+        )
+
+    def handle(self, *args, partitions, dry_run=False, status=False, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError(
+                "Partitioned purchase orders require the postgresql database profile."
+            )
+        if partitions < 0:
+            raise CommandError("--partitions must be 0 or more.")
+        table, pk_column = purchase_order_table()
+        with connection.cursor() as cursor:
+            layout = read_layout(cursor, table)
+            if status:
+                counts = partition_row_counts(cursor)
+                if not layout.partitions:
+                    self.stdout.write(f"{table} is not partitioned.")
+                for name, count in counts.items():
+                    self.stdout.write(f"{name}: {count} row(s)")
+                return
+        if len(layout.partitions) == partitions:
+            self.stdout.write(f"{table} already has {partitions} partition(s).")
+            return
+        if layout.referenced_by:
+            raise CommandError(
+                f"{table} is referenced by {', '.join(layout.referenced_by)}. Foreign "
+                "keys to a partitioned table need a unique key including vendor_id."
+            )
+
+        statements = layout_statements(table, layout, partitions, pk_column)
+        if partitions:
+            self.stderr.write(self.style.WARNING(UNIQUENESS_WARNING))
+        if dry_run:
+            for statement in statements:
+                self.stdout.write(f"{statement};")
+            return
+        # Writers wait on the table lock until the rebuild commits.
+        with transaction.atomic(), connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+        if partitions:
+            message = f"Partitioned {table} into {partitions} partition(s)."
+        else:
+            message = (
+                f"Merged the {len(layout.partitions)} partition(s) of {table} "
+                "into a single table."
+            )
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from vendors.deferred import process_queue, run_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the metrics of vendors queued by the deferred metrics mode, "
+        "once per vendor per time window."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the current queue and exit instead of polling.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=getattr(settings, "VENDOR_METRICS_QUEUE_INTERVAL", 5.0),
+            help="Seconds between queue runs.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of threads recomputing vendor chunks.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Vendors recomputed per transaction.",
+        )
+
+    def handle(self, *args, once, interval, workers, chunk_size, **options):
+        if once:
+            processed = process_queue(workers=workers, chunk_size=chunk_size)
+            self.stdout.write(
+                self.style.SUCCESS(f"Recomputed metrics for {processed} vendor(s).")
+            )
+            return
+        self.stdout.write(f"Processing the metrics queue every {interval}s.")
+        try:
+            run_worker(interval, workers=workers, chunk_size=chunk_size)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from vendors.line_items import rebuild_line_items
+from vendors.models import PurchaseOrder
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the purchase order line item (SKU) index from the items of the "
+        "purchase orders, after writes that bypassed the model signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--vendor",
+            type=int,
+            action="append",
+            dest="vendor_ids",
+            help="Only rebuild the purchase orders of the given vendor id "
+            "(can be repeated).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, vendor_ids=None, batch_size=1000, **options):
+        purchase_orders = None
+        if vendor_ids:
+            purchase_orders = PurchaseOrder.objects.filter(vendor_id__in=vendor_ids)
+        indexed = rebuild_line_items(purchase_orders, batch_size=max(1, batch_size))
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} line item(s)."))
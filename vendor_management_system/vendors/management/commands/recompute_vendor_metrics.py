@@ -0,0 +1,93 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from vendors.models import Vendor
+from vendors.recompute import recompute_vendor_chunks
+
+
+def format_value(value):
+    return f"{value:.6g}" if isinstance(value, float) else str(value)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored metrics of every vendor (or the given ones) from "
+        "their purchase orders in chunks, optionally in parallel worker "
+        "processes, and report the vendors whose values changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--vendor",
+            type=int,
+            action="append",
+            dest="vendor_ids",
+            help="Only recompute the given vendor id (can be repeated).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Worker processes, each with its own database connection.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Vendors recomputed per aggregate query and transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the differences, without writing them.",
+        )
+
+    def handle(
+        self, *args, vendor_ids=None, workers, chunk_size, dry_run=False, **options
+    ):
+        if workers < 1 or chunk_size < 1:
+            raise CommandError("--workers and --chunk-size must be at least 1.")
+        vendors = Vendor.objects.order_by("pk")
+        if vendor_ids:
+            vendors = vendors.filter(pk__in=vendor_ids)
+        vendor_ids = list(vendors.values_list("pk", flat=True))
+        chunks = -(-len(vendor_ids) // chunk_size)
+        self.stdout.write(
+            f"Recomputing {len(vendor_ids)} vendor(s) in {chunks} chunk(s) "
+            f"with {workers} worker(s)."
+        )
+
+        started = time.monotonic()
+        done = 0
+        changes = {}
+        for result in recompute_vendor_chunks(
+            vendor_ids, workers=workers, chunk_size=chunk_size, dry_run=dry_run
+        ):
+            done += result.vendors
+            changes.update(result.changes)
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f"  {done}/{len(vendor_ids)} vendor(s), {len(changes)} changed, "
+                f"{done / elapsed if elapsed else 0:.0f} vendor(s)/s"
+            )
+        elapsed = time.monotonic() - started
+
+        for vendor_id in sorted(changes):
+            self.stdout.write(f"Vendor {vendor_id}:")
+            for field, (stored, value) in changes[vendor_id].items():
+                self.stdout.write(
+                    f"  {field}: {format_value(stored)} -> {format_value(value)}"
+                )
+        throughput = len(vendor_ids) / elapsed if elapsed else 0
+        if dry_run:
+            message = (
+                f"Dry run: {len(changes)} of {len(vendor_ids)} vendor(s) would "
+                f"change ({elapsed:.2f}s, {throughput:.0f} vendor(s)/s)."
+            )
+        else:
+            message = (
+                f"Recomputed {len(vendor_ids)} vendor(s), {len(changes)} changed "
+                f"({elapsed:.2f}s, {throughput:.0f} vendor(s)/s)."
+            )
+        self.stdout.write(self.style.SUCCESS(message))
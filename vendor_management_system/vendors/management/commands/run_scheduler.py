@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from vendors.models import ScheduledJob
+from vendors.scheduler import Scheduler, default_node, sync_jobs
+
+
+def format_seconds(value):
+    return "-" if value is None else f"{value:.2f}s"
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the periodic jobs of the job table (created from SCHEDULER_JOBS) "
+        "in a thread pool. Several nodes can run the scheduler, each job run is "
+        "claimed by one of them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs that are due and exit instead of polling.",
+        )
+        parser.add_argument(
+            "--run",
+            action="append",
+            metavar="JOB",
+            help="Run the given job now and exit (can be repeated).",
+        )
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            dest="show_jobs",
+            help="Print the jobs with their next run and runtime stats.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.SCHEDULER_WORKERS,
+            help="Number of threads running jobs.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.SCHEDULER_POLL_INTERVAL,
+            help="Seconds between polls of the job table.",
+        )
+        parser.add_argument(
+            "--node",
+            default=default_node(),
+            help="Name of this scheduler in the job locks (default: host:pid).",
+        )
+
+    def handle(
+        self, *args, once, run, show_jobs, workers, poll_interval, node, **options
+    ):
+        if workers < 1 or poll_interval <= 0:
+            raise CommandError("--workers and --poll-interval must be positive.")
+        try:
+            sync_jobs()
+        except (KeyError, ValueError) as e:
+            raise CommandError(f"Invalid SCHEDULER_JOBS: {e}")
+        if show_jobs:
+            self.list_jobs()
+            return
+
+        scheduler = Scheduler(node, workers=workers, poll_interval=poll_interval)
+        if run:
+            self.run_jobs(scheduler, run)
+            return
+        if once:
+            jobs = scheduler.run_pending()
+            self.stdout.write(self.style.SUCCESS(f"Ran {len(jobs)} due job(s)."))
+            return
+        self.stdout.write(
+            f"Scheduler {node} polling every {poll_interval}s "
+            f"with {workers} worker(s)."
+        )
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            pass
+
+    def run_jobs(self, scheduler, names):
+        jobs = ScheduledJob.objects.in_bulk(names, field_name="name")
+        unknown = sorted(set(names) - set(jobs))
+        if unknown:
+            raise CommandError(f"Unknown job(s): {', '.join(unknown)}.")
+        for name in names:
+            succeeded = scheduler.run_now(jobs[name])
+            if succeeded is None:
+                self.stderr.write(f"{name}: running on another node, skipped.")
+                continue
+            jobs[name].refresh_from_db()
+            style = self.style.SUCCESS if succeeded else self.style.ERROR
+            result = jobs[name].last_result if succeeded else jobs[name].last_error
+            self.stdout.write(style(f"{name} {jobs[name].last_status}: {result}"))
+
+    def list_jobs(self):
+        for job in ScheduledJob.objects.order_by("name"):
+            trigger = job.cron or f"every {job.interval_seconds}s"
+            state = "enabled" if job.enabled else "disabled"
+            if job.locked_by:
+                state = f"locked by {job.locked_by} until {job.locked_until}"
+            self.stdout.write(f"{job.name} ({trigger}, {state})")
+            self.stdout.write(
+                f"  next run: {job.next_run_at}, last: {job.last_status or '-'} "
+                f"at {job.last_started_at}"
+            )
+            self.stdout.write(
+                f"  runs: {job.run_count}, failures: {job.failure_count}, "
+                f"runtime last/avg/max: {format_seconds(job.last_runtime)}"
+                f"/{format_seconds(job.average_runtime)}"
+                f"/{format_seconds(job.max_runtime if job.run_count else None)}"
+            )
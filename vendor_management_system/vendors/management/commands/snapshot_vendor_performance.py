@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from vendors.snapshots import SNAPSHOT_INTERVALS, snapshot_vendor_performance
+
+
+class Command(BaseCommand):
+    help = "Store a HistoricalPerfomance snapshot of every vendor's metrics."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            choices=SNAPSHOT_INTERVALS,
+            default=settings.VENDOR_PERFORMANCE_SNAPSHOT_INTERVAL,
+            help="Snapshot period, one row per vendor per period.",
+        )
+        parser.add_argument(
+            "--at",
+            help="ISO datetime inside the period to snapshot (default: now).",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, interval, at, chunk_size, **options):
+        moment = None
+        if at:
+            moment = parse_datetime(at)
+            if moment is None:
+                raise CommandError(f"Invalid datetime {at!r}.")
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment)
+        written = snapshot_vendor_performance(interval, moment, chunk_size)
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored {interval} snapshots for {written} vendor(s).")
+        )
@@ -0,0 +1,80 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from vendors import analytics
+from vendors.models import PurchaseOrder
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the analytics reports (response time percentiles, on-time rate "
+        "histogram, monthly cohort KPIs) as JSON, computed with numpy from one "
+        "read of the purchase order columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "reports",
+            nargs="*",
+            help=f"Reports to print ({', '.join(analytics.REPORTS)}), all by default.",
+        )
+        parser.add_argument("--vendor", type=int, help="Only this vendor id.")
+        parser.add_argument(
+            "--from", dest="start", help="Only orders issued at or after (ISO 8601)."
+        )
+        parser.add_argument(
+            "--to", dest="end", help="Only orders issued at or before (ISO 8601)."
+        )
+        parser.add_argument(
+            "--percentiles",
+            type=lambda value: tuple(float(part) for part in value.split(",")),
+            default=analytics.DEFAULT_PERCENTILES,
+            help="Comma separated response time percentiles.",
+        )
+        parser.add_argument(
+            "--bins", type=int, default=10, help="Bins of the on-time histogram."
+        )
+
+    def parse_datetime(self, option, value):
+        parsed = parse_datetime(value) if value else None
+        if value and parsed is None:
+            raise CommandError(f"{option} must be an ISO 8601 datetime.")
+        return parsed
+
+    def handle(
+        self, *args, reports, vendor, start, end, percentiles, bins, **options
+    ):
+        if not analytics.available():
+            raise CommandError("Analytics require numpy: pip install numpy")
+        unknown = sorted(set(reports) - set(analytics.REPORTS))
+        if unknown:
+            raise CommandError(f"Unknown report(s): {', '.join(unknown)}.")
+        queryset = PurchaseOrder.objects.all()
+        if vendor is not None:
+            queryset = queryset.filter(vendor_id=vendor)
+        start = self.parse_datetime("--from", start)
+        end = self.parse_datetime("--to", end)
+        if start:
+            queryset = queryset.filter(issue_date__gte=start)
+        if end:
+            queryset = queryset.filter(issue_date__lte=end)
+
+        started = time.monotonic()
+        columns = analytics.PurchaseOrderColumns.load(queryset)
+        loaded = time.monotonic()
+        params = {
+            "response_times": {"percentiles": percentiles},
+            "on_time_histogram": {"bins": bins},
+        }
+        results = {
+            name: analytics.REPORTS[name](columns, **params.get(name, {}))
+            for name in reports or analytics.REPORTS
+        }
+        self.stdout.write(json.dumps(results, indent=2))
+        self.stderr.write(
+            f"{len(columns)} purchase order(s) loaded in {loaded - started:.2f}s, "
+            f"reports computed in {time.monotonic() - loaded:.2f}s."
+        )
@@ -0,0 +1,216 @@
+import heapq
+import itertools
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import reduce
+from operator import add, attrgetter
+
+from django.conf import settings
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q, Sum
+
+from .models import (
+    PurchaseOrder,
+    ArchivedPurchaseOrderRollup,
+    ON_TIME_GRACE_PERIOD,
+    METRIC_COUNTER_FIELDS,
+    METRIC_RATE_FIELDS,
+)
+
+SECONDS_PER_DAY = timedelta(days=1).total_seconds()
+
+# Rate -> value of a perfect vendor, to bring the rates weighted into the
+# performance score to a common 0..1 range.
+SCORE_SCALES = {
+    "on_time_delivery_rate": 100.0,
+    "quality_rating_avg": 5.0,
+    "fulfillment_rate": 100.0,
+}
+
+
+# Weighted mean of the normalised rates, from 0 to 100. ``rates`` maps the
+# rate fields of SCORE_SCALES to their values.
+def performance_score(rates, weights=None):
+    weights = settings.VENDOR_SCORE_WEIGHTS if weights is None else weights
+    total = sum(weights.values())
+    if not total:
+        return 0.0
+    weighted = sum(
+        weight * rates[field] / SCORE_SCALES[field] for field, weight in weights.items()
+    )
+    return 100 * weighted / total
+
+_COMPLETED = Q(status="completed")
+
+# Conditional aggregates computing every vendor KPI input in a single pass over
+# the purchase order rows. Durations are averaged on the database side.
+METRIC_AGGREGATES = {
+    "total_pos": Count("pk"),
+    "completed_pos": Count("pk", filter=_COMPLETED),
+    "on_time_pos": Count(
+        "pk",
+        filter=_COMPLETED
+        & Q(delivery_date__lte=F("issue_date") + ON_TIME_GRACE_PERIOD),
+    ),
+    "quality_rating_sum": Sum("quality_rating", filter=_COMPLETED),
+    "quality_rating_count": Count("quality_rating", filter=_COMPLETED),
+    "response_time_avg": Avg(
+        ExpressionWrapper(
+            F("acknowledgment_date") - F("issue_date"), output_field=DurationField()
+        ),
+        filter=_COMPLETED,
+    ),
+    "response_time_count": Count("acknowledgment_date", filter=_COMPLETED),
+}
+
+
+@dataclass(frozen=True)
+class VendorMetrics:
+    vendor_id: int
+    total_pos: int = 0
+    completed_pos: int = 0
+    on_time_pos: int = 0
+    quality_rating_sum: float = 0.0
+    quality_rating_count: int = 0
+    response_time_sum: float = 0.0  # in days
+    response_time_count: int = 0
+
+    @classmethod
+    def from_row(cls, vendor_id, row):
+        response_time_avg = row["response_time_avg"] or timedelta(0)
+        return cls(
+            vendor_id=vendor_id,
+            total_pos=row["total_pos"],
+            completed_pos=row["completed_pos"],
+            on_time_pos=row["on_time_pos"],
+            quality_rating_sum=row["quality_rating_sum"] or 0.0,
+            quality_rating_count=row["quality_rating_count"],
+            response_time_sum=(
+                response_time_avg.total_seconds() / SECONDS_PER_DAY
+            )
+            * row["response_time_count"],
+            response_time_count=row["response_time_count"],
+        )
+
+    @property
+    def on_time_delivery_rate(self):
+        if not self.completed_pos:
+            return 0.0
+        return (self.on_time_pos / self.completed_pos) * 100
+
+    @property
+    def quality_rating_avg(self):
+        if not self.quality_rating_count:
+            return 0.0
+        return self.quality_rating_sum / self.quality_rating_count
+
+    @property
+    def average_response_time(self):
+        if not self.response_time_count:
+            return 0.0
+        return self.response_time_sum / self.response_time_count
+
+    @property
+    def fulfillment_rate(self):
+        if not self.total_pos:
+            return 0.0
+        return (self.completed_pos / self.total_pos) * 100
+
+    @property
+    def performance_score(self):
+        return performance_score(
+            {field: getattr(self, field) for field in SCORE_SCALES}
+        )
+
+    @classmethod
+    def from_rollup(cls, rollup):
+        return cls(
+            rollup.vendor_id,
+            **{field: getattr(rollup, field) for field in METRIC_COUNTER_FIELDS},
+        )
+
+    def __add__(self, other):
+        return VendorMetrics(
+            self.vendor_id,
+            **{
+                field: getattr(self, field) + getattr(other, field)
+                for field in METRIC_COUNTER_FIELDS
+            },
+        )
+
+    def counters(self):
+        return {field: getattr(self, field) for field in METRIC_COUNTER_FIELDS}
+
+    def values(self):
+        # Counter and rate column values as stored on Vendor.
+        values = self.counters()
+        for field in METRIC_RATE_FIELDS:
+            values[field] = getattr(self, field)
+        return values
+
+    def apply_to(self, vendor):
+        # Copy the counters onto a Vendor instance and derive its rate fields.
+        for field, value in self.counters().items():
+            setattr(vendor, field, value)
+        vendor.refresh_metrics_from_counters()
+        return vendor
+
+
+# Compute the metrics of one vendor (instance or pk) in a single query, plus
+# a primary key lookup of its archived rollup.
+def compute_vendor_metrics(vendor):
+    vendor_id = getattr(vendor, "pk", vendor)
+    row = PurchaseOrder.objects.filter(vendor_id=vendor_id).aggregate(
+        **METRIC_AGGREGATES
+    )
+    metrics = VendorMetrics.from_row(vendor_id, row)
+    rollup = ArchivedPurchaseOrderRollup.objects.filter(vendor_id=vendor_id)
+    for archived in rollup:
+        metrics += VendorMetrics.from_rollup(archived)
+    return metrics
+
+
+async def acompute_vendor_metrics(vendor):
+    vendor_id = getattr(vendor, "pk", vendor)
+    row = await PurchaseOrder.objects.filter(vendor_id=vendor_id).aaggregate(
+        **METRIC_AGGREGATES
+    )
+    metrics = VendorMetrics.from_row(vendor_id, row)
+    rollup = ArchivedPurchaseOrderRollup.objects.filter(vendor_id=vendor_id)
+    async for archived in rollup:
+        metrics += VendorMetrics.from_rollup(archived)
+    return metrics
+
+
+# The grouped aggregate behind iter_vendor_metrics, one row per vendor_id.
+def metrics_queryset(vendors=None):
+    purchase_orders = PurchaseOrder.objects.all()
+    if vendors is not None:
+        purchase_orders = purchase_orders.filter(vendor__in=vendors.values("pk"))
+    return (
+        purchase_orders.order_by("vendor_id")
+        .values("vendor_id")
+        .annotate(**METRIC_AGGREGATES)
+    )
+
+
+# Yield VendorMetrics, ordered by vendor_id, for every vendor of ``vendors`` (a
+# Vendor queryset, or all vendors) that has purchase orders, using one query
+# grouped by vendor_id. The archived rollups, read in a second query, are merged
+# in, including vendors with only archived orders.
+def iter_vendor_metrics(vendors=None, chunk_size=2000):
+    rows = metrics_queryset(vendors).iterator(chunk_size=chunk_size)
+    live = (VendorMetrics.from_row(row["vendor_id"], row) for row in rows)
+    rollups = ArchivedPurchaseOrderRollup.objects.order_by("vendor_id")
+    if vendors is not None:
+        rollups = rollups.filter(vendor__in=vendors.values("pk"))
+    archived = (VendorMetrics.from_rollup(rollup) for rollup in rollups)
+    merged = heapq.merge(live, archived, key=attrgetter("vendor_id"))
+    for _, metrics in itertools.groupby(merged, key=attrgetter("vendor_id")):
+        yield reduce(add, metrics)
+
+
+# Return {vendor_id: VendorMetrics}. Vendors without purchase orders are absent,
+# read them with .get(pk, VendorMetrics(pk)).
+def compute_metrics_by_vendor(vendors=None):
+    return {metrics.vendor_id: metrics for metrics in iter_vendor_metrics(vendors)}
+
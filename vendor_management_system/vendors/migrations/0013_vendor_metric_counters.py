@@ -0,0 +1,70 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:15
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def populate_metric_counters(apps, schema_editor):
+    Vendor = apps.get_model('vendors', 'Vendor')
+    PurchaseOrder = apps.get_model('vendors', 'PurchaseOrder')
+    for vendor in Vendor.objects.all():
+        pos = PurchaseOrder.objects.filter(vendor=vendor)
+        vendor.total_pos = pos.count()
+        for po in pos.filter(status='completed'):
+            vendor.completed_pos += 1
+            if po.delivery_date <= po.issue_date + timedelta(days=7):
+                vendor.on_time_pos += 1
+            if po.quality_rating is not None:
+                vendor.quality_rating_sum += po.quality_rating
+                vendor.quality_rating_count += 1
+            if po.acknowledgment_date is not None:
+                vendor.response_time_sum += (po.acknowledgment_date - po.issue_date).days
+                vendor.response_time_count += 1
+        vendor.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0012_alter_purchaseorder_issue_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='completed_pos',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='on_time_pos',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='quality_rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='quality_rating_sum',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='response_time_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='response_time_sum',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='total_pos',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_metric_counters, migrations.RunPython.noop),
+    ]
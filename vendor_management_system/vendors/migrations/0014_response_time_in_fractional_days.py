@@ -0,0 +1,39 @@
+from django.db import migrations
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F
+
+
+def recompute_response_time_counters(apps, schema_editor):
+    # Response times used to be counted in whole days, store exact fractional days.
+    Vendor = apps.get_model('vendors', 'Vendor')
+    PurchaseOrder = apps.get_model('vendors', 'PurchaseOrder')
+    rows = (
+        PurchaseOrder.objects.filter(status='completed', acknowledgment_date__isnull=False)
+        .order_by()
+        .values('vendor_id')
+        .annotate(
+            avg=Avg(
+                ExpressionWrapper(
+                    F('acknowledgment_date') - F('issue_date'),
+                    output_field=DurationField(),
+                )
+            ),
+            count=Count('pk'),
+        )
+    )
+    for row in rows:
+        total = row['avg'].total_seconds() / 86400 * row['count']
+        Vendor.objects.filter(pk=row['vendor_id']).update(
+            response_time_sum=total,
+            average_response_time=total / row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0013_vendor_metric_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute_response_time_counters, migrations.RunPython.noop),
+    ]
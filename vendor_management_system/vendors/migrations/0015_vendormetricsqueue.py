@@ -0,0 +1,22 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0014_response_time_in_fractional_days'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendorMetricsQueue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queued_at', models.DateTimeField(db_index=True)),
+                ('vendor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='metrics_queue_entry', to='vendors.vendor')),
+            ],
+        ),
+    ]
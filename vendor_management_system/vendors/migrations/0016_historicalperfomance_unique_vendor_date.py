@@ -0,0 +1,17 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0015_vendormetricsqueue'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='historicalperfomance',
+            constraint=models.UniqueConstraint(fields=('vendor', 'date'), name='unique_vendor_performance_date'),
+        ),
+    ]
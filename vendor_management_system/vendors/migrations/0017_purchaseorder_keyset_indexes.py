@@ -0,0 +1,21 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0016_historicalperfomance_unique_vendor_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['issue_date', 'id'], name='po_issue_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['vendor', 'issue_date', 'id'], name='po_vendor_issue_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0017_purchaseorder_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['vendor', 'status'], name='po_vendor_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(condition=models.Q(('quality_rating__isnull', False), ('status', 'completed')), fields=['vendor', 'quality_rating'], name='po_vendor_completed_rated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(condition=models.Q(('acknowledgment_date__isnull', False), ('status', 'completed')), fields=['vendor', 'acknowledgment_date', 'issue_date'], name='po_vendor_completed_acked_idx'),
+        ),
+    ]
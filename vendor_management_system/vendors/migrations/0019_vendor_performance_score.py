@@ -0,0 +1,65 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:46
+
+import django.core.validators
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Value
+
+# Same formula as vendors.metrics.performance_score.
+SCORE_SCALES = {
+    'on_time_delivery_rate': 100.0,
+    'quality_rating_avg': 5.0,
+    'fulfillment_rate': 100.0,
+}
+
+
+def populate_performance_score(apps, schema_editor):
+    Vendor = apps.get_model('vendors', 'Vendor')
+    weights = settings.VENDOR_SCORE_WEIGHTS
+    total = sum(weights.values())
+    if not total:
+        return
+    score = sum(
+        (
+            F(field) * (100 * weight / SCORE_SCALES[field] / total)
+            for field, weight in weights.items()
+        ),
+        Value(0.0),
+    )
+    Vendor.objects.update(performance_score=score)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0018_purchaseorder_metric_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='performance_score',
+            field=models.FloatField(default=0.0, validators=[django.core.validators.MinValueValidator(0.0), django.core.validators.MaxValueValidator(100.0)]),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['-performance_score', 'id'], name='vendor_score_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['-on_time_delivery_rate', 'id'], name='vendor_on_time_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['-quality_rating_avg', 'id'], name='vendor_quality_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['-fulfillment_rate', 'id'], name='vendor_fulfillment_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(condition=models.Q(('response_time_count__gt', 0)), fields=['average_response_time', 'id'], name='vendor_response_rank_idx'),
+        ),
+        migrations.RunPython(populate_performance_score, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.0.4 on 2026-10-18 20:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+
+def populate_line_items(apps, schema_editor):
+    PurchaseOrder = apps.get_model('vendors', 'PurchaseOrder')
+    PurchaseOrderLineItem = apps.get_model('vendors', 'PurchaseOrderLineItem')
+    line_items = []
+    rows = PurchaseOrder.objects.values_list('pk', 'vendor_id', 'items')
+    for pk, vendor_id, items in rows.iterator(chunk_size=BATCH_SIZE):
+        if isinstance(items, dict):
+            items = [items]
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            sku = item.get('sku')
+            if isinstance(sku, bool) or not isinstance(sku, (str, int)):
+                continue
+            sku = str(sku).strip()
+            if not sku or len(sku) > 100:
+                continue
+            quantity = item.get('quantity')
+            if isinstance(quantity, bool) or not isinstance(quantity, int):
+                quantity = None
+            line_items.append(
+                PurchaseOrderLineItem(
+                    purchase_order_id=pk,
+                    vendor_id=vendor_id,
+                    sku=sku,
+                    quantity=quantity,
+                )
+            )
+            # Flush per batch, the table can hold millions of line items.
+            if len(line_items) == BATCH_SIZE:
+                PurchaseOrderLineItem.objects.bulk_create(line_items)
+                line_items = []
+    if line_items:
+        PurchaseOrderLineItem.objects.bulk_create(line_items)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0020_vendor_purchaseorder_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PurchaseOrderLineItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sku', models.CharField(max_length=100)),
+                ('quantity', models.IntegerField(blank=True, null=True)),
+                ('purchase_order', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='line_items', to='vendors.purchaseorder')),
+                ('vendor', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='vendors.vendor')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sku', 'vendor'], name='po_line_item_sku_vendor_idx'), models.Index(fields=['vendor', 'sku'], name='po_line_item_vendor_sku_idx')],
+            },
+        ),
+        migrations.RunPython(populate_line_items, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.4 on 2026-10-18 20:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0021_purchaseorderlineitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('task', models.CharField(max_length=255)),
+                ('interval_seconds', models.PositiveIntegerField(blank=True, null=True)),
+                ('cron', models.CharField(blank=True, max_length=100)),
+                ('enabled', models.BooleanField(default=True)),
+                ('next_run_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('locked_by', models.CharField(blank=True, max_length=255)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('last_started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_status', models.CharField(blank=True, choices=[('succeeded', 'Succeeded'), ('failed', 'Failed')], max_length=10)),
+                ('last_result', models.TextField(blank=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('run_count', models.PositiveIntegerField(default=0)),
+                ('failure_count', models.PositiveIntegerField(default=0)),
+                ('last_runtime', models.FloatField(blank=True, null=True)),
+                ('total_runtime', models.FloatField(default=0.0)),
+                ('max_runtime', models.FloatField(default=0.0)),
+            ],
+        ),
+    ]
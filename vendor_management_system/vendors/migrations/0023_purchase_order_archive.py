@@ -0,0 +1,39 @@
+# Generated by Django 5.0.4 on 2026-10-18 20:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0022_scheduledjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPurchaseOrderRollup',
+            fields=[
+                ('vendor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive_rollup', serialize=False, to='vendors.vendor')),
+                ('total_pos', models.PositiveIntegerField(default=0)),
+                ('completed_pos', models.PositiveIntegerField(default=0)),
+                ('on_time_pos', models.PositiveIntegerField(default=0)),
+                ('quality_rating_sum', models.FloatField(default=0.0)),
+                ('quality_rating_count', models.PositiveIntegerField(default=0)),
+                ('response_time_sum', models.FloatField(default=0.0)),
+                ('response_time_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PurchaseOrderArchiveSegment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('row_count', models.PositiveIntegerField()),
+                ('size_bytes', models.PositiveBigIntegerField()),
+                ('first_issue_date', models.DateTimeField()),
+                ('last_issue_date', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-18 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0023_purchase_order_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledjob',
+            name='managed',
+            field=models.BooleanField(default=False),
+        ),
+    ]
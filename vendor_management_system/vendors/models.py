@@ -1,18 +1,51 @@
 import uuid
-from django.utils.timezone import now
+from django.utils.timezone import now, is_naive, make_aware
 from django.db import models
 from datetime import datetime
-from django.db.models import Avg, Count
+from django.db.models import Count
 from datetime import timedelta
 from django.core.validators import MinValueValidator, MaxValueValidator, EmailValidator
 from django.core.exceptions import ValidationError
 import re
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.conf import settings
 from django.dispatch import receiver
 import logging
+from .cache import performance_cache
 
 logger = logging.getLogger(__name__)
 
+ON_TIME_GRACE_PERIOD = timedelta(days=7)
+
+# Running counters kept on Vendor so the rate fields can be derived without
+# scanning the vendor's purchase orders.
+METRIC_COUNTER_FIELDS = (
+    "total_pos",
+    "completed_pos",
+    "on_time_pos",
+    "quality_rating_sum",
+    "quality_rating_count",
+    "response_time_sum",
+    "response_time_count",
+)
+METRIC_RATE_FIELDS = (
+    "on_time_delivery_rate",
+    "quality_rating_avg",
+    "average_response_time",
+    "fulfillment_rate",
+    "performance_score",
+)
+METRIC_FIELDS = METRIC_COUNTER_FIELDS + METRIC_RATE_FIELDS
+
+
+class TimestampedQuerySet(models.QuerySet):
+    # QuerySet.update() skips auto_now fields, bump updated_at here as well so
+    # it changes on every write of the row.
+    def update(self, **kwargs):
+        kwargs.setdefault("updated_at", now())
+        return super().update(**kwargs)
+
 
 class Vendor(models.Model):
     name = models.CharField(max_length=100)
@@ -31,6 +64,43 @@ class Vendor(models.Model):
     fulfillment_rate = models.FloatField(
         default=0.0, validators=[MinValueValidator(0.0), MaxValueValidator(100.0)]
     )
+    total_pos = models.PositiveIntegerField(default=0)
+    completed_pos = models.PositiveIntegerField(default=0)
+    on_time_pos = models.PositiveIntegerField(default=0)
+    quality_rating_sum = models.FloatField(default=0.0)
+    quality_rating_count = models.PositiveIntegerField(default=0)
+    response_time_sum = models.FloatField(default=0.0)
+    response_time_count = models.PositiveIntegerField(default=0)
+    # Weighted composite of the rates (VENDOR_SCORE_WEIGHTS), from 0 to 100.
+    performance_score = models.FloatField(
+        default=0.0, validators=[MinValueValidator(0.0), MaxValueValidator(100.0)]
+    )
+    # Version marker of the row for conditional GETs.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TimestampedQuerySet.as_manager()
+
+    class Meta:
+        # Sort orders of the vendor ranking endpoint, best vendors first.
+        indexes = [
+            models.Index(
+                fields=["-performance_score", "id"], name="vendor_score_rank_idx"
+            ),
+            models.Index(
+                fields=["-on_time_delivery_rate", "id"], name="vendor_on_time_rank_idx"
+            ),
+            models.Index(
+                fields=["-quality_rating_avg", "id"], name="vendor_quality_rank_idx"
+            ),
+            models.Index(
+                fields=["-fulfillment_rate", "id"], name="vendor_fulfillment_rank_idx"
+            ),
+            models.Index(
+                fields=["average_response_time", "id"],
+                condition=models.Q(response_time_count__gt=0),
+                name="vendor_response_rank_idx",
+            ),
+        ]
 
     def clean(self):
         super().clean()
@@ -45,55 +115,111 @@ class Vendor(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()  # This will call the clean method
+        # The metric columns of an existing row are only written by the locked
+        # counter updates and the rebuilds, never from a possibly stale instance.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in METRIC_FIELDS
+            ]
         return super().save(*args, **kwargs)
 
+    def refresh_metrics_from_counters(self):
+        # Derive the rate fields from the running counters in O(1).
+        from .metrics import VendorMetrics
+
+        metrics = VendorMetrics(
+            self.pk, **{field: getattr(self, field) for field in METRIC_COUNTER_FIELDS}
+        )
+        for field in METRIC_RATE_FIELDS:
+            setattr(self, field, getattr(metrics, field))
+
+    def metric_values(self):
+        return {field: getattr(self, field) for field in METRIC_FIELDS}
+
+    def save_metrics(self, previous):
+        # Fast path for metric updates: no model validation, only the metric
+        # columns that differ from ``previous`` are written, if any.
+        changed = {
+            field: value
+            for field, value in self.metric_values().items()
+            if previous.get(field) != value
+        }
+        if changed:
+            Vendor.objects.filter(pk=self.pk).update(**changed)
+        return changed
+
+    def apply_metric_delta(self, delta):
+        for field, value in delta.items():
+            setattr(self, field, getattr(self, field) + value)
+        self.refresh_metrics_from_counters()
+
+    def compute_metrics(self):
+        from .metrics import compute_vendor_metrics
+
+        return compute_vendor_metrics(self)
+
+    def rebuild_metric_counters(self):
+        # Recompute the counters from scratch with a single aggregate query.
+        self.compute_metrics().apply_to(self)
+
     def calculate_on_time_delivery_rate(self):
-        completed_pos = self.purchaseorder_set.filter(status="completed")
-        total_completed_pos = completed_pos.count()
-        if total_completed_pos == 0:
-            return 0.0
-        grace_period_days = 7
-        on_time_deliveries = completed_pos.filter(
-            delivery_date__lte=models.F("issue_date")
-            + timedelta(days=grace_period_days)
-        ).count()
-        return (on_time_deliveries / total_completed_pos) * 100
+        return self.compute_metrics().on_time_delivery_rate
 
     def calculate_quality_rating_average(self):
-        completed_pos = self.purchaseorder_set.filter(status="completed").exclude(
-            quality_rating__isnull=True
-        )
-        if completed_pos.exists():
-            return (
-                completed_pos.aggregate(avg_quality_rating=Avg("quality_rating"))[
-                    "avg_quality_rating"
-                ]
-                or 0.0
-            )
-        return 0.0
+        return self.compute_metrics().quality_rating_avg
 
     def calculate_average_response_time(self):
-        completed_pos = self.purchaseorder_set.filter(status="completed").exclude(
-            acknowledgment_date__isnull=True
-        )
-        if completed_pos.exists():
-            response_times = [
-                (po.acknowledgment_date - po.issue_date).days for po in completed_pos
-            ]
-            return sum(response_times) / len(response_times)
-        return 0.0
+        return self.compute_metrics().average_response_time
 
     def calculate_fulfillment_rate(self):
-        total_pos = self.purchaseorder_set.count()
-        if total_pos == 0:
-            return 0.0
-        fulfilled_pos = self.purchaseorder_set.filter(status="completed")
-        return (fulfilled_pos.count() / total_pos) * 100
+        return self.compute_metrics().fulfillment_rate
 
     def __str__(self):
         return self.name
 
 
+# Longest SKU kept in the line item index, longer ones are not indexed.
+SKU_MAX_LENGTH = 100
+
+
+# SKU lines of a PurchaseOrder.items value: one object or a list of objects,
+# each with a "sku" and an optional integer "quantity", as (sku, quantity)
+# pairs. Entries without a usable SKU are skipped.
+def parse_line_items(items):
+    if isinstance(items, dict):
+        items = [items]
+    if not isinstance(items, list):
+        return []
+    lines = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        sku = item.get("sku")
+        if isinstance(sku, bool) or not isinstance(sku, (str, int)):
+            continue
+        sku = str(sku).strip()
+        if not sku or len(sku) > SKU_MAX_LENGTH:
+            continue
+        quantity = item.get("quantity")
+        if isinstance(quantity, bool) or not isinstance(quantity, int):
+            quantity = None
+        lines.append((sku, quantity))
+    return lines
+
+
+# PurchaseOrder columns that feed the vendor metric counters.
+METRIC_STATE_FIELDS = {
+    "vendor_id",
+    "status",
+    "delivery_date",
+    "issue_date",
+    "quality_rating",
+    "acknowledgment_date",
+}
+
+
 class PurchaseOrder(models.Model):
     STATUS_CHOICES = [
         ("pending", "Pending"),
@@ -113,6 +239,38 @@ class PurchaseOrder(models.Model):
     )
     issue_date = models.DateTimeField(auto_now_add=True)
     acknowledgment_date = models.DateTimeField(blank=True, null=True)
+    # Version marker of the row for conditional GETs.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TimestampedQuerySet.as_manager()
+
+    class Meta:
+        # Keyset pagination order of the purchase order list endpoints.
+        indexes = [
+            models.Index(fields=["issue_date", "id"], name="po_issue_date_id_idx"),
+            models.Index(
+                fields=["vendor", "issue_date", "id"],
+                name="po_vendor_issue_date_id_idx",
+            ),
+            # Per-vendor metric predicates.
+            models.Index(fields=["vendor", "status"], name="po_vendor_status_idx"),
+            models.Index(
+                fields=["vendor", "quality_rating"],
+                condition=models.Q(status="completed", quality_rating__isnull=False),
+                name="po_vendor_completed_rated_idx",
+            ),
+            models.Index(
+                fields=["vendor", "acknowledgment_date", "issue_date"],
+                condition=models.Q(
+                    status="completed", acknowledgment_date__isnull=False
+                ),
+                name="po_vendor_completed_acked_idx",
+            ),
+            # Version of a vendor's purchase order list, MAX(updated_at).
+            models.Index(
+                fields=["vendor", "updated_at"], name="po_vendor_updated_at_idx"
+            ),
+        ]
 
     def clean(self):
         if self.order_date > self.delivery_date:
@@ -120,30 +278,224 @@ class PurchaseOrder(models.Model):
                 {"delivery_date": "Delivery date must be after order date."}
             )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Partially loaded rows have no snapshot and fall back to a full rebuild.
+        if METRIC_STATE_FIELDS.issubset(field_names):
+            instance._metric_snapshot = instance.metric_state()
+        if "items" in field_names and "vendor_id" in field_names:
+            instance._line_item_snapshot = instance.line_item_state()
+        return instance
+
+    def _metric_datetime(self, field_name):
+        value = self._meta.get_field(field_name).to_python(getattr(self, field_name))
+        if value is not None and is_naive(value):
+            value = make_aware(value)
+        return value
+
+    def metric_state(self):
+        return (
+            self.vendor_id,
+            self.status,
+            self._metric_datetime("delivery_date"),
+            self._metric_datetime("issue_date"),
+            self.quality_rating,
+            self._metric_datetime("acknowledgment_date"),
+        )
+
+    def line_item_state(self):
+        # What the indexed line items of the purchase order are derived from.
+        return (self.vendor_id, parse_line_items(self.items))
+
+    def metric_contribution(self, state=None):
+        # Counter values this purchase order adds to its vendor.
+        _, status, delivery_date, issue_date, quality_rating, acknowledgment_date = (
+            state or self.metric_state()
+        )
+        contribution = dict.fromkeys(METRIC_COUNTER_FIELDS, 0)
+        contribution["total_pos"] = 1
+        if status != "completed":
+            return contribution
+        contribution["completed_pos"] = 1
+        if delivery_date <= issue_date + ON_TIME_GRACE_PERIOD:
+            contribution["on_time_pos"] = 1
+        if quality_rating is not None:
+            contribution["quality_rating_sum"] = quality_rating
+            contribution["quality_rating_count"] = 1
+        if acknowledgment_date is not None:
+            contribution["response_time_sum"] = (
+                acknowledgment_date - issue_date
+            ) / timedelta(days=1)
+            contribution["response_time_count"] = 1
+        return contribution
+
+    @staticmethod
+    def generate_po_numbers(count):
+        date_prefix = now().strftime("%y%m%d")
+        return [f"{date_prefix}-{uuid.uuid4().hex[:10]}" for _ in range(count)]
+
     def save(self, *args, **kwargs):
         if not self.po_number:
-            unique_identifier = uuid.uuid4().hex[:10]
-            date_prefix = now().strftime("%y%m%d")
-            self.po_number = f"{date_prefix}-{unique_identifier}"
-        super().save(*args, **kwargs)
+            self.po_number = self.generate_po_numbers(1)[0]
+        # Keep the vendor counter update in the same transaction as the write,
+        # without a savepoint inside the caller's transaction.
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+        self._metric_snapshot = self.metric_state()
+        self._line_item_snapshot = self.line_item_state()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            return super().delete(*args, **kwargs)
 
     def __str__(self):
         return self.po_number
 
 
+# One row per SKU line of PurchaseOrder.items, kept in sync with the purchase
+# order writes, so that SKU lookups and per SKU totals are answered from the
+# (sku, vendor) index instead of decoding every purchase order. The purchase
+# order reference has no database constraint, which keeps the purchase order
+# table free to be partitioned (partition_purchase_orders).
+class PurchaseOrderLineItem(models.Model):
+    purchase_order = models.ForeignKey(
+        PurchaseOrder,
+        on_delete=models.CASCADE,
+        related_name="line_items",
+        db_constraint=False,
+    )
+    vendor = models.ForeignKey(
+        Vendor, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    sku = models.CharField(max_length=SKU_MAX_LENGTH)
+    quantity = models.IntegerField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["sku", "vendor"], name="po_line_item_sku_vendor_idx"),
+            models.Index(fields=["vendor", "sku"], name="po_line_item_vendor_sku_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.purchase_order_id} - {self.sku}"
+
+
+def metrics_deferred():
+    # In deferred mode the signals only queue vendors for recomputation.
+    return getattr(settings, "VENDOR_METRICS_DEFERRED", False)
+
+
+def archive_enabled():
+    # Archived purchase orders are only written to and read from segment files
+    # with an archive directory. The vendor metrics always add their rollups.
+    return bool(getattr(settings, "PURCHASE_ORDER_ARCHIVE_DIR", None))
+
+
+def _locked_vendor_metrics(vendor_id):
+    return (
+        Vendor.objects.select_for_update()
+        .only("pk", *METRIC_FIELDS)
+        .filter(pk=vendor_id)
+        .first()
+    )
+
+
+def _apply_vendor_metric_delta(vendor_id, delta):
+    if not any(delta.values()):
+        return
+    vendor = _locked_vendor_metrics(vendor_id)
+    if vendor is None:
+        # The vendor was deleted concurrently.
+        return
+    previous = vendor.metric_values()
+    vendor.apply_metric_delta(delta)
+    vendor.save_metrics(previous)
+
+
+def _rebuild_vendor_metrics(vendor_id):
+    vendor = _locked_vendor_metrics(vendor_id)
+    if vendor is None:
+        return
+    previous = vendor.metric_values()
+    vendor.rebuild_metric_counters()
+    vendor.save_metrics(previous)
+
+
+@receiver(post_save, sender=PurchaseOrder)
+def update_vendor_metrics(sender, instance, created, raw=False, **kwargs):
+    if raw or not instance.vendor_id:
+        return
+    snapshot = getattr(instance, "_metric_snapshot", None)
+    if metrics_deferred():
+        from .deferred import mark_vendors_dirty
+
+        mark_vendors_dirty({instance.vendor_id, snapshot[0] if snapshot else None})
+        return
+    if not created and snapshot is None:
+        # Previous state unknown (instance not loaded from the database).
+        logger.info(f"Rebuilding metric counters for vendor {instance.vendor_id}")
+        _rebuild_vendor_metrics(instance.vendor_id)
+        return
+    new = instance.metric_contribution()
+    if created:
+        _apply_vendor_metric_delta(instance.vendor_id, new)
+        return
+    old = instance.metric_contribution(snapshot)
+    old_vendor_id = snapshot[0]
+    if old_vendor_id != instance.vendor_id:
+        _apply_vendor_metric_delta(
+            old_vendor_id, {field: -value for field, value in old.items()}
+        )
+        _apply_vendor_metric_delta(instance.vendor_id, new)
+        return
+    _apply_vendor_metric_delta(
+        instance.vendor_id, {field: new[field] - old[field] for field in new}
+    )
+
+
+@receiver(post_delete, sender=PurchaseOrder)
+def remove_vendor_metrics(sender, instance, origin=None, **kwargs):
+    # Purchase orders deleted along with their vendor leave nothing to update.
+    if isinstance(origin, Vendor):
+        return
+    snapshot = getattr(instance, "_metric_snapshot", None) or instance.metric_state()
+    if not snapshot[0]:
+        return
+    if metrics_deferred():
+        from .deferred import mark_vendors_dirty
+
+        mark_vendors_dirty({snapshot[0]})
+        return
+    old = instance.metric_contribution(snapshot)
+    _apply_vendor_metric_delta(
+        snapshot[0], {field: -value for field, value in old.items()}
+    )
+
+
 @receiver(post_save, sender=PurchaseOrder)
-def update_vendor_metrics(sender, instance, **kwargs):
-    if instance.vendor_id:
-        vendor = instance.vendor
-        vendor.quality_rating_avg = vendor.calculate_quality_rating_average()
-        vendor.average_response_time = vendor.calculate_average_response_time()
-        vendor.fulfillment_rate = vendor.calculate_fulfillment_rate()
-    if instance.status == "completed":
-        logger.info(f"Updating on-time delivery rate for vendor {instance.vendor.id}")
-        on_time_rate = vendor.calculate_on_time_delivery_rate()
-        logger.info(f"On-time delivery rate: {on_time_rate}")
-        vendor.on_time_delivery_rate = on_time_rate
-    vendor.save()
+def index_purchase_order_line_items(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    from .line_items import create_line_items, replace_line_items
+
+    if created:
+        create_line_items([instance])
+    elif getattr(instance, "_line_item_snapshot", None) != instance.line_item_state():
+        replace_line_items([instance])
+
+
+@receiver(post_save, sender=PurchaseOrder)
+@receiver(post_delete, sender=PurchaseOrder)
+def invalidate_purchase_order_vendor_performance(sender, instance, **kwargs):
+    snapshot = getattr(instance, "_metric_snapshot", None)
+    performance_cache.invalidate(instance.vendor_id, snapshot[0] if snapshot else None)
+
+
+@receiver(post_save, sender=Vendor)
+@receiver(post_delete, sender=Vendor)
+def invalidate_vendor_performance(sender, instance, **kwargs):
+    performance_cache.invalidate(instance.pk)
 
 
 class HistoricalPerfomance(models.Model):
@@ -154,5 +506,106 @@ class HistoricalPerfomance(models.Model):
     average_response_time = models.FloatField()
     fulfillment_rate = models.FloatField()
 
+    class Meta:
+        # One snapshot per vendor and period, also serving (vendor, date) ranges.
+        constraints = [
+            models.UniqueConstraint(
+                fields=["vendor", "date"], name="unique_vendor_performance_date"
+            )
+        ]
+
     def __str__(self):
         return f"{self.vendor.name} - {self.date}"
+
+
+class VendorMetricsQueue(models.Model):
+    vendor = models.OneToOneField(
+        Vendor, on_delete=models.CASCADE, related_name="metrics_queue_entry"
+    )
+    queued_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.vendor_id} - {self.queued_at}"
+
+
+# Metric counters of a vendor's archived purchase orders (archive.py), added
+# to the counters aggregated from the live rows so the KPIs stay exact.
+class ArchivedPurchaseOrderRollup(models.Model):
+    vendor = models.OneToOneField(
+        Vendor,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="archive_rollup",
+    )
+    total_pos = models.PositiveIntegerField(default=0)
+    completed_pos = models.PositiveIntegerField(default=0)
+    on_time_pos = models.PositiveIntegerField(default=0)
+    quality_rating_sum = models.FloatField(default=0.0)
+    quality_rating_count = models.PositiveIntegerField(default=0)
+    response_time_sum = models.FloatField(default=0.0)
+    response_time_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.vendor_id} - {self.total_pos}"
+
+
+# An append-only segment file of archived purchase orders. Only the segments
+# committed here are read, files left by a failed archival run are not.
+class PurchaseOrderArchiveSegment(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    row_count = models.PositiveIntegerField()
+    size_bytes = models.PositiveBigIntegerField()
+    first_issue_date = models.DateTimeField()
+    last_issue_date = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class ScheduledJob(models.Model):
+    # A periodic job of the run_scheduler command, triggered every
+    # ``interval_seconds`` or by a five field ``cron`` expression (TIME_ZONE).
+    # A scheduler node owns a run while ``locked_until`` is in the future.
+    # ``managed`` jobs come from SCHEDULER_JOBS and are disabled once removed
+    # from it, jobs added in the admin are left alone.
+    STATUS_CHOICES = [
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    ]
+
+    name = models.CharField(max_length=100, unique=True)
+    task = models.CharField(max_length=255)
+    interval_seconds = models.PositiveIntegerField(null=True, blank=True)
+    cron = models.CharField(max_length=100, blank=True)
+    enabled = models.BooleanField(default=True)
+    managed = models.BooleanField(default=False)
+    next_run_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_started_at = models.DateTimeField(null=True, blank=True)
+    last_finished_at = models.DateTimeField(null=True, blank=True)
+    last_status = models.CharField(max_length=10, choices=STATUS_CHOICES, blank=True)
+    last_result = models.TextField(blank=True)
+    last_error = models.TextField(blank=True)
+    run_count = models.PositiveIntegerField(default=0)
+    failure_count = models.PositiveIntegerField(default=0)
+    last_runtime = models.FloatField(null=True, blank=True)
+    total_runtime = models.FloatField(default=0.0)
+    max_runtime = models.FloatField(default=0.0)
+
+    @property
+    def average_runtime(self):
+        return self.total_runtime / self.run_count if self.run_count else None
+
+    def clean(self):
+        from .scheduler import get_trigger
+
+        try:
+            get_trigger(self)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+    def __str__(self):
+        return self.name
+
@@ -0,0 +1,106 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    # Keyset (seek) pagination over the view's ``keyset_ordering`` fields, all
+    # ascending. The response body stays a plain list, the next page is linked
+    # with an opaque cursor in the ``Link`` header, so deep pages cost the same
+    # indexed range scan as the first one.
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return settings.API_PAGE_SIZE
+        return max(1, min(page_size, settings.API_MAX_PAGE_SIZE))
+
+    def encode_cursor(self, values):
+        raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, queryset, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            opts = queryset.model._meta
+            return [
+                opts.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def seek_filter(self, values):
+        # (a > x) OR (a = x AND b > y) OR ... for the ordering fields.
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            term = Q(**{f"{field}__gt": values[index]})
+            for previous, value in zip(self.ordering[:index], values):
+                term &= Q(**{previous: value})
+            condition |= term
+        return condition
+
+    def page_queryset(self, queryset, request, view=None):
+        # The sliced queryset of the requested page plus one row, whose
+        # presence tells whether there is a next page.
+        self.request = request
+        self.ordering = tuple(getattr(view, "keyset_ordering", ("id",)))
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(
+                self.seek_filter(self.decode_cursor(queryset, cursor))
+            )
+        return queryset[: self.page_size + 1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.trim_page(list(self.page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        page = [obj async for obj in self.page_queryset(queryset, request, view)]
+        return self.trim_page(page)
+
+    def trim_page(self, page):
+        page_size = self.page_size
+        self.next_cursor = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            last = page[-1]
+            if isinstance(last, dict):
+                values = [last[field] for field in self.ordering]
+            else:
+                values = [getattr(last, field) for field in self.ordering]
+            self.next_cursor = self.encode_cursor(values)
+        return page
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.next_cursor,
+        )
+
+    def get_paginated_headers(self):
+        next_link = self.get_next_link()
+        if next_link:
+            return {"Link": f'<{next_link}>; rel="next"'}
+        return {}
+
+    def get_paginated_response(self, data):
+        return Response(data, headers=self.get_paginated_headers())
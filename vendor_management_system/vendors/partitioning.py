@@ -0,0 +1,153 @@
+import re
+from dataclasses import dataclass, field
+
+from .models import PurchaseOrder
+
+# PostgreSQL declarative partitioning of the purchase order table by hash of
+# vendor_id. Queries filtered on one vendor are pruned to a single partition,
+# and with enable_partitionwise_aggregate the grouped metric aggregates run per
+# partition, in parallel workers when the planner chooses to.
+PARTITION_KEY = "vendor_id"
+
+_KEY_CONSTRAINT = re.compile(r"^(PRIMARY KEY|UNIQUE) \(([^)]*)\)(.*)$")
+
+# Printed when partitioning: the database no longer enforces a unique
+# po_number across vendors.
+UNIQUENESS_WARNING = (
+    "Unique constraints now include vendor_id: po_number is only enforced "
+    "unique per vendor by the database (the application still generates unique "
+    "numbers)."
+)
+
+
+def quote(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+@dataclass
+class TableLayout:
+    # What rebuilding the table has to carry over, read from the catalog.
+    partitions: list = field(default_factory=list)
+    # (name, contype, definition) of the primary key, unique and foreign keys
+    constraints: list = field(default_factory=list)
+    # (name, CREATE INDEX statement) of the indexes not backing a constraint
+    indexes: list = field(default_factory=list)
+    # "table.constraint" of the foreign keys pointing at the table
+    referenced_by: list = field(default_factory=list)
+
+
+def read_layout(cursor, table):
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = %s::regclass ORDER BY c.relname",
+        [table],
+    )
+    partitions = [name for (name,) in cursor.fetchall()]
+    cursor.execute(
+        "SELECT conname, contype, pg_get_constraintdef(oid), conindid::regclass::text "
+        "FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f') "
+        "ORDER BY contype DESC, conname",
+        [table],
+    )
+    constraints, constraint_indexes = [], set()
+    for name, kind, definition, index in cursor.fetchall():
+        constraints.append((name, kind, definition))
+        constraint_indexes.add(index)
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = %s ORDER BY indexname",
+        [table],
+    )
+    indexes = [
+        (name, definition)
+        for name, definition in cursor.fetchall()
+        if name not in constraint_indexes
+    ]
+    cursor.execute(
+        "SELECT conrelid::regclass::text || '.' || conname FROM pg_constraint "
+        "WHERE confrelid = %s::regclass AND contype = 'f' AND conparentid = 0",
+        [table],
+    )
+    referenced_by = [name for (name,) in cursor.fetchall()]
+    return TableLayout(partitions, constraints, indexes, referenced_by)
+
+
+# Primary key or unique constraint definition with the partition key appended
+# (PostgreSQL requires it in every unique constraint of a partitioned table),
+# or removed again for a plain table.
+def with_partition_key(definition, partitioned):
+    match = _KEY_CONSTRAINT.match(definition)
+    if match is None:
+        return definition
+    kind, columns, rest = match.groups()
+    columns = [column.strip() for column in columns.split(",")]
+    columns = [column for column in columns if column != PARTITION_KEY]
+    if partitioned:
+        columns.append(PARTITION_KEY)
+    return f"{kind} ({', '.join(columns)}){rest}"
+
+
+# Statements rebuilding ``table`` as a table hash partitioned on vendor_id into
+# ``partitions`` partitions, or as a plain table when ``partitions`` is 0. The
+# rows are copied, then constraints and indexes are recreated from ``layout``,
+# so they are built once over the loaded data.
+def layout_statements(table, layout, partitions, pk_column="id"):
+    previous = f"{table}_previous"
+    statements = [
+        f"LOCK TABLE {quote(table)} IN ACCESS EXCLUSIVE MODE",
+        f"ALTER TABLE {quote(table)} RENAME TO {quote(previous)}",
+    ]
+    for partition in layout.partitions:
+        statements.append(
+            f"ALTER TABLE {quote(partition)} RENAME TO {quote(partition + '_previous')}"
+        )
+    create = (
+        f"CREATE TABLE {quote(table)} (LIKE {quote(previous)} INCLUDING DEFAULTS "
+        "INCLUDING CONSTRAINTS INCLUDING IDENTITY INCLUDING GENERATED)"
+    )
+    if partitions:
+        create += f" PARTITION BY HASH ({quote(PARTITION_KEY)})"
+    statements.append(create)
+    for remainder in range(partitions):
+        statements.append(
+            f"CREATE TABLE {quote(f'{table}_p{remainder}')} PARTITION OF "
+            f"{quote(table)} FOR VALUES WITH (MODULUS {partitions}, "
+            f"REMAINDER {remainder})"
+        )
+    statements += [
+        f"INSERT INTO {quote(table)} SELECT * FROM {quote(previous)}",
+        f"DROP TABLE {quote(previous)}",
+    ]
+    for name, kind, definition in layout.constraints:
+        if kind in ("p", "u"):
+            definition = with_partition_key(definition, bool(partitions))
+        statements.append(
+            f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}"
+        )
+    for _, definition in layout.indexes:
+        # An index created ON ONLY a partitioned table is not built on its
+        # partitions and stays invalid.
+        if partitions:
+            definition = definition.replace(" ON ONLY ", " ON ", 1)
+        statements.append(definition)
+    statements += [
+        f"SELECT setval(pg_get_serial_sequence('{quote(table)}', '{pk_column}'), "
+        f"COALESCE(MAX({quote(pk_column)}), 0) + 1, false) FROM {quote(table)}",
+        f"ANALYZE {quote(table)}",
+    ]
+    return statements
+
+
+def purchase_order_table():
+    return PurchaseOrder._meta.db_table, PurchaseOrder._meta.pk.column
+
+
+# Rows per partition of the purchase order table, by partition name.
+def partition_row_counts(cursor):
+    table, _ = purchase_order_table()
+    cursor.execute(
+        f"SELECT tableoid::regclass::text, COUNT(*) FROM {quote(table)} "
+        "GROUP BY 1 ORDER BY 1"
+    )
+    return dict(cursor.fetchall())
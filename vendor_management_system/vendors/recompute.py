@@ -0,0 +1,84 @@
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import django
+from django.db import transaction
+
+from .cache import performance_cache
+from .metrics import VendorMetrics, compute_metrics_by_vendor
+from .models import Vendor, METRIC_FIELDS
+
+
+# Float noise between the incrementally maintained values and the grouped
+# aggregate does not count as a change.
+def metric_changed(stored, value):
+    return not math.isclose(stored, value, rel_tol=1e-9, abs_tol=1e-9)
+
+
+@dataclass
+class ChunkResult:
+    vendors: int
+    # vendor_id -> {field: (stored, recomputed)} of the vendors that changed
+    changes: dict
+
+
+# Recompute the metrics of a chunk of vendor ids: lock and read their stored
+# values, run one aggregate grouped by vendor over their purchase orders, and
+# write the vendors that changed with one bulk_update, unless ``dry_run``.
+def recompute_chunk(vendor_ids, dry_run=False):
+    with transaction.atomic():
+        vendors = Vendor.objects.filter(pk__in=vendor_ids)
+        locked = vendors if dry_run else vendors.select_for_update()
+        stored = {row["pk"]: row for row in locked.values("pk", *METRIC_FIELDS)}
+        by_vendor = compute_metrics_by_vendor(vendors)
+        changes = {}
+        updated = []
+        for vendor_id, previous in stored.items():
+            values = by_vendor.get(vendor_id, VendorMetrics(vendor_id)).values()
+            changed = {
+                field: (previous[field], values[field])
+                for field in METRIC_FIELDS
+                if metric_changed(previous[field], values[field])
+            }
+            if changed:
+                changes[vendor_id] = changed
+                updated.append(Vendor(pk=vendor_id, **values))
+        if updated and not dry_run:
+            Vendor.objects.bulk_update(updated, METRIC_FIELDS)
+            performance_cache.invalidate(*changes)
+    return ChunkResult(len(stored), changes)
+
+
+# Recompute and store the metrics of the given vendor ids as one chunk, after
+# dropping their cached performance payloads. Returns the number of vendors.
+def recompute_vendors(vendor_ids):
+    vendor_ids = set(vendor_ids)
+    performance_cache.invalidate(*vendor_ids)
+    recompute_chunk(vendor_ids)
+    return len(vendor_ids)
+
+
+# Yield the ChunkResult of each chunk of ``vendor_ids`` as it completes. With
+# one worker the chunks run here on this process' connection. Otherwise they
+# are spread over worker processes, each set up as a fresh Django process
+# holding its own connection, so the database must be reachable from other
+# processes (not an in-memory or uncommitted test database).
+def recompute_vendor_chunks(vendor_ids, workers=1, chunk_size=500, dry_run=False):
+    chunks = [
+        vendor_ids[start : start + chunk_size]
+        for start in range(0, len(vendor_ids), chunk_size)
+    ]
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield recompute_chunk(chunk, dry_run)
+        return
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=django.setup,
+    ) as executor:
+        futures = [executor.submit(recompute_chunk, chunk, dry_run) for chunk in chunks]
+        for future in as_completed(futures):
+            yield future.result()
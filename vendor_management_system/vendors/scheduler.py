@@ -0,0 +1,291 @@
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, time as day_time, timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import ScheduledJob
+
+logger = logging.getLogger(__name__)
+
+# Bounds of the five cron fields: minute, hour, day of month, month and day of
+# week (0 or 7 is Sunday).
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+RESULT_MAX_LENGTH = 1000
+
+
+# Values of one cron field: "*", "5", "1-5", "*/15", "1-31/2" or "5/15", comma
+# separated.
+def _parse_cron_field(field, low, high):
+    values = set()
+    for part in field.split(","):
+        bounds, _, step = part.partition("/")
+        if bounds == "*":
+            start, end = low, high
+        elif "-" in bounds:
+            start, end = (int(bound) for bound in bounds.split("-", 1))
+        else:
+            start = int(bounds)
+            end = high if step else start
+        step = int(step) if step else 1
+        if not low <= start <= end <= high or step < 1:
+            raise ValueError(part)
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronTrigger:
+    minutes: frozenset
+    hours: frozenset
+    days: frozenset
+    months: frozenset
+    weekdays: frozenset
+    any_day: bool
+    any_weekday: bool
+
+    @classmethod
+    def parse(cls, expression):
+        fields = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"Cron expression {expression!r} must have 5 fields.")
+        try:
+            minutes, hours, days, months, weekdays = (
+                _parse_cron_field(field, low, high)
+                for field, (low, high) in zip(fields, CRON_FIELDS)
+            )
+        except ValueError:
+            raise ValueError(f"Invalid cron expression {expression!r}.") from None
+        return cls(
+            minutes=minutes,
+            hours=hours,
+            days=days,
+            months=months,
+            weekdays=frozenset(weekday % 7 for weekday in weekdays),
+            any_day=fields[2] == "*",
+            any_weekday=fields[4] == "*",
+        )
+
+    def matches_day(self, day):
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        # As in cron, when both day fields are restricted either one matches.
+        if self.any_day:
+            return in_weekdays
+        if self.any_weekday:
+            return in_days
+        return in_days or in_weekdays
+
+    def next_after(self, moment):
+        # First matching minute strictly after ``moment``, in local time. Eight
+        # years cover every day of month and weekday combination (February 29).
+        local = timezone.localtime(moment)
+        current = local.hour * 60 + local.minute
+        times = sorted(
+            hour * 60 + minute for hour in self.hours for minute in self.minutes
+        )
+        for offset in range(366 * 8):
+            day = local.date() + timedelta(days=offset)
+            if not self.matches_day(day):
+                continue
+            for start in times:
+                if offset or start > current:
+                    return timezone.make_aware(
+                        datetime.combine(day, day_time(start // 60, start % 60))
+                    )
+        raise ValueError("The cron expression never fires.")
+
+
+@dataclass(frozen=True)
+class IntervalTrigger:
+    seconds: int
+
+    def next_after(self, moment):
+        return moment + timedelta(seconds=self.seconds)
+
+
+def get_trigger(job):
+    if bool(job.cron) == bool(job.interval_seconds):
+        raise ValueError(
+            f"Job {job.name!r} needs either an interval or a cron expression."
+        )
+    if job.cron:
+        return CronTrigger.parse(job.cron)
+    return IntervalTrigger(job.interval_seconds)
+
+
+def default_node():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# Create or update the jobs of SCHEDULER_JOBS (name -> task, and interval or
+# cron). Jobs whose definition changed are rescheduled, their stats are kept.
+# Jobs removed from SCHEDULER_JOBS are disabled, with their row and stats.
+def sync_jobs(definitions=None, now=None):
+    if definitions is None:
+        definitions = settings.SCHEDULER_JOBS
+    now = now or timezone.now()
+    existing = ScheduledJob.objects.in_bulk(list(definitions), field_name="name")
+    for name, definition in definitions.items():
+        fields = {
+            "task": definition["task"],
+            "interval_seconds": definition.get("interval"),
+            "cron": definition.get("cron", ""),
+        }
+        job = existing.get(name) or ScheduledJob(name=name)
+        unchanged = all(getattr(job, key) == value for key, value in fields.items())
+        if job.pk and unchanged:
+            if not job.managed:
+                ScheduledJob.objects.filter(pk=job.pk).update(managed=True)
+            continue
+        for key, value in fields.items():
+            setattr(job, key, value)
+        job.managed = True
+        job.next_run_at = get_trigger(job).next_after(now)
+        job.save()
+    ScheduledJob.objects.filter(managed=True, enabled=True).exclude(
+        name__in=list(definitions)
+    ).update(enabled=False)
+
+
+# Give the enabled jobs created without a next run (e.g. in the admin) one.
+def schedule_new_jobs(now):
+    for job in ScheduledJob.objects.filter(enabled=True, next_run_at__isnull=True):
+        ScheduledJob.objects.filter(pk=job.pk, next_run_at__isnull=True).update(
+            next_run_at=get_trigger(job).next_after(now)
+        )
+
+
+# Take the next run of ``job`` for ``node`` with a compare-and-swap on its
+# lock and next run, so that of several nodes polling the job table only one
+# wins. The lock expires after SCHEDULER_LOCK_TIMEOUT seconds in case the node
+# dies mid run. ``force`` takes an unlocked job even if it is not due, without
+# moving its next run.
+def claim_job(job, node, now=None, force=False):
+    now = now or timezone.now()
+    claimable = ScheduledJob.objects.filter(pk=job.pk).filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lte=now)
+    )
+    fields = {
+        "locked_by": node,
+        "locked_until": now + timedelta(seconds=settings.SCHEDULER_LOCK_TIMEOUT),
+        "last_started_at": now,
+    }
+    if not force:
+        claimable = claimable.filter(
+            enabled=True, next_run_at=job.next_run_at, next_run_at__lte=now
+        )
+        fields["next_run_at"] = get_trigger(job).next_after(now)
+    return bool(claimable.update(**fields))
+
+
+# Run the task of a claimed job, record its outcome and runtime, then release
+# the lock unless it expired and another node took the job over.
+def run_job(job, node):
+    started = time.monotonic()
+    result, error = None, ""
+    try:
+        result = import_string(job.task)()
+    except Exception:
+        logger.exception(f"Scheduled job {job.name} failed")
+        error = traceback.format_exc()
+    runtime = time.monotonic() - started
+    ScheduledJob.objects.filter(pk=job.pk).update(
+        last_finished_at=timezone.now(),
+        last_status="failed" if error else "succeeded",
+        last_result="" if result is None else str(result)[:RESULT_MAX_LENGTH],
+        last_error=error,
+        run_count=F("run_count") + 1,
+        failure_count=F("failure_count") + (1 if error else 0),
+        last_runtime=runtime,
+        total_runtime=F("total_runtime") + runtime,
+        max_runtime=Greatest(F("max_runtime"), Value(runtime)),
+    )
+    ScheduledJob.objects.filter(pk=job.pk, locked_by=node).update(
+        locked_by="", locked_until=None
+    )
+    return not error
+
+
+def _run_job_in_thread(job, node):
+    try:
+        return run_job(job, node)
+    except Exception:
+        # Errors recording the run would otherwise stay in the future.
+        logger.exception(f"Could not record the run of scheduled job {job.name}")
+    finally:
+        connection.close()
+
+
+class Scheduler:
+    # Polls the job table every ``poll_interval`` seconds and runs the jobs it
+    # claims in a pool of ``workers`` threads.
+    def __init__(self, node=None, workers=None, poll_interval=None):
+        self.node = node or default_node()
+        self.workers = workers or settings.SCHEDULER_WORKERS
+        self.poll_interval = poll_interval or settings.SCHEDULER_POLL_INTERVAL
+
+    def claim_due_jobs(self, now=None):
+        now = now or timezone.now()
+        schedule_new_jobs(now)
+        due = ScheduledJob.objects.filter(enabled=True, next_run_at__lte=now).filter(
+            Q(locked_until__isnull=True) | Q(locked_until__lte=now)
+        )
+        return [
+            job
+            for job in due.order_by("next_run_at")
+            if claim_job(job, self.node, now)
+        ]
+
+    # Claim the due jobs and run them in ``executor``, or one after the other
+    # in this thread. Returns the claimed jobs.
+    def run_pending(self, executor=None):
+        jobs = self.claim_due_jobs()
+        for job in jobs:
+            if executor is None:
+                run_job(job, self.node)
+            else:
+                executor.submit(_run_job_in_thread, job, self.node)
+        return jobs
+
+    def run_now(self, job):
+        if not claim_job(job, self.node, force=True):
+            return None
+        return run_job(job, self.node)
+
+    def run(self, stop_event=None):
+        stop_event = stop_event or threading.Event()
+        # Leaving the pool waits for the running jobs.
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="scheduler"
+        ) as executor:
+            while not stop_event.is_set():
+                started = time.monotonic()
+                # Drop a broken connection or one past CONN_MAX_AGE, as Django
+                # does between requests.
+                close_old_connections()
+                try:
+                    jobs = self.run_pending(executor)
+                except DatabaseError:
+                    # Poll again at the next interval, e.g. once the database
+                    # is back.
+                    logger.exception("Could not poll the scheduled jobs")
+                    jobs = []
+                for job in jobs:
+                    logger.info(f"Started scheduled job {job.name} on {self.node}")
+                stop_event.wait(
+                    max(0.0, self.poll_interval - (time.monotonic() - started))
+                )
@@ -1,5 +1,10 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Vendor, PurchaseOrder
+from .instrumentation import TimedRepresentationMixin
+from .models import Vendor, PurchaseOrder, METRIC_FIELDS
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 
@@ -11,14 +16,194 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         return token
 
 
-class VendorSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    # Keeps only the fields listed in the ``fields`` context entry, if any.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.context.get("fields")
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+
+class VendorSerializer(
+    TimedRepresentationMixin, SparseFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Vendor
         fields = "__all__"
+        # Maintained from the purchase orders, never written by clients.
+        read_only_fields = METRIC_FIELDS
 
 
-class PurchaseOrderSerializer(serializers.ModelSerializer):
+class PurchaseOrderSerializer(
+    TimedRepresentationMixin, SparseFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = PurchaseOrder
         fields = "__all__"
         extra_kwargs = {"po_number": {"read_only": True}}
+
+
+class PerformanceHistorySerializer(TimedRepresentationMixin, serializers.Serializer):
+    date = serializers.DateTimeField(source="bucket")
+    on_time_delivery_rate = serializers.FloatField()
+    quality_rating_avg = serializers.FloatField()
+    average_response_time = serializers.FloatField()
+    fulfillment_rate = serializers.FloatField()
+
+
+class PrefetchedVendorField(serializers.PrimaryKeyRelatedField):
+    # Resolves vendors from the ``vendors`` map in the serializer context so a
+    # bulk request does not look up its vendors one row at a time.
+    def to_internal_value(self, data):
+        vendors = self.context.get("vendors")
+        if vendors is None:
+            return super().to_internal_value(data)
+        try:
+            vendor = vendors.get(int(data))
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if vendor is None:
+            self.fail("does_not_exist", pk_value=data)
+        return vendor
+
+
+class PurchaseOrderBulkListSerializer(serializers.ListSerializer):
+    # Validates every row and keeps the valid ones, the invalid ones are
+    # reported in ``row_errors`` instead of failing the whole batch.
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError(
+                {"non_field_errors": ["Expected a list of purchase orders."]}
+            )
+        max_rows = settings.PURCHASE_ORDER_BULK_MAX_ROWS
+        if len(data) > max_rows:
+            raise serializers.ValidationError(
+                {"non_field_errors": [f"Ensure there are no more than {max_rows} rows."]}
+            )
+        self.row_errors = []
+        valid = []
+        for index, item in enumerate(data):
+            try:
+                valid.append(self.run_child_validation(item))
+            except serializers.ValidationError as exc:
+                self.row_errors.append({"index": index, "errors": exc.detail})
+        return valid
+
+    def create(self, validated_data):
+        from .deferred import refresh_vendor_metrics
+        from .line_items import create_line_items
+
+        batch_size = self.context.get(
+            "batch_size", settings.PURCHASE_ORDER_BULK_BATCH_SIZE
+        )
+        po_numbers = PurchaseOrder.generate_po_numbers(len(validated_data))
+        purchase_orders = [
+            PurchaseOrder(po_number=po_number, **attrs)
+            for po_number, attrs in zip(po_numbers, validated_data)
+        ]
+        with transaction.atomic():
+            created = PurchaseOrder.objects.bulk_create(
+                purchase_orders, batch_size=batch_size
+            )
+            # bulk_create skips the post_save signal, index the line items and
+            # refresh each vendor once.
+            create_line_items(created, batch_size=batch_size)
+            refresh_vendor_metrics({po.vendor_id for po in created})
+        return created
+
+
+class PurchaseOrderBulkSerializer(PurchaseOrderSerializer):
+    vendor = PrefetchedVendorField(queryset=Vendor.objects.all())
+
+    class Meta(PurchaseOrderSerializer.Meta):
+        list_serializer_class = PurchaseOrderBulkListSerializer
+
+
+class PurchaseOrderBulkTransitionSerializer(serializers.Serializer):
+    # Applies a status transition to the purchase orders selected by ``ids``
+    # and ``po_numbers`` with one UPDATE, then refreshes each affected vendor
+    # once. Subclasses set ``pending``, the condition of the rows the
+    # transition still applies to, and the values it writes.
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, default=list
+    )
+    po_numbers = serializers.ListField(
+        child=serializers.CharField(max_length=50), required=False, default=list
+    )
+    pending = None
+
+    def validate(self, attrs):
+        if not attrs["ids"] and not attrs["po_numbers"]:
+            raise serializers.ValidationError(
+                {"non_field_errors": ["Provide ids or po_numbers."]}
+            )
+        max_rows = settings.PURCHASE_ORDER_BULK_MAX_ROWS
+        if len(attrs["ids"]) + len(attrs["po_numbers"]) > max_rows:
+            raise serializers.ValidationError(
+                {"non_field_errors": [f"Ensure there are no more than {max_rows} rows."]}
+            )
+        return attrs
+
+    def get_values(self, validated_data):
+        raise NotImplementedError
+
+    def create(self, validated_data):
+        from .deferred import refresh_vendor_metrics
+
+        ids = validated_data["ids"]
+        po_numbers = validated_data["po_numbers"]
+        with transaction.atomic():
+            rows = list(
+                PurchaseOrder.objects.select_for_update()
+                .filter(Q(pk__in=ids) | Q(po_number__in=po_numbers))
+                .annotate(
+                    is_pending=ExpressionWrapper(
+                        self.pending, output_field=BooleanField()
+                    )
+                )
+                .values_list("pk", "po_number", "vendor_id", "is_pending")
+            )
+            found_ids = {row[0] for row in rows}
+            found_po_numbers = {row[1] for row in rows}
+            pending = [row for row in rows if row[3]]
+            updated = 0
+            if pending:
+                updated = (
+                    PurchaseOrder.objects.filter(pk__in=[row[0] for row in pending])
+                    .filter(self.pending)
+                    .update(**self.get_values(validated_data))
+                )
+                # update() skips the post_save signal, refresh each vendor once.
+                refresh_vendor_metrics({row[2] for row in pending})
+        return {
+            "updated": updated,
+            "not_found": {
+                "ids": [pk for pk in ids if pk not in found_ids],
+                "po_numbers": [
+                    number for number in po_numbers if number not in found_po_numbers
+                ],
+            },
+            "unchanged": sorted(row[0] for row in rows if not row[3]),
+        }
+
+
+class PurchaseOrderBulkAcknowledgeSerializer(PurchaseOrderBulkTransitionSerializer):
+    pending = Q(acknowledgment_date__isnull=True)
+
+    def get_values(self, validated_data):
+        return {"acknowledgment_date": timezone.now()}
+
+
+class PurchaseOrderBulkCompleteSerializer(PurchaseOrderBulkTransitionSerializer):
+    quality_rating = serializers.FloatField(
+        min_value=0.0, max_value=5.0, required=False
+    )
+    pending = ~Q(status="completed")
+
+    def get_values(self, validated_data):
+        values = {"status": "completed"}
+        if "quality_rating" in validated_data:
+            values["quality_rating"] = validated_data["quality_rating"]
+        return values
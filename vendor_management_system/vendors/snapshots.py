@@ -0,0 +1,60 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from .metrics import VendorMetrics, compute_metrics_by_vendor
+from .models import Vendor, HistoricalPerfomance
+
+SNAPSHOT_INTERVALS = ("day", "week", "month")
+
+
+# Start of the day/week/month period containing ``moment``.
+def period_start(moment, interval):
+    day = timezone.localtime(moment).date()
+    if interval == "week":
+        day -= timedelta(days=day.weekday())
+    elif interval == "month":
+        day = day.replace(day=1)
+    elif interval != "day":
+        raise ValueError(f"Unknown snapshot interval {interval!r}.")
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+# Write one HistoricalPerfomance row per vendor for the period containing
+# ``moment``. Re-running within the same period updates the rows in place.
+def snapshot_vendor_performance(interval, moment=None, chunk_size=1000):
+    date = period_start(moment or timezone.now(), interval)
+    vendor_ids = Vendor.objects.order_by("pk").values_list("pk", flat=True)
+    written = 0
+    last_pk = 0
+    while True:
+        chunk = list(vendor_ids.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return written
+        by_vendor = compute_metrics_by_vendor(Vendor.objects.filter(pk__in=chunk))
+        snapshots = []
+        for vendor_id in chunk:
+            metrics = by_vendor.get(vendor_id, VendorMetrics(vendor_id))
+            snapshots.append(
+                HistoricalPerfomance(
+                    vendor_id=vendor_id,
+                    date=date,
+                    on_time_delivery_rate=metrics.on_time_delivery_rate,
+                    quality_rating_avg=metrics.quality_rating_avg,
+                    average_response_time=metrics.average_response_time,
+                    fulfillment_rate=metrics.fulfillment_rate,
+                )
+            )
+        HistoricalPerfomance.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=["vendor", "date"],
+            update_fields=[
+                "on_time_delivery_rate",
+                "quality_rating_avg",
+                "average_response_time",
+                "fulfillment_rate",
+            ],
+        )
+        written += len(snapshots)
+        last_pk = chunk[-1]
@@ -0,0 +1,36 @@
+import re
+
+from django.db import connection
+
+# A full table scan in EXPLAIN output: SQLite reports "SCAN <table>" without
+# "USING ... INDEX", PostgreSQL reports "Seq Scan on <table>".
+_SQLITE_TABLE_SCAN = re.compile(r"\bSCAN (\w+)(?! USING)(?!.*\bINDEX\b)")
+_POSTGRESQL_TABLE_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def explain(queryset):
+    if connection.vendor == "postgresql":
+        # Small test tables would always be scanned sequentially otherwise.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+    return queryset.explain()
+
+
+def table_scans(plan):
+    pattern = (
+        _POSTGRESQL_TABLE_SCAN if connection.vendor == "postgresql" else _SQLITE_TABLE_SCAN
+    )
+    return [match.group(1) for match in pattern.finditer(plan)]
+
+
+class QueryPlanAssertionsMixin:
+    # For TestCase classes: fail when a query falls back to a table scan.
+    def assertUsesIndex(self, queryset, allowed_scans=()):
+        plan = explain(queryset)
+        scans = [table for table in table_scans(plan) if table not in allowed_scans]
+        if scans:
+            self.fail(
+                f"Query scans {', '.join(scans)} without an index:\n"
+                f"{queryset.query}\n\nPlan:\n{plan}"
+            )
+        return plan
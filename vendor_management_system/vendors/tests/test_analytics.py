@@ -0,0 +1,147 @@
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command, CommandError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from vendors import analytics
+from vendors.metrics import compute_vendor_metrics
+from vendors.models import PurchaseOrder, Vendor
+
+
+@skipUnless(analytics.available(), "numpy is not installed")
+class AnalyticsTestCase(APITestCase):
+    def setUp(self):
+        caches[settings.ANALYTICS_CACHE].clear()
+        user = get_user_model().objects.create_user(username="user")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}"
+        )
+        self.vendors = [
+            Vendor.objects.create(
+                name=f"Vendor {name}",
+                contact_details="1234567890",
+                address="123 Main St",
+                vendor_code=f"TEST-{name}",
+            )
+            for name in "ABC"
+        ]
+        september = datetime(2026, 9, 15, 12, tzinfo=dt_timezone.utc)
+        october = datetime(2026, 10, 1, 12, tzinfo=dt_timezone.utc)
+        # vendor, issue date, delivery delay, response hours, rating, completed
+        for vendor, issued, delay, hours, rating, completed in [
+            (0, september, 1, 12, 4.0, True),
+            (0, october, 10, 36, None, True),
+            (0, october, 1, None, None, False),
+            (1, october, 1, 24, 5.0, True),
+            (1, october, 1, 72, 3.0, True),
+            (2, october, 1, 6, None, False),
+        ]:
+            purchase_order = PurchaseOrder.objects.create(
+                vendor=self.vendors[vendor],
+                order_date=issued,
+                delivery_date=issued + timedelta(days=delay),
+                items={},
+                quantity=1,
+                status="completed" if completed else "pending",
+                quality_rating=rating,
+            )
+            PurchaseOrder.objects.filter(pk=purchase_order.pk).update(
+                issue_date=issued,
+                acknowledgment_date=issued + timedelta(hours=hours) if hours else None,
+            )
+
+    def test_vendor_kpis_match_the_metrics_engine(self):
+        columns = analytics.PurchaseOrderColumns.load()
+        self.assertEqual(len(columns), 6)
+        counters, rates = columns.vendor_kpis()
+        for index, vendor_id in enumerate(columns.vendor_ids):
+            metrics = compute_vendor_metrics(int(vendor_id))
+            for field, values in {**counters, **rates}.items():
+                self.assertAlmostEqual(values[index], getattr(metrics, field))
+
+    def test_response_time_report(self):
+        report = analytics.response_time_report(
+            analytics.PurchaseOrderColumns.load(), percentiles=(0, 50, 100)
+        )
+        # Completed and acknowledged orders only: 0.5, 1.5, 1 and 3 days.
+        self.assertEqual(
+            report["purchase_orders"],
+            {
+                "count": 4,
+                "mean": 1.5,
+                "percentiles": {"p0": 0.5, "p50": 1.25, "p100": 3.0},
+            },
+        )
+        # Vendor averages: 1 and 2 days.
+        self.assertEqual(report["vendors"]["count"], 2)
+        self.assertEqual(report["vendors"]["percentiles"]["p50"], 1.5)
+
+    def test_endpoints(self):
+        response = self.client.get(
+            reverse("analytics-response-times"), {"percentiles": "50,99.9"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(response.json()["vendors"]["percentiles"]), ["p50", "p99.9"]
+        )
+
+        response = self.client.get(reverse("analytics-on-time-histogram"), {"bins": 4})
+        self.assertEqual(response.json()["vendors"], 2)
+        self.assertEqual(
+            [row["vendors"] for row in response.json()["bins"]], [0, 0, 1, 1]
+        )
+
+        response = self.client.get(reverse("analytics-cohorts"))
+        september, october = response.json()
+        self.assertEqual(september["month"], "2026-09")
+        self.assertEqual(september["total_pos"], 1)
+        self.assertEqual(october["vendors"], 3)
+        self.assertEqual(october["completed_pos"], 3)
+        self.assertEqual(october["fulfillment_rate"], 60.0)
+
+        response = self.client.get(
+            reverse("analytics-cohorts"),
+            {"vendor": self.vendors[0].pk, "from": "2026-10-01"},
+        )
+        self.assertEqual([row["total_pos"] for row in response.json()], [2])
+
+        for url, params in [
+            ("analytics-response-times", {"percentiles": "50,101"}),
+            ("analytics-on-time-histogram", {"bins": "0"}),
+            ("analytics-cohorts", {"from": "yesterday"}),
+        ]:
+            response = self.client.get(reverse(url), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reports_are_cached_per_version(self):
+        url = reverse("analytics-cohorts")
+        self.client.get(url)
+        # Only the version of the purchase orders is read on a cache hit.
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        PurchaseOrder.objects.filter(vendor=self.vendors[2]).delete()
+        self.assertEqual(self.client.get(url).json()[1]["total_pos"], 4)
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command(
+            "vendor_analytics",
+            "on_time_histogram",
+            "--bins=2",
+            stdout=stdout,
+            stderr=StringIO(),
+        )
+        self.assertEqual(
+            json.loads(stdout.getvalue())["on_time_histogram"]["vendors"], 2
+        )
+        with self.assertRaises(CommandError):
+            call_command("vendor_analytics", "unknown", stderr=StringIO())
@@ -0,0 +1,166 @@
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from vendors import archive
+from vendors.metrics import compute_metrics_by_vendor, compute_vendor_metrics
+from vendors.models import (
+    ArchivedPurchaseOrderRollup,
+    PurchaseOrder,
+    PurchaseOrderArchiveSegment,
+    PurchaseOrderLineItem,
+    Vendor,
+)
+from vendors.recompute import recompute_chunk
+from vendors.serializers import PurchaseOrderSerializer
+
+
+@skipUnless(archive.available(), "numpy is not installed")
+class PurchaseOrderArchiveTestCase(APITestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(PURCHASE_ORDER_ARCHIVE_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        user = get_user_model().objects.create_user(username="user")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}"
+        )
+        self.vendors = [
+            Vendor.objects.create(
+                name=f"Vendor {name}",
+                contact_details="1234567890",
+                address="123 Main St",
+                vendor_code=f"TEST-{name}",
+            )
+            for name in "AB"
+        ]
+        now = timezone.now()
+        # vendor, days issued before now, delivery delay, rating, completed
+        for vendor, age, delay, rating, completed in [
+            (0, 400, 1, 4.0, True),
+            (0, 400, 10, None, True),
+            (0, 400, 1, None, False),
+            (0, 1, 1, 5.0, True),
+            (1, 500, 2, 3.0, True),
+        ]:
+            issued = now - timedelta(days=age)
+            purchase_order = PurchaseOrder.objects.create(
+                vendor=self.vendors[vendor],
+                order_date=issued,
+                delivery_date=issued + timedelta(days=delay),
+                items=[{"sku": f"SKU-{age}", "quantity": delay}],
+                quantity=1,
+                status="completed" if completed else "pending",
+                quality_rating=rating,
+            )
+            PurchaseOrder.objects.filter(pk=purchase_order.pk).update(
+                issue_date=issued, acknowledgment_date=issued + timedelta(hours=12)
+            )
+        self.metrics = {
+            vendor.pk: compute_vendor_metrics(vendor) for vendor in self.vendors
+        }
+
+    def assertMetricsEqual(self, metrics, expected):
+        for field, value in expected.values().items():
+            self.assertAlmostEqual(getattr(metrics, field), value)
+
+    def archive(self, days=365):
+        return archive.archive_purchase_orders(
+            timezone.now() - timedelta(days=days), segment_rows=2
+        )
+
+    def test_kpis_stay_exact(self):
+        archived = list(
+            archive.archivable(timezone.now() - timedelta(days=365)).values("pk")
+        )
+        result = self.archive()
+        self.assertEqual((result.segments, result.purchase_orders), (2, 3))
+        self.assertEqual(PurchaseOrder.objects.count(), 2)
+        self.assertEqual(PurchaseOrderArchiveSegment.objects.count(), 2)
+        self.assertFalse(
+            PurchaseOrderLineItem.objects.filter(
+                purchase_order__in=[row["pk"] for row in archived]
+            ).exists()
+        )
+        self.assertEqual(
+            ArchivedPurchaseOrderRollup.objects.get(vendor=self.vendors[0]).total_pos, 2
+        )
+
+        # The second vendor only has archived purchase orders left.
+        by_vendor = compute_metrics_by_vendor(Vendor.objects.all())
+        self.assertEqual(set(by_vendor), set(self.metrics))
+        for vendor_id, expected in self.metrics.items():
+            self.assertMetricsEqual(by_vendor[vendor_id], expected)
+            self.assertMetricsEqual(compute_vendor_metrics(vendor_id), expected)
+
+        # The rollups are counted whatever the archive directory setting.
+        with override_settings(PURCHASE_ORDER_ARCHIVE_DIR=None):
+            recompute_chunk(list(self.metrics))
+        for vendor in Vendor.objects.all():
+            self.assertMetricsEqual(vendor, self.metrics[vendor.pk])
+
+        # Another run archives what crossed the horizon since, into a new segment.
+        self.assertEqual(self.archive(days=0).purchase_orders, 1)
+        self.assertEqual(
+            ArchivedPurchaseOrderRollup.objects.get(vendor=self.vendors[0]).total_pos, 3
+        )
+        self.assertMetricsEqual(
+            compute_vendor_metrics(self.vendors[0]), self.metrics[self.vendors[0].pk]
+        )
+
+    def test_lookup_by_number(self):
+        expected = {
+            purchase_order.po_number: PurchaseOrderSerializer(purchase_order).data
+            for purchase_order in PurchaseOrder.objects.all()
+        }
+        self.archive()
+        archived = set(expected) - set(
+            PurchaseOrder.objects.values_list("po_number", flat=True)
+        )
+        self.assertEqual(len(archived), 3)
+        # Rows are stored as uncompressed records, memory-mapped by lookups.
+        for segment in PurchaseOrderArchiveSegment.objects.all():
+            rows_path, _, _ = archive.segment_paths(segment.name)
+            records = archive.np.load(rows_path, mmap_mode="r")
+            self.assertEqual(len(records), segment.row_count)
+            self.assertLessEqual(set(records["po_number"].astype(str)), archived)
+        for po_number, payload in expected.items():
+            url = reverse("purchase-order-by-number", args=[po_number])
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                response.json(), {**payload, "archived": po_number in archived}
+            )
+
+        url = reverse("purchase-order-by-number", args=["unknown"])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        with override_settings(PURCHASE_ORDER_ARCHIVE_DIR=None):
+            url = reverse("purchase-order-by-number", args=[sorted(archived)[0]])
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command("archive_purchase_orders", "--dry-run", stdout=stdout)
+        self.assertIn("3 completed purchase order(s)", stdout.getvalue())
+        self.assertEqual(PurchaseOrder.objects.count(), 5)
+
+        stdout = StringIO()
+        call_command("archive_purchase_orders", "--older-than=450", stdout=stdout)
+        self.assertIn("Archived 1 purchase order(s) in 1 segment(s)", stdout.getvalue())
+        with override_settings(PURCHASE_ORDER_ARCHIVE_DIR=None):
+            with self.assertRaises(CommandError):
+                call_command("archive_purchase_orders")
@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from vendors.authentication import RevokedTokens, user_cache
+from vendors.models import Vendor
+
+
+class CachedJWTAuthenticationTestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_superuser(
+            username="superuser",
+            email="superuser@example.com",
+            password="superpassword",
+        )
+        self.vendor = Vendor.objects.create(
+            name="Test Vendor",
+            contact_details="1234567890",
+            address="123 Main St",
+            vendor_code="TEST123",
+        )
+
+    def get_tokens(self):
+        serializer = TokenObtainPairSerializer(
+            data={
+                "username": "superuser",
+                "password": "superpassword",
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def test_authenticated_reads_cost_no_auth_queries(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + self.get_tokens()["access"]
+        )
+        url = reverse("vendor-retrieve-update-destroy", kwargs={"pk": self.vendor.pk})
+        self.client.get(url)
+        # Only the vendor version and the vendor itself are read.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("vendor-performance-cache-stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("async-vendor-retrieve", kwargs={"pk": self.vendor.pk})
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_user_changes_invalidate_the_cache(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + self.get_tokens()["access"]
+        )
+        url = reverse("vendor-performance-cache-stats")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.user.is_staff = False
+        self.user.save()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.data["code"], "user_inactive")
+
+    def test_logout_revokes_the_access_token(self):
+        tokens = self.get_tokens()
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + tokens["access"])
+        url = reverse("vendor-list-create")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        response = self.client.post(
+            reverse("auth_logout"), {"refresh_token": tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_205_RESET_CONTENT)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.data["detail"], "Token is blacklisted")
+        response = self.client.get(reverse("async-vendor-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_cache_is_bounded(self):
+        self.assertLessEqual(user_cache.max_entries, 10000)
+        user_cache.set(-1, {"is_active": True})
+        self.assertEqual(user_cache.get(-1), {"is_active": True})
+        user_cache.invalidate(-1)
+        self.assertIsNone(user_cache.get(-1))
+
+    def test_unavailable_database_on_first_load_is_not_fatal(self):
+        tokens = RevokedTokens()
+        with mock.patch.object(
+            RevokedTokens, "load", side_effect=OperationalError("database is locked")
+        ), self.assertLogs("vendors.authentication", "WARNING"):
+            tokens.ensure_loaded()
+        self.assertIsNotNone(tokens._loaded_at)
+        self.assertNotIn("jti", tokens)
@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from vendors import analytics
+from vendors.benchmarks.api_suite import find_regressions
+
+
+class ApiSuiteBenchmarkTestCase(TestCase):
+    def test_suite_covers_every_url(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            call_command(
+                "benchmark",
+                "api_suite",
+                "--vendors=2",
+                "--orders=20",
+                "--bulk-rows=5",
+                "--iterations=1",
+                f"--output={output}",
+                stdout=StringIO(),
+            )
+            with open(output) as results_file:
+                report = json.load(results_file)
+            results = report["results"]
+            self.assertEqual(results["GET vendor-ranking"]["queries"], 1)
+            self.assertIn("signal post_save complete", results)
+            self.assertIn("Vendor.calculate_fulfillment_rate", results)
+
+            # A run against itself with an impossible threshold regresses.
+            baseline = os.path.join(directory, "baseline.json")
+            for result in results.values():
+                result["queries"] = 0
+            with open(baseline, "w") as baseline_file:
+                json.dump(report, baseline_file)
+            with self.assertRaises(CommandError):
+                call_command(
+                    "benchmark",
+                    "api_suite",
+                    "--vendors=2",
+                    "--orders=20",
+                    "--bulk-rows=5",
+                    "--iterations=1",
+                    f"--baseline={baseline}",
+                    stdout=StringIO(),
+                )
+
+    def test_find_regressions(self):
+        baseline = {
+            "GET a": {"mean_ms": 10.0, "queries": 2},
+            "GET b": {"mean_ms": 10.0, "queries": 2},
+        }
+        results = {
+            "GET a": {"mean_ms": 12.0, "queries": 2},
+            "GET b": {"mean_ms": 13.0, "queries": 3},
+            "GET new": {"mean_ms": 99.0, "queries": 9},
+        }
+        regressions = find_regressions(results, baseline, threshold=0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(name.startswith("GET b") for name in regressions))
+
+
+class ListSerializationBenchmarkTestCase(TestCase):
+    def test_same_content_and_speedup_reported(self):
+        stdout = StringIO()
+        call_command(
+            "benchmark",
+            "list_serialization",
+            "--rows=50",
+            "--vendors=2",
+            "--iterations=1",
+            stdout=stdout,
+        )
+        self.assertIn("speedup:", stdout.getvalue())
+
+
+@skipUnless(analytics.available(), "numpy is not installed")
+class AnalyticsBenchmarkTestCase(TestCase):
+    def test_same_reports_and_speedup_reported(self):
+        stdout = StringIO()
+        call_command(
+            "benchmark", "analytics", "--orders=50", "--vendors=5", stdout=stdout
+        )
+        self.assertIn("speedup:", stdout.getvalue())
@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from vendors.models import Vendor, PurchaseOrder
+
+
+class ConditionalGetTestCase(APITestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(username="user")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}"
+        )
+        self.vendor = Vendor.objects.create(
+            name="Test Vendor",
+            contact_details="1234567890",
+            address="123 Main St",
+            vendor_code="TEST123",
+        )
+        self.purchase_orders = [
+            PurchaseOrder.objects.create(
+                vendor=self.vendor,
+                order_date=timezone.now(),
+                delivery_date=timezone.now(),
+                items={"sku": index},
+                quantity=10,
+            )
+            for index in range(3)
+        ]
+        self.vendor.refresh_from_db()
+
+    def assertNotModified(self, url, queries=1, **headers):
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        return response
+
+    def test_vendor_retrieve(self):
+        url = reverse("vendor-retrieve-update-destroy", kwargs={"pk": self.vendor.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["Last-Modified"], http_date(self.vendor.updated_at.timestamp())
+        )
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        # Only the version of the vendor is read.
+        not_modified = self.assertNotModified(url, If_None_Match=etag)
+        self.assertEqual(not_modified["ETag"], etag)
+        self.assertNotModified(url, If_Modified_Since=response["Last-Modified"])
+
+        # Metric updates go through QuerySet.update() and still bump the version.
+        self.purchase_orders[0].delete()
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["total_pos"], 2)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_missing_vendor(self):
+        url = reverse("vendor-retrieve-update-destroy", kwargs={"pk": 999})
+        response = self.client.get(url, headers={"If-None-Match": "*"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_purchase_order_retrieve(self):
+        url = reverse(
+            "purchase-order-retrieve-update-destroy",
+            kwargs={"pk": self.purchase_orders[0].pk},
+        )
+        etag = self.client.get(url)["ETag"]
+        self.assertNotModified(url, If_None_Match=etag)
+        PurchaseOrder.objects.filter(pk=self.purchase_orders[0].pk).update(quantity=3)
+        self.assertEqual(
+            self.client.get(url, headers={"If-None-Match": etag}).status_code,
+            status.HTTP_200_OK,
+        )
+
+    def test_purchase_orders_by_vendor(self):
+        url = reverse("purchase-order-by-vendor", kwargs={"vendor_id": self.vendor.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        newest = max(po.updated_at for po in self.purchase_orders)
+        self.assertEqual(response["Last-Modified"], http_date(newest.timestamp()))
+        self.assertNotModified(url, If_None_Match=etag)
+
+        # Another page or field selection is another representation.
+        other = self.client.get(url, {"page_size": 1}, headers={"If-None-Match": etag})
+        self.assertEqual(other.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(other["ETag"], etag)
+
+        # A deletion leaves MAX(updated_at) alone but changes the count.
+        PurchaseOrder.objects.filter(pk=self.purchase_orders[0].pk).delete()
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 2)
+
+        etag = response["ETag"]
+        PurchaseOrder.objects.filter(pk=self.purchase_orders[1].pk).update(
+            delivery_date=timezone.now() + timedelta(days=1)
+        )
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_async_views(self):
+        for url in [
+            reverse("async-vendor-retrieve", kwargs={"pk": self.vendor.pk}),
+            reverse(
+                "async-purchase-order-by-vendor", kwargs={"vendor_id": self.vendor.pk}
+            ),
+        ]:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn("Last-Modified", response)
+            self.assertNotModified(url, If_None_Match=response["ETag"])
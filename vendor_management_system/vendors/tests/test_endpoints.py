@@ -2,6 +2,7 @@ from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.urls import reverse
+from django.test import override_settings
 from vendors.models import Vendor, PurchaseOrder, HistoricalPerfomance
 from django.utils import timezone
 from django.core.exceptions import ValidationError
@@ -12,7 +13,13 @@ from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework import generics
 from vendors.serializers import VendorSerializer
-from datetime import datetime
+from vendors.cache import performance_cache
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from django.core.management import call_command
+import json
+import csv
+import gzip
 
 
 class VendorAPITestCase(APITestCase):
@@ -86,6 +93,32 @@ class VendorAPITestCase(APITestCase):
         self.vendor.refresh_from_db()
         self.assertEqual(self.vendor.name, "Updated Vendor")
 
+    def test_metric_fields_are_read_only(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        data = {
+            "name": "New Vendor",
+            "contact_details": "9876543210",
+            "address": "456 Elm St",
+            "vendor_code": "NEW123",
+            "on_time_delivery_rate": 80.0,
+            "fulfillment_rate": 42.0,
+            "performance_score": 90.0,
+        }
+        response = self.client.post(reverse("vendor-list-create"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        created = Vendor.objects.get(vendor_code="NEW123")
+        url = reverse("vendor-retrieve-update-destroy", kwargs={"pk": self.vendor.pk})
+        response = self.client.put(
+            url, {**data, "vendor_code": "TEST123"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["fulfillment_rate"], 0.0)
+        self.vendor.refresh_from_db()
+        for vendor in [created, self.vendor]:
+            self.assertEqual(vendor.on_time_delivery_rate, 0.0)
+            self.assertEqual(vendor.fulfillment_rate, 0.0)
+            self.assertEqual(vendor.performance_score, 0.0)
+
     def test_delete_vendor_endpoint(self):
         self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
         url = reverse("vendor-retrieve-update-destroy", kwargs={"pk": self.vendor.pk})
@@ -307,6 +340,39 @@ class VendorPerformanceAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["on_time_delivery_rate"], 0.0)
 
+    def test_vendor_performance_is_cached_with_etag(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("vendor-performance", kwargs={"pk": self.vendor.pk})
+        stats_before = performance_cache.stats()
+        response = self.client.get(url)
+        etag = response.headers["ETag"]
+        # Neither the cached payload nor the cached JWT user hit the database.
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        stats = performance_cache.stats()
+        self.assertEqual(stats["misses"] - stats_before["misses"], 1)
+        self.assertEqual(stats["hits"] - stats_before["hits"], 1)
+
+        PurchaseOrder.objects.create(
+            vendor=self.vendor,
+            order_date=timezone.now(),
+            delivery_date=timezone.now(),
+            items={},
+            quantity=10,
+            status="completed",
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.data["on_time_delivery_rate"], 100.0)
+
+    def test_performance_cache_stats_endpoint(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        response = self.client.get(reverse("vendor-performance-cache-stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {"hits", "misses", "hit_ratio"})
+
     def test_update_vendor_performance_endpoint(self):
         self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
         url = reverse("vendor-performance", kwargs={"pk": self.vendor.pk})
@@ -359,3 +425,572 @@ class AcknowledgePurchaseOrderAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.purchase_order.refresh_from_db()
         self.assertIsNotNone(self.purchase_order.acknowledgment_date)
+
+
+class PurchaseOrderBulkCreateAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="superuser",
+            email="superuser@example.com",
+            password="superpassword",
+        )
+        self.vendor = Vendor.objects.create(
+            name="Test Vendor",
+            contact_details="1234567890",
+            address="123 Main St",
+            vendor_code="TEST123",
+        )
+
+    def get_token(self):
+        serializer = TokenObtainPairSerializer(
+            data={
+                "username": "superuser",
+                "password": "superpassword",
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data["access"]
+
+    def get_row(self, **kwargs):
+        row = {
+            "vendor": self.vendor.pk,
+            "order_date": "2024-04-30T00:00:00Z",
+            "delivery_date": "2024-05-05T00:00:00Z",
+            "items": {},
+            "quantity": 5,
+            "status": "completed",
+        }
+        row.update(kwargs)
+        return row
+
+    def test_bulk_create_json(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("purchase-order-bulk-create")
+        rows = [self.get_row() for _ in range(3)] + [self.get_row(status="pending")]
+        response = self.client.post(url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["created"], 4)
+        self.assertEqual(len(set(response.json()["po_numbers"])), 4)
+        self.assertEqual(PurchaseOrder.objects.count(), 4)
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_pos, 4)
+        self.assertEqual(self.vendor.fulfillment_rate, 75.0)
+
+    def test_bulk_create_ndjson_with_row_errors(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("purchase-order-bulk-create") + "?batch_size=1"
+        rows = [self.get_row(), self.get_row(quantity="many"), self.get_row(vendor=999)]
+        body = "\n".join(json.dumps(row) for row in rows)
+        response = self.client.post(
+            url, body, content_type="application/x-ndjson"
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.json()["created"], 1)
+        self.assertEqual(response.json()["failed"], 2)
+        self.assertEqual(
+            [error["index"] for error in response.json()["errors"]], [1, 2]
+        )
+        self.assertEqual(PurchaseOrder.objects.count(), 1)
+
+    def test_bulk_create_requires_list(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("purchase-order-bulk-create")
+        response = self.client.post(url, self.get_row(), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class VendorPerformanceHistoryAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="superuser",
+            email="superuser@example.com",
+            password="superpassword",
+        )
+        self.vendor = Vendor.objects.create(
+            name="Test Vendor",
+            contact_details="1234567890",
+            address="123 Main St",
+            vendor_code="TEST123",
+        )
+        PurchaseOrder.objects.create(
+            vendor=self.vendor,
+            order_date=timezone.now(),
+            delivery_date=timezone.now(),
+            items={},
+            quantity=10,
+            status="completed",
+        )
+
+    def get_token(self):
+        serializer = TokenObtainPairSerializer(
+            data={
+                "username": "superuser",
+                "password": "superpassword",
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data["access"]
+
+    def test_snapshots_are_idempotent_and_downsampled(self):
+        first_day = datetime(2024, 5, 6, 12, tzinfo=dt_timezone.utc)
+        call_command(
+            "snapshot_vendor_performance", "--at", first_day.isoformat(), stdout=StringIO()
+        )
+        call_command(
+            "snapshot_vendor_performance", "--at", first_day.isoformat(), stdout=StringIO()
+        )
+        HistoricalPerfomance.objects.create(
+            vendor=self.vendor,
+            date=datetime(2024, 5, 7, tzinfo=dt_timezone.utc),
+            on_time_delivery_rate=50.0,
+            quality_rating_avg=0.0,
+            average_response_time=0.0,
+            fulfillment_rate=50.0,
+        )
+        self.assertEqual(HistoricalPerfomance.objects.count(), 2)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("vendor-performance-history", kwargs={"pk": self.vendor.pk})
+        response = self.client.get(url, {"from": "2024-05-01", "bucket": "day"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["fulfillment_rate"] for row in response.json()], [100.0, 50.0]
+        )
+        response = self.client.get(url, {"bucket": "week"})
+        self.assertEqual(len(response.json()), 1)
+        self.assertEqual(response.json()[0]["on_time_delivery_rate"], 75.0)
+        response = self.client.get(url, {"to": "2024-05-01"})
+        self.assertEqual(response.json(), [])
+
+    def test_invalid_history_parameters(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("vendor-performance-history", kwargs={"pk": self.vendor.pk})
+        response = self.client.get(url, {"bucket": "year"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {"from": "yesterday"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        url = reverse("vendor-performance-history", kwargs={"pk": 999})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(API_PAGE_SIZE=2)
+class ListPaginationAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="superuser",
+            email="superuser@example.com",
+            password="superpassword",
+        )
+        self.vendor = Vendor.objects.create(
+            name="Test Vendor",
+            contact_details="1234567890",
+            address="123 Main St",
+            vendor_code="TEST123",
+        )
+        for index in range(5):
+            PurchaseOrder.objects.create(
+                po_number=f"PO{index}",
+                vendor=self.vendor,
+                order_date=timezone.now(),
+                delivery_date=timezone.now(),
+                items={"sku": index},
+                quantity=10,
+            )
+
+    def get_token(self):
+        serializer = TokenObtainPairSerializer(
+            data={
+                "username": "superuser",
+                "password": "superpassword",
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data["access"]
+
+    def follow_pages(self, url):
+        po_numbers = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            po_numbers += [row["po_number"] for row in response.json()]
+            link = response.headers.get("Link")
+            url = link[1 : link.index(">")] if link else None
+        return po_numbers
+
+    def test_purchase_orders_are_keyset_paginated(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("purchase-order-list-create")
+        self.assertEqual(self.follow_pages(url), [f"PO{index}" for index in range(5)])
+        url = reverse("purchase-order-by-vendor", kwargs={"vendor_id": self.vendor.pk})
+        self.assertEqual(len(self.follow_pages(url)), 5)
+
+    def test_sparse_fields(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("purchase-order-list-create")
+        response = self.client.get(url, {"fields": "po_number,status"})
+        self.assertEqual(response.json()[0], {"po_number": "PO0", "status": "pending"})
+        response = self.client.get(url, {"fields": "po_number,unknown"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        url = reverse("vendor-list-create")
+        response = self.client.get(url, {"fields": "vendor_code"})
+        self.assertEqual(response.json(), [{"vendor_code": "TEST123"}])
+
+    def test_invalid_cursor(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("purchase-order-list-create")
+        response = self.client.get(url, {"cursor": "garbage"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ExportAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="superuser",
+            email="superuser@example.com",
+            password="superpassword",
+        )
+        self.vendor = Vendor.objects.create(
+            name="Test Vendor",
+            contact_details="1234567890",
+            address="123 Main St",
+            vendor_code="TEST123",
+        )
+        Vendor.objects.create(
+            name="Idle Vendor",
+            contact_details="1234567890",
+            address="456 Elm St",
+            vendor_code="IDLE123",
+        )
+        for status_value in ["completed", "pending"]:
+            PurchaseOrder.objects.create(
+                vendor=self.vendor,
+                order_date=timezone.now(),
+                delivery_date=timezone.now(),
+                items={"sku": "A1"},
+                quantity=10,
+                status=status_value,
+            )
+
+    def get_token(self):
+        serializer = TokenObtainPairSerializer(
+            data={
+                "username": "superuser",
+                "password": "superpassword",
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data["access"]
+
+    def test_export_purchase_orders_ndjson(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("purchase-order-export")
+        response = self.client.get(url, {"vendor": self.vendor.pk})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual(len(rows), 2)
+        listed = self.client.get(reverse("purchase-order-list-create")).json()
+        self.assertEqual(rows[0]["issue_date"], listed[0]["issue_date"])
+        self.assertEqual(rows[0]["items"], {"sku": "A1"})
+
+    def test_export_purchase_orders_gzipped_csv(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("purchase-order-export")
+        response = self.client.get(url, {"format": "csv", "gzip": "1"})
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        content = gzip.decompress(b"".join(response.streaming_content)).decode()
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(json.loads(rows[0]["items"]), {"sku": "A1"})
+        response = self.client.get(url, {"since": "2999-01-01"})
+        self.assertEqual(b"".join(response.streaming_content), b"")
+        response = self.client.get(url, {"format": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_vendor_scorecards(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("vendor-scorecard-export")
+        response = self.client.get(url, {"format": "csv"})
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual([row["vendor_code"] for row in rows], ["TEST123", "IDLE123"])
+        self.assertEqual(float(rows[0]["fulfillment_rate"]), 50.0)
+        self.assertEqual(float(rows[1]["fulfillment_rate"]), 0.0)
+
+
+class AsyncReadAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="superuser",
+            email="superuser@example.com",
+            password="superpassword",
+        )
+        self.vendor = Vendor.objects.create(
+            name="Test Vendor",
+            contact_details="1234567890",
+            address="123 Main St",
+            vendor_code="TEST123",
+        )
+        for index in range(3):
+            PurchaseOrder.objects.create(
+                po_number=f"PO{index}",
+                vendor=self.vendor,
+                order_date=timezone.now(),
+                delivery_date=timezone.now(),
+                items={"sku": index},
+                quantity=10,
+                status="completed" if index else "pending",
+            )
+
+    def get_token(self):
+        serializer = TokenObtainPairSerializer(
+            data={
+                "username": "superuser",
+                "password": "superpassword",
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data["access"]
+
+    def assertSameResponse(self, sync_url, async_url, params=None):
+        sync_response = self.client.get(sync_url, params)
+        async_response = self.client.get(async_url, params)
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.content, sync_response.content)
+        return async_response
+
+    def test_async_endpoints_match_sync_endpoints(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        vendor = {"pk": self.vendor.pk}
+        self.assertSameResponse(
+            reverse("vendor-list-create"),
+            reverse("async-vendor-list"),
+            {"fields": "id,vendor_code"},
+        )
+        self.assertSameResponse(
+            reverse("vendor-retrieve-update-destroy", kwargs=vendor),
+            reverse("async-vendor-retrieve", kwargs=vendor),
+        )
+        self.assertSameResponse(
+            reverse("vendor-retrieve-update-destroy", kwargs={"pk": 999}),
+            reverse("async-vendor-retrieve", kwargs={"pk": 999}),
+        )
+        response = self.assertSameResponse(
+            reverse("vendor-performance", kwargs=vendor),
+            reverse("async-vendor-performance", kwargs=vendor),
+        )
+        self.assertAlmostEqual(response.json()["fulfillment_rate"], 200 / 3)
+        response = self.client.get(
+            reverse("async-vendor-performance", kwargs=vendor),
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_async_purchase_orders_by_vendor_are_paginated(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        kwargs = {"vendor_id": self.vendor.pk}
+        response = self.assertSameResponse(
+            reverse("purchase-order-by-vendor", kwargs=kwargs),
+            reverse("async-purchase-order-by-vendor", kwargs=kwargs),
+            {"page_size": 2},
+        )
+        self.assertEqual([row["po_number"] for row in response.json()], ["PO0", "PO1"])
+        link = response.headers["Link"]
+        response = self.client.get(link[1 : link.index(">")])
+        self.assertEqual([row["po_number"] for row in response.json()], ["PO2"])
+        self.assertNotIn("Link", response.headers)
+
+    def test_async_endpoints_require_authentication(self):
+        url = reverse("async-vendor-list")
+        self.assertSameResponse(reverse("vendor-list-create"), url)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", response.headers)
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+        self.assertSameResponse(reverse("vendor-list-create"), url)
+
+
+class VendorRankingAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="superuser",
+            email="superuser@example.com",
+            password="superpassword",
+        )
+        # (vendor code, [(status, quality rating, days late), ...])
+        for code, orders in [
+            ("BEST", [("completed", 5.0, 0), ("completed", 5.0, 0)]),
+            ("LATE", [("completed", 4.0, 30), ("completed", 4.0, 30), ("pending", None, 0)]),
+            ("SMALL", [("completed", 5.0, 0)]),
+            ("IDLE", []),
+        ]:
+            vendor = Vendor.objects.create(
+                name="Test Vendor",
+                contact_details="1234567890",
+                address="123 Main St",
+                vendor_code=code,
+            )
+            for status_value, rating, days_late in orders:
+                PurchaseOrder.objects.create(
+                    vendor=vendor,
+                    order_date=timezone.now(),
+                    delivery_date=timezone.now() + timezone.timedelta(days=days_late),
+                    items={},
+                    quantity=1,
+                    status=status_value,
+                    quality_rating=rating,
+                )
+
+    def get_token(self):
+        serializer = TokenObtainPairSerializer(
+            data={
+                "username": "superuser",
+                "password": "superpassword",
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data["access"]
+
+    def ranking(self, **params):
+        response = self.client.get(reverse("vendor-ranking"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row["vendor_code"] for row in response.json()]
+
+    def test_vendor_ranking(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        self.assertEqual(self.ranking(), ["BEST", "SMALL", "LATE", "IDLE"])
+        self.assertEqual(self.ranking(min_orders=2), ["BEST", "LATE"])
+        self.assertEqual(self.ranking(limit=1), ["BEST"])
+        self.assertEqual(
+            self.ranking(by="fulfillment_rate", min_orders=1),
+            ["BEST", "SMALL", "LATE"],
+        )
+        best = Vendor.objects.get(vendor_code="BEST")
+        self.assertEqual(best.performance_score, 100.0)
+        response = self.client.get(
+            reverse("vendor-ranking"), {"fields": "vendor_code,performance_score"}
+        )
+        self.assertEqual(
+            response.json()[0], {"vendor_code": "BEST", "performance_score": 100.0}
+        )
+
+    def test_ranking_is_a_single_query(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        self.ranking()
+        with self.assertNumQueries(1):
+            self.ranking(by="quality_rating_avg", min_orders=1, limit=2)
+
+    def test_invalid_ranking_parameters(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("vendor-ranking")
+        for params in [{"by": "name"}, {"min_orders": "x"}, {"limit": 0}]:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PurchaseOrderBulkTransitionAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="superuser",
+            email="superuser@example.com",
+            password="superpassword",
+        )
+        self.vendors = [
+            Vendor.objects.create(
+                name="Test Vendor",
+                contact_details="1234567890",
+                address="123 Main St",
+                vendor_code=f"TEST{index}",
+            )
+            for index in range(2)
+        ]
+        self.purchase_orders = [
+            PurchaseOrder.objects.create(
+                po_number=f"PO{index}",
+                vendor=self.vendors[index % 2],
+                order_date=timezone.now(),
+                delivery_date=timezone.now(),
+                items={},
+                quantity=10,
+                status="completed",
+            )
+            for index in range(4)
+        ]
+        PurchaseOrder.objects.filter(po_number="PO3").update(
+            acknowledgment_date=timezone.now()
+        )
+
+    def get_token(self):
+        serializer = TokenObtainPairSerializer(
+            data={
+                "username": "superuser",
+                "password": "superpassword",
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data["access"]
+
+    def test_bulk_acknowledge(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        first, second, third, fourth = self.purchase_orders
+        data = {
+            "ids": [first.pk, second.pk, fourth.pk, 999],
+            "po_numbers": ["PO2", "NOPE"],
+        }
+        response = self.client.post(
+            reverse("purchase-order-bulk-acknowledge"), data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            response.json(),
+            {
+                "updated": 3,
+                "not_found": {"ids": [999], "po_numbers": ["NOPE"]},
+                "already_acknowledged": [fourth.pk],
+            },
+        )
+        self.assertFalse(
+            PurchaseOrder.objects.filter(acknowledgment_date__isnull=True).exists()
+        )
+        for vendor in self.vendors:
+            vendor.refresh_from_db()
+            self.assertEqual(vendor.response_time_count, 2)
+
+    def test_bulk_complete_refreshes_each_vendor_once(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        PurchaseOrder.objects.update(status="pending")
+        url = reverse("purchase-order-bulk-complete")
+        data = {"po_numbers": ["PO0", "PO1", "PO2", "PO3"], "quality_rating": 4.0}
+        self.client.post(url, {"ids": [999]}, format="json")
+        # SELECT and UPDATE inside a SAVEPOINT, then the stored metrics read,
+        # grouped metrics aggregate, archived rollups and one UPDATE of every
+        # changed vendor, inside a nested SAVEPOINT.
+        with self.assertNumQueries(10):
+            response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["updated"], 4)
+        for vendor in self.vendors:
+            vendor.refresh_from_db()
+            self.assertEqual(vendor.fulfillment_rate, 100.0)
+            self.assertEqual(vendor.quality_rating_avg, 4.0)
+        first = self.purchase_orders[0]
+        response = self.client.post(url, {"ids": [first.pk]}, format="json")
+        self.assertEqual(response.json()["already_completed"], [first.pk])
+
+    def test_bulk_transition_requires_rows(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.get_token())
+        url = reverse("purchase-order-bulk-acknowledge")
+        response = self.client.post(url, {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(url, {"ids": ["x"]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
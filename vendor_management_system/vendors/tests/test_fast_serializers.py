@@ -0,0 +1,135 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from vendors.export import iter_purchase_order_rows
+from vendors.fast_serializers import ValuesSerializer, values_serializer
+from vendors.models import Vendor, PurchaseOrder
+from vendors.recompute import recompute_vendors
+from vendors.serializers import VendorSerializer, PurchaseOrderSerializer
+
+
+def create_dataset():
+    now = timezone.now()
+    vendors = [
+        Vendor.objects.create(
+            name=f"Vendor {'ABC'[index]}",
+            contact_details="1234567890",
+            address=f'{index} "Main" St\nSão Paulo 中',
+            vendor_code=f"CODE{index}",
+        )
+        for index in range(3)
+    ]
+    for index in range(12):
+        po = PurchaseOrder.objects.create(
+            vendor=vendors[index % 3],
+            order_date=now - timedelta(days=index, microseconds=index),
+            delivery_date=now + timedelta(days=index % 4),
+            items=[{"sku": f"SKU-{index}", "quantity": index, "price": 1.5}]
+            if index % 2
+            else {"note": "✓", "nested": {"list": [1, None, True]}},
+            quantity=index + 1,
+            status=["pending", "completed", "canceled"][index % 3],
+            quality_rating=[None, 4.0, 3.5][index % 3],
+        )
+        if index % 2:
+            PurchaseOrder.objects.filter(pk=po.pk).update(
+                acknowledgment_date=po.issue_date + timedelta(hours=index)
+            )
+    recompute_vendors([vendor.pk for vendor in vendors])
+
+
+class ValuesSerializerParityTestCase(TestCase):
+    def setUp(self):
+        create_dataset()
+
+    def assertSameContent(self, serializer_class, queryset, fields=None):
+        expected = JSONRenderer().render(
+            serializer_class(queryset, many=True, context={"fields": fields}).data
+        )
+        serializer = values_serializer(serializer_class, fields)
+        actual = JSONRenderer().render(
+            serializer.serialize(serializer.values(queryset))
+        )
+        self.assertEqual(actual, expected)
+
+    def test_vendors(self):
+        self.assertSameContent(VendorSerializer, Vendor.objects.order_by("pk"))
+        self.assertSameContent(
+            VendorSerializer,
+            Vendor.objects.order_by("pk"),
+            ("performance_score", "name", "id"),
+        )
+
+    def test_purchase_orders(self):
+        queryset = PurchaseOrder.objects.order_by("issue_date", "id")
+        self.assertSameContent(PurchaseOrderSerializer, queryset)
+        self.assertSameContent(
+            PurchaseOrderSerializer, queryset, ("vendor", "items", "order_date")
+        )
+
+    def test_other_time_zone(self):
+        with timezone.override("Asia/Kolkata"):
+            self.assertSameContent(
+                PurchaseOrderSerializer, PurchaseOrder.objects.order_by("pk")
+            )
+
+    def test_export_rows_use_api_datetimes(self):
+        serialized = PurchaseOrderSerializer(PurchaseOrder.objects.earliest("pk")).data
+        row = next(iter_purchase_order_rows(PurchaseOrder.objects.all()))
+        self.assertEqual(row["order_date"], serialized["order_date"])
+        self.assertEqual(row["acknowledgment_date"], serialized["acknowledgment_date"])
+        self.assertEqual(row["items"], serialized["items"])
+
+    def test_only_model_columns(self):
+        class ComputedSerializer(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Vendor
+                fields = ["id", "label"]
+
+            def get_label(self, vendor):
+                return vendor.name
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer(ComputedSerializer)
+
+
+class ValuesListEndpointTestCase(APITestCase):
+    def setUp(self):
+        create_dataset()
+        self.client.force_authenticate(get_user_model().objects.create_user("user"))
+
+    def test_list_pages_match_model_serializer(self):
+        url = reverse("purchase-order-list-create") + "?page_size=5"
+        queryset = PurchaseOrder.objects.order_by("issue_date", "id")
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.content)
+            url = response.get("Link", "").partition(">")[0][1:] or None
+        self.assertEqual(len(pages), 3)
+        for index, content in enumerate(pages):
+            page = queryset[index * 5 : (index + 1) * 5]
+            expected = JSONRenderer().render(
+                PurchaseOrderSerializer(page, many=True).data
+            )
+            self.assertEqual(content, expected)
+
+    def test_sparse_fields(self):
+        response = self.client.get(
+            reverse("vendor-list-create"), {"fields": "vendor_code,name"}
+        )
+        self.assertEqual(
+            response.json()[0], {"name": "Vendor A", "vendor_code": "CODE0"}
+        )
+
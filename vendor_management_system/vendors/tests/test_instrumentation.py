@@ -0,0 +1,109 @@
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, override_settings
+from django.http import HttpResponse
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from vendors.instrumentation import InstrumentationMiddleware, request_metrics
+from vendors.models import Vendor
+
+
+def server_timing(response):
+    # {metric name: {parameter: value}} parsed from the Server-Timing header.
+    metrics = {}
+    for entry in response["Server-Timing"].split(", "):
+        name, *params = entry.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+@override_settings(API_INSTRUMENTATION=True)
+class InstrumentationMiddlewareTestCase(APITestCase):
+    def setUp(self):
+        request_metrics.reset()
+        self.user = get_user_model().objects.create_superuser(username="admin")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}"
+        )
+        for code in ("A", "B"):
+            Vendor.objects.create(
+                name=f"Vendor {code}",
+                contact_details="1234567890",
+                address="123 Main St",
+                vendor_code=f"CODE{code}",
+            )
+
+    def test_server_timing_header(self):
+        # The first request also loads the user into the authentication cache.
+        self.client.get(reverse("vendor-list-create"))
+        response = self.client.get(reverse("vendor-list-create"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = server_timing(response)
+        self.assertEqual(set(timing), {"db", "db-slowest", "serialize", "total"})
+        self.assertEqual(timing["db"]["desc"], '"1 query"')
+        self.assertGreater(float(timing["serialize"]["dur"]), 0)
+        self.assertGreaterEqual(
+            float(timing["total"]["dur"]), float(timing["db"]["dur"])
+        )
+
+    def test_async_view_queries_are_recorded(self):
+        self.client.get(reverse("async-vendor-list"))
+        response = self.client.get(reverse("async-vendor-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(server_timing(response)["db"]["desc"], '"1 query"')
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse("vendor-list-create"))
+        self.client.get(reverse("vendor-list-create"))
+        response = self.client.get(reverse("request-metrics"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        labels = 'method="GET",route="api/vendors/"'
+        self.assertIn(f'vms_http_requests_total{{{labels},status="200"}} 2', body)
+        # One query, plus the user row on the first request
+        self.assertIn(f'vms_http_request_queries_bucket{{{labels},le="1"}} 1', body)
+        self.assertIn(f'vms_http_request_queries_bucket{{{labels},le="2"}} 2', body)
+        self.assertIn(f"vms_http_request_duration_seconds_count{{{labels}}} 2", body)
+        self.assertIn("# TYPE vms_http_request_queries histogram", body)
+
+    def test_metrics_endpoint_requires_admin(self):
+        user = get_user_model().objects.create_user(username="user")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}"
+        )
+        response = self.client.get(reverse("request-metrics"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(API_INSTRUMENTATION_DUPLICATE_THRESHOLD=3)
+    def test_duplicate_queries_are_reported(self):
+        def view(request):
+            for vendor_id in Vendor.objects.values_list("pk", flat=True):
+                for _ in range(2):
+                    Vendor.objects.get(pk=vendor_id)
+            return HttpResponse()
+
+        middleware = InstrumentationMiddleware(view)
+        with self.assertLogs("vendors.instrumentation", "WARNING") as logs:
+            response = middleware(RequestFactory().get("/n-plus-one/"))
+        self.assertEqual(
+            server_timing(response)["n-plus-one"]["desc"],
+            '"1 statements run 4 times"',
+        )
+        self.assertIn("ran the same query 4 times", logs.output[0])
+        self.assertIn(
+            'vms_http_request_duplicate_queries_total{method="GET",'
+            'route="<unmatched>"} 4',
+            request_metrics.render(),
+        )
+
+
+class InstrumentationDisabledTestCase(APITestCase):
+    def test_no_server_timing_header(self):
+        user = get_user_model().objects.create_user(username="user")
+        self.client.force_authenticate(user)
+        response = self.client.get(reverse("vendor-list-create"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", response)
@@ -0,0 +1,216 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from vendors.line_items import create_line_items
+from vendors.models import (
+    PurchaseOrder,
+    PurchaseOrderLineItem,
+    Vendor,
+    index_purchase_order_line_items,
+    parse_line_items,
+)
+
+
+class ParseLineItemsTestCase(SimpleTestCase):
+    def test_parse_line_items(self):
+        self.assertEqual(
+            parse_line_items(
+                [
+                    {"sku": "A1", "quantity": 3},
+                    {"sku": 7},
+                    {"sku": " B2 ", "quantity": "4"},
+                    {"sku": ""},
+                    {"sku": "x" * 101},
+                    {"sku": True},
+                    {"quantity": 2},
+                    "C3",
+                ]
+            ),
+            [("A1", 3), ("7", None), ("B2", None)],
+        )
+        self.assertEqual(parse_line_items({"sku": "A1", "quantity": 1}), [("A1", 1)])
+        self.assertEqual(parse_line_items({}), [])
+        self.assertEqual(parse_line_items("A1"), [])
+
+
+class LineItemIndexTestCase(APITestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(username="user")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}"
+        )
+        self.vendors = [
+            Vendor.objects.create(
+                name=f"Vendor {name}",
+                contact_details="1234567890",
+                address="123 Main St",
+                vendor_code=f"TEST-{name}",
+            )
+            for name in "AB"
+        ]
+
+    def create_purchase_order(self, vendor, items, **kwargs):
+        return PurchaseOrder.objects.create(
+            vendor=vendor,
+            order_date=timezone.now(),
+            delivery_date=timezone.now(),
+            items=items,
+            quantity=1,
+            **kwargs,
+        )
+
+    def indexed(self, purchase_order):
+        return list(
+            PurchaseOrderLineItem.objects.filter(purchase_order=purchase_order)
+            .order_by("pk")
+            .values_list("vendor_id", "sku", "quantity")
+        )
+
+    def test_index_follows_purchase_order_writes(self):
+        vendor, other = self.vendors
+        purchase_order = self.create_purchase_order(
+            vendor, [{"sku": "A1", "quantity": 2}, {"sku": "B2", "quantity": 5}]
+        )
+        self.assertEqual(
+            self.indexed(purchase_order), [(vendor.pk, "A1", 2), (vendor.pk, "B2", 5)]
+        )
+
+        # Writes that leave the items and the vendor alone do not touch the index.
+        purchase_order = PurchaseOrder.objects.get(pk=purchase_order.pk)
+        purchase_order.status = "completed"
+        with self.assertNumQueries(0):
+            index_purchase_order_line_items(
+                PurchaseOrder, purchase_order, created=False
+            )
+
+        purchase_order.items = {"sku": "C3", "quantity": 1}
+        purchase_order.vendor = other
+        purchase_order.save()
+        self.assertEqual(self.indexed(purchase_order), [(other.pk, "C3", 1)])
+
+        purchase_order.delete()
+        self.assertFalse(PurchaseOrderLineItem.objects.exists())
+
+    def test_purchase_orders_without_skus_are_not_indexed(self):
+        with self.assertNumQueries(0):
+            create_line_items([PurchaseOrder(vendor=self.vendors[0], items={})])
+
+    def test_bulk_create_indexes_line_items(self):
+        rows = [
+            {
+                "vendor": self.vendors[index % 2].pk,
+                "order_date": timezone.now().isoformat(),
+                "delivery_date": timezone.now().isoformat(),
+                "items": [{"sku": "A1", "quantity": index + 1}],
+                "quantity": 1,
+            }
+            for index in range(4)
+        ]
+        response = self.client.post(
+            reverse("purchase-order-bulk-create"), rows, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(PurchaseOrderLineItem.objects.filter(sku="A1").count(), 4)
+
+    def test_list_filters(self):
+        vendor, other = self.vendors
+        pending = self.create_purchase_order(vendor, [{"sku": "A1"}, {"sku": "B2"}])
+        completed = self.create_purchase_order(
+            vendor, [{"sku": "A1"}], status="completed"
+        )
+        elsewhere = self.create_purchase_order(other, [{"sku": "A1"}])
+        self.create_purchase_order(other, [{"sku": "B2"}])
+        url = reverse("purchase-order-list-create")
+
+        def listed(**params):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return [row["id"] for row in response.json()]
+
+        self.assertEqual(listed(sku="A1"), [pending.pk, completed.pk, elsewhere.pk])
+        self.assertEqual(listed(sku="A1", vendor=vendor.pk), [pending.pk, completed.pk])
+        self.assertEqual(listed(sku="A1", status="pending"), [pending.pk, elsewhere.pk])
+        self.assertEqual(listed(vendor=other.pk, status="completed"), [])
+        self.assertEqual(listed(sku="missing"), [])
+
+        for params in [{"status": "open"}, {"vendor": "abc"}]:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(next(iter(params)), response.json())
+
+    def test_sku_summary(self):
+        vendor, other = self.vendors
+        self.create_purchase_order(
+            vendor, [{"sku": "A1", "quantity": 2}, {"sku": "A1", "quantity": 3}]
+        )
+        self.create_purchase_order(
+            vendor, [{"sku": "A1", "quantity": 1}], status="completed"
+        )
+        self.create_purchase_order(other, [{"sku": "A1", "quantity": 10}])
+        self.create_purchase_order(other, [{"sku": "B2", "quantity": 4}])
+        url = reverse("purchase-order-sku-summary", kwargs={"sku": "A1"})
+
+        # One grouped query once the authenticated user is cached.
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "sku": "A1",
+                "line_items": 4,
+                "purchase_orders": 3,
+                "total_quantity": 16,
+                "vendors": [
+                    {
+                        "vendor": other.pk,
+                        "line_items": 1,
+                        "purchase_orders": 1,
+                        "total_quantity": 10,
+                    },
+                    {
+                        "vendor": vendor.pk,
+                        "line_items": 3,
+                        "purchase_orders": 2,
+                        "total_quantity": 6,
+                    },
+                ],
+            },
+        )
+
+        response = self.client.get(url, {"vendor": vendor.pk, "status": "pending"})
+        self.assertEqual(response.json()["total_quantity"], 5)
+        self.assertEqual(response.json()["purchase_orders"], 1)
+
+        response = self.client.get(
+            reverse("purchase-order-sku-summary", kwargs={"sku": "missing"})
+        )
+        self.assertEqual(response.json()["vendors"], [])
+        self.assertEqual(response.json()["total_quantity"], 0)
+
+    def test_rebuild_command(self):
+        vendor, other = self.vendors
+        purchase_order = self.create_purchase_order(vendor, [{"sku": "A1"}])
+        self.create_purchase_order(other, [{"sku": "B2"}])
+        # update() bypasses the signals and leaves the index stale.
+        PurchaseOrder.objects.filter(pk=purchase_order.pk).update(
+            items=[{"sku": "C3", "quantity": 2}]
+        )
+        self.assertEqual(self.indexed(purchase_order)[0][1], "A1")
+
+        stdout = StringIO()
+        call_command("rebuild_line_item_index", "--vendor", vendor.pk, stdout=stdout)
+        self.assertIn("Indexed 1 line item(s).", stdout.getvalue())
+        self.assertEqual(self.indexed(purchase_order), [(vendor.pk, "C3", 2)])
+
+        call_command("rebuild_line_item_index", stdout=stdout)
+        self.assertEqual(PurchaseOrderLineItem.objects.count(), 2)
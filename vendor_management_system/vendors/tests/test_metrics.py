@@ -0,0 +1,338 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from vendors.deferred import PendingVendors, process_queue
+from vendors.models import Vendor, PurchaseOrder, VendorMetricsQueue
+from vendors.metrics import (
+    VendorMetrics,
+    compute_vendor_metrics,
+    compute_metrics_by_vendor,
+)
+from vendors.recompute import recompute_chunk
+
+
+class VendorMetricCountersTestCase(TestCase):
+    def setUp(self):
+        self.vendor = Vendor.objects.create(
+            name="Test Vendor",
+            contact_details="1234567890",
+            address="123 Main St",
+            vendor_code="TEST123",
+        )
+
+    def create_po(self, **kwargs):
+        now = timezone.now()
+        data = {
+            "vendor": self.vendor,
+            "order_date": now,
+            "delivery_date": now + timedelta(days=3),
+            "items": {},
+            "quantity": 10,
+        }
+        data.update(kwargs)
+        return PurchaseOrder.objects.create(**data)
+
+    def assertMetricsMatchCalculations(self):
+        self.vendor.refresh_from_db()
+        self.assertAlmostEqual(
+            self.vendor.on_time_delivery_rate,
+            self.vendor.calculate_on_time_delivery_rate(),
+        )
+        self.assertAlmostEqual(
+            self.vendor.quality_rating_avg,
+            self.vendor.calculate_quality_rating_average(),
+        )
+        self.assertAlmostEqual(
+            self.vendor.average_response_time,
+            self.vendor.calculate_average_response_time(),
+        )
+        self.assertAlmostEqual(
+            self.vendor.fulfillment_rate, self.vendor.calculate_fulfillment_rate()
+        )
+
+    def test_counters_follow_po_lifecycle(self):
+        first = self.create_po()
+        second = self.create_po(delivery_date=timezone.now() + timedelta(days=30))
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_pos, 2)
+        self.assertEqual(self.vendor.fulfillment_rate, 0.0)
+
+        first = PurchaseOrder.objects.get(pk=first.pk)
+        first.acknowledgment_date = first.issue_date + timedelta(days=2)
+        first.status = "completed"
+        first.quality_rating = 4.0
+        first.save()
+        second = PurchaseOrder.objects.get(pk=second.pk)
+        second.status = "completed"
+        second.quality_rating = 2.0
+        second.save()
+        self.assertMetricsMatchCalculations()
+        self.assertEqual(self.vendor.completed_pos, 2)
+        self.assertEqual(self.vendor.on_time_pos, 1)
+        self.assertEqual(self.vendor.quality_rating_avg, 3.0)
+        self.assertEqual(self.vendor.average_response_time, 2.0)
+
+        second.delete()
+        self.assertMetricsMatchCalculations()
+        self.assertEqual(self.vendor.total_pos, 1)
+        self.assertEqual(self.vendor.quality_rating_avg, 4.0)
+
+    def test_moving_po_between_vendors(self):
+        other = Vendor.objects.create(
+            name="Other Vendor",
+            contact_details="1234567890",
+            address="456 Elm St",
+            vendor_code="OTHER123",
+        )
+        po = self.create_po(status="completed", quality_rating=5.0)
+        po = PurchaseOrder.objects.get(pk=po.pk)
+        po.vendor = other
+        po.save()
+        self.vendor.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.vendor.total_pos, 0)
+        self.assertEqual(self.vendor.quality_rating_avg, 0.0)
+        self.assertEqual(other.total_pos, 1)
+        self.assertEqual(other.quality_rating_avg, 5.0)
+
+    def test_saving_a_stale_vendor_keeps_the_counters(self):
+        for _ in range(3):
+            self.create_po(status="completed")
+        self.vendor.address = "456 Elm St"
+        self.vendor.save()
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.address, "456 Elm St")
+        self.assertEqual(self.vendor.total_pos, 3)
+        self.assertEqual(self.vendor.fulfillment_rate, 100.0)
+
+        self.create_po()
+        self.assertMetricsMatchCalculations()
+        self.assertEqual(self.vendor.total_pos, 4)
+
+    def test_deleting_a_vendor_skips_the_counter_updates(self):
+        for _ in range(20):
+            self.create_po(status="completed")
+        # Drifted counters must not block the delete either.
+        Vendor.objects.filter(pk=self.vendor.pk).update(total_pos=0, completed_pos=0)
+        with self.assertNumQueries(8):
+            self.vendor.delete()
+        self.assertFalse(PurchaseOrder.objects.exists())
+
+    def test_recompute_command_repairs_drift(self):
+        self.create_po(status="completed", quality_rating=3.0)
+        Vendor.objects.filter(pk=self.vendor.pk).update(total_pos=7)
+        stdout = StringIO()
+        call_command("recompute_vendor_metrics", "--dry-run", stdout=stdout)
+        self.assertIn("  total_pos: 7 -> 1\n", stdout.getvalue())
+        call_command("recompute_vendor_metrics", stdout=StringIO())
+        self.assertMetricsMatchCalculations()
+        self.assertEqual(self.vendor.total_pos, 1)
+
+
+class MetricsEngineTestCase(TestCase):
+    def setUp(self):
+        self.vendor = Vendor.objects.create(
+            name="Test Vendor",
+            contact_details="1234567890",
+            address="123 Main St",
+            vendor_code="TEST123",
+        )
+        self.other = Vendor.objects.create(
+            name="Other Vendor",
+            contact_details="1234567890",
+            address="456 Elm St",
+            vendor_code="OTHER123",
+        )
+        now = timezone.now()
+        for vendor, status, rating, delay in [
+            (self.vendor, "completed", 4.0, 1),
+            (self.vendor, "completed", None, 20),
+            (self.vendor, "pending", None, 1),
+            (self.other, "completed", 5.0, 1),
+        ]:
+            po = PurchaseOrder.objects.create(
+                vendor=vendor,
+                order_date=now,
+                delivery_date=now + timedelta(days=delay),
+                items={},
+                quantity=1,
+                status=status,
+                quality_rating=rating,
+            )
+            PurchaseOrder.objects.filter(pk=po.pk).update(
+                acknowledgment_date=po.issue_date + timedelta(hours=36)
+            )
+
+    def test_single_vendor_in_one_aggregate(self):
+        # The aggregate and the archived rollup lookup.
+        with self.assertNumQueries(2):
+            metrics = compute_vendor_metrics(self.vendor)
+        self.assertEqual(metrics.total_pos, 3)
+        self.assertEqual(metrics.completed_pos, 2)
+        self.assertAlmostEqual(metrics.fulfillment_rate, 200 / 3)
+        self.assertEqual(metrics.on_time_delivery_rate, 50.0)
+        self.assertEqual(metrics.quality_rating_avg, 4.0)
+        self.assertAlmostEqual(metrics.average_response_time, 1.5)
+
+    def test_queryset_grouped_by_vendor(self):
+        Vendor.objects.create(
+            name="Idle Vendor",
+            contact_details="1234567890",
+            address="789 Oak St",
+            vendor_code="IDLE123",
+        )
+        # The grouped aggregate and the archived rollups.
+        with self.assertNumQueries(2):
+            by_vendor = compute_metrics_by_vendor(Vendor.objects.all())
+        self.assertEqual(set(by_vendor), {self.vendor.pk, self.other.pk})
+        self.assertEqual(by_vendor[self.vendor.pk], compute_vendor_metrics(self.vendor))
+        self.assertEqual(by_vendor[self.other.pk].quality_rating_avg, 5.0)
+        self.assertEqual(VendorMetrics(0).fulfillment_rate, 0.0)
+
+    def test_recompute_chunk(self):
+        vendor_ids = [self.vendor.pk, self.other.pk]
+        # setUp acknowledged the purchase orders with update(), bypassing the
+        # counters.
+        self.assertEqual(len(recompute_chunk(vendor_ids).changes), 2)
+        Vendor.objects.filter(pk=self.vendor.pk).update(
+            total_pos=9, fulfillment_rate=10.0
+        )
+        result = recompute_chunk(vendor_ids, dry_run=True)
+        self.assertEqual(result.vendors, 2)
+        self.assertEqual(
+            result.changes,
+            {
+                self.vendor.pk: {
+                    "total_pos": (9, 3),
+                    "fulfillment_rate": (10.0, 2 / 3 * 100),
+                }
+            },
+        )
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_pos, 9)
+
+        # Lock and read, aggregate, rollups and one UPDATE, within a savepoint.
+        with self.assertNumQueries(6):
+            result = recompute_chunk(vendor_ids)
+        self.assertEqual(list(result.changes), [self.vendor.pk])
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_pos, 3)
+        self.assertEqual(recompute_chunk(vendor_ids).changes, {})
+
+    def test_recompute_command(self):
+        recompute_chunk([self.vendor.pk, self.other.pk])
+        Vendor.objects.filter(pk=self.other.pk).update(quality_rating_avg=1.0)
+        stdout = StringIO()
+        call_command(
+            "recompute_vendor_metrics", "--dry-run", "--chunk-size", "1", stdout=stdout
+        )
+        output = stdout.getvalue()
+        self.assertIn("Recomputing 2 vendor(s) in 2 chunk(s) with 1 worker(s).", output)
+        self.assertIn(
+            f"Vendor {self.other.pk}:\n  quality_rating_avg: 1 -> 5\n", output
+        )
+        self.assertIn("Dry run: 1 of 2 vendor(s) would change", output)
+
+        stdout = StringIO()
+        call_command(
+            "recompute_vendor_metrics", "--vendor", str(self.other.pk), stdout=stdout
+        )
+        self.assertIn("Recomputed 1 vendor(s), 1 changed", stdout.getvalue())
+        self.other.refresh_from_db()
+        self.assertEqual(self.other.quality_rating_avg, 5.0)
+
+        with self.assertRaises(CommandError):
+            call_command("recompute_vendor_metrics", "--workers", "0")
+
+
+@override_settings(VENDOR_METRICS_DEFERRED=True)
+class DeferredMetricsTestCase(TestCase):
+    def setUp(self):
+        self.vendor = Vendor.objects.create(
+            name="Test Vendor",
+            contact_details="1234567890",
+            address="123 Main St",
+            vendor_code="TEST123",
+        )
+
+    def test_writes_are_queued_and_coalesced(self):
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for _ in range(5):
+                    PurchaseOrder.objects.create(
+                        vendor=self.vendor,
+                        order_date=now,
+                        delivery_date=now,
+                        items={},
+                        quantity=1,
+                        status="completed",
+                    )
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_pos, 0)
+        self.assertEqual(VendorMetricsQueue.objects.count(), 1)
+
+        with self.assertNumQueries(8):
+            self.assertEqual(process_queue(), 1)
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_pos, 5)
+        self.assertEqual(self.vendor.fulfillment_rate, 100.0)
+        self.assertFalse(VendorMetricsQueue.objects.exists())
+
+    def test_rolled_back_writes_are_not_queued(self):
+        other = Vendor.objects.create(
+            name="Other Vendor",
+            contact_details="1234567890",
+            address="456 Elm St",
+            vendor_code="OTHER123",
+        )
+        now = timezone.now()
+
+        def create_po(vendor):
+            PurchaseOrder.objects.create(
+                vendor=vendor, order_date=now, delivery_date=now, items={}, quantity=1
+            )
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                for _ in range(3):
+                    create_po(self.vendor)
+                try:
+                    with transaction.atomic():
+                        create_po(other)
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+        # One flush for the transaction, the rolled back savepoint's is dropped.
+        pending = [
+            callback for callback in callbacks if isinstance(callback, PendingVendors)
+        ]
+        self.assertEqual(len(pending), 1)
+        self.assertEqual(
+            list(VendorMetricsQueue.objects.values_list("vendor_id", flat=True)),
+            [self.vendor.pk],
+        )
+
+    def test_deleting_a_vendor_queues_nothing(self):
+        now = timezone.now()
+        purchase_orders = [
+            PurchaseOrder.objects.create(
+                vendor=self.vendor,
+                order_date=now,
+                delivery_date=now,
+                items={},
+                quantity=1,
+            )
+            for _ in range(2)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                # Marked before the vendor goes, then dropped on flush.
+                purchase_orders[0].delete()
+                self.vendor.delete()
+        self.assertFalse(VendorMetricsQueue.objects.exists())
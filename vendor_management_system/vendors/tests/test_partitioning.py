@@ -0,0 +1,129 @@
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.test import SimpleTestCase, TestCase
+
+from vendors.partitioning import TableLayout, layout_statements, with_partition_key
+
+TABLE = "vendors_purchaseorder"
+
+LAYOUT = TableLayout(
+    constraints=[
+        ("vendors_purchaseorder_pkey", "p", "PRIMARY KEY (id)"),
+        ("vendors_purchaseorder_po_number_key", "u", "UNIQUE (po_number)"),
+        (
+            "vendors_purchaseorder_vendor_id_fk",
+            "f",
+            "FOREIGN KEY (vendor_id) REFERENCES vendors_vendor(id) "
+            "DEFERRABLE INITIALLY DEFERRED",
+        ),
+    ],
+    indexes=[
+        (
+            "po_vendor_status_idx",
+            "CREATE INDEX po_vendor_status_idx ON public.vendors_purchaseorder "
+            "USING btree (vendor_id, status)",
+        ),
+    ],
+)
+
+
+# The SQL is checked here; running it needs the postgresql database profile.
+class PartitionStatementsTestCase(SimpleTestCase):
+    def test_partition_single_table(self):
+        statements = layout_statements(TABLE, LAYOUT, 4)
+        self.assertIn(
+            'CREATE TABLE "vendors_purchaseorder" (LIKE '
+            '"vendors_purchaseorder_previous" INCLUDING DEFAULTS INCLUDING '
+            "CONSTRAINTS INCLUDING IDENTITY INCLUDING GENERATED) "
+            'PARTITION BY HASH ("vendor_id")',
+            statements,
+        )
+        self.assertIn(
+            'CREATE TABLE "vendors_purchaseorder_p3" PARTITION OF '
+            '"vendors_purchaseorder" FOR VALUES WITH (MODULUS 4, REMAINDER 3)',
+            statements,
+        )
+        self.assertIn(
+            'ALTER TABLE "vendors_purchaseorder" ADD CONSTRAINT '
+            '"vendors_purchaseorder_pkey" PRIMARY KEY (id, vendor_id)',
+            statements,
+        )
+        self.assertIn(
+            'ALTER TABLE "vendors_purchaseorder" ADD CONSTRAINT '
+            '"vendors_purchaseorder_po_number_key" UNIQUE (po_number, vendor_id)',
+            statements,
+        )
+        self.assertIn(LAYOUT.indexes[0][1], statements)
+        # Rows are copied before the constraints and indexes are built.
+        copy = statements.index(
+            'INSERT INTO "vendors_purchaseorder" SELECT * FROM '
+            '"vendors_purchaseorder_previous"'
+        )
+        self.assertLess(copy, statements.index(LAYOUT.indexes[0][1]))
+        self.assertTrue(statements[-2].startswith("SELECT setval("))
+
+    def test_merge_partitions(self):
+        layout = TableLayout(
+            partitions=["vendors_purchaseorder_p0", "vendors_purchaseorder_p1"],
+            constraints=[("pkey", "p", "PRIMARY KEY (id, vendor_id)")],
+        )
+        statements = layout_statements(TABLE, layout, 0)
+        self.assertIn(
+            'ALTER TABLE "vendors_purchaseorder_p1" RENAME TO '
+            '"vendors_purchaseorder_p1_previous"',
+            statements,
+        )
+        self.assertFalse(any("PARTITION" in statement for statement in statements))
+        self.assertIn(
+            'ALTER TABLE "vendors_purchaseorder" ADD CONSTRAINT "pkey" '
+            "PRIMARY KEY (id)",
+            statements,
+        )
+
+    def test_repartition_partitioned_table(self):
+        layout = TableLayout(
+            partitions=["vendors_purchaseorder_p0", "vendors_purchaseorder_p1"],
+            constraints=[("pkey", "p", "PRIMARY KEY (id, vendor_id)")],
+            indexes=[
+                (
+                    "po_vendor_status_idx",
+                    "CREATE INDEX po_vendor_status_idx ON ONLY "
+                    "public.vendors_purchaseorder USING btree (vendor_id, status)",
+                ),
+            ],
+        )
+        statements = layout_statements(TABLE, layout, 4)
+        self.assertIn(
+            'ALTER TABLE "vendors_purchaseorder_p0" RENAME TO '
+            '"vendors_purchaseorder_p0_previous"',
+            statements,
+        )
+        self.assertIn(
+            'ALTER TABLE "vendors_purchaseorder" ADD CONSTRAINT "pkey" '
+            "PRIMARY KEY (id, vendor_id)",
+            statements,
+        )
+        # The index is built on every partition, not only on the parent.
+        self.assertIn(
+            "CREATE INDEX po_vendor_status_idx ON public.vendors_purchaseorder "
+            "USING btree (vendor_id, status)",
+            statements,
+        )
+        self.assertFalse(any("ON ONLY" in statement for statement in statements))
+
+    def test_with_partition_key(self):
+        self.assertEqual(
+            with_partition_key("UNIQUE (po_number) DEFERRABLE", True),
+            "UNIQUE (po_number, vendor_id) DEFERRABLE",
+        )
+        self.assertEqual(
+            with_partition_key("PRIMARY KEY (id, vendor_id)", True),
+            "PRIMARY KEY (id, vendor_id)",
+        )
+
+
+class PartitionCommandTestCase(TestCase):
+    def test_requires_postgresql(self):
+        with self.assertRaisesMessage(CommandError, "postgresql"):
+            call_command("partition_purchase_orders", "--dry-run", stdout=StringIO())
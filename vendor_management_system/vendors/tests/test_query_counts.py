@@ -0,0 +1,97 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from vendors.models import Vendor, PurchaseOrder
+
+
+# Pins the number of SQL statements of the purchase order write paths. Inside
+# the test transaction the writes open no savepoint of their own.
+class PurchaseOrderQueryCountTestCase(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="user")
+        self.client.force_authenticate(self.user)
+        self.vendor = Vendor.objects.create(
+            name="Test Vendor",
+            contact_details="1234567890",
+            address="123 Main St",
+            vendor_code="TEST123",
+        )
+        self.purchase_order = PurchaseOrder.objects.create(
+            vendor=self.vendor,
+            order_date=timezone.now(),
+            delivery_date=timezone.now(),
+            items={},
+            quantity=10,
+        )
+
+    def test_create_purchase_order(self):
+        # INSERT, vendor metrics SELECT and UPDATE
+        with self.assertNumQueries(3):
+            PurchaseOrder.objects.create(
+                vendor=self.vendor,
+                order_date=timezone.now(),
+                delivery_date=timezone.now(),
+                items={},
+                quantity=10,
+            )
+
+    def test_update_without_metric_change_skips_vendor_write(self):
+        purchase_order = PurchaseOrder.objects.get(pk=self.purchase_order.pk)
+        purchase_order.quantity = 20
+        # UPDATE
+        with self.assertNumQueries(1):
+            purchase_order.save()
+
+    def test_complete_purchase_order(self):
+        purchase_order = PurchaseOrder.objects.get(pk=self.purchase_order.pk)
+        purchase_order.status = "completed"
+        purchase_order.quality_rating = 4.0
+        # UPDATE, vendor metrics SELECT and UPDATE
+        with self.assertNumQueries(3):
+            purchase_order.save()
+
+    def test_create_purchase_order_endpoint(self):
+        data = {
+            "vendor": self.vendor.pk,
+            "order_date": "2024-04-30T00:00:00Z",
+            "delivery_date": "2024-05-05T00:00:00Z",
+            "items": {},
+            "quantity": 5,
+        }
+        # vendor lookup, then the 3 statements of a create
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                reverse("purchase-order-list-create"), data, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_update_purchase_order_endpoint(self):
+        data = {
+            "vendor": self.vendor.pk,
+            "order_date": "2024-04-30T00:00:00Z",
+            "delivery_date": "2024-05-05T00:00:00Z",
+            "items": {},
+            "quantity": 5,
+            "status": "completed",
+        }
+        url = reverse(
+            "purchase-order-retrieve-update-destroy",
+            kwargs={"pk": self.purchase_order.pk},
+        )
+        # PO and vendor lookups, then the 3 statements of a metric-changing save
+        with self.assertNumQueries(5):
+            response = self.client.put(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_acknowledge_purchase_order_endpoint(self):
+        url = reverse(
+            "acknowledge-purchase-order", kwargs={"pk": self.purchase_order.pk}
+        )
+        # PO lookup and UPDATE: pending POs don't count towards the response
+        # time so the vendor row is left alone.
+        with self.assertNumQueries(2):
+            response = self.client.put(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
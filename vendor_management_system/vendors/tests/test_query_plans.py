@@ -0,0 +1,109 @@
+from django.db.models import Sum
+from django.test import TestCase
+from django.utils import timezone
+
+from vendors.conditional import LIST_VERSION
+from vendors.metrics import metrics_queryset
+from vendors.models import (
+    Vendor,
+    PurchaseOrder,
+    PurchaseOrderLineItem,
+    HistoricalPerfomance,
+    VendorMetricsQueue,
+)
+from vendors.tests.query_plans import QueryPlanAssertionsMixin
+
+
+# Every hot query must be answered from an index, see query_plans.py.
+class HotQueryPlanTestCase(QueryPlanAssertionsMixin, TestCase):
+    def setUp(self):
+        self.vendor = Vendor.objects.create(
+            name="Test Vendor",
+            contact_details="1234567890",
+            address="123 Main St",
+            vendor_code="TEST123",
+        )
+
+    def test_vendor_metrics_aggregate(self):
+        self.assertUsesIndex(
+            metrics_queryset(Vendor.objects.filter(pk=self.vendor.pk)),
+            allowed_scans=["vendors_vendor"],
+        )
+        self.assertUsesIndex(
+            PurchaseOrder.objects.filter(vendor=self.vendor)
+            .values("vendor_id")
+            .order_by("vendor_id")
+        )
+
+    def test_metric_predicates(self):
+        completed = PurchaseOrder.objects.filter(vendor=self.vendor, status="completed")
+        self.assertUsesIndex(completed)
+        self.assertUsesIndex(
+            completed.filter(quality_rating__isnull=False).values("quality_rating")
+        )
+        self.assertUsesIndex(
+            completed.filter(acknowledgment_date__isnull=False).values(
+                "acknowledgment_date", "issue_date"
+            )
+        )
+
+    def test_purchase_order_pages(self):
+        now = timezone.now()
+        self.assertUsesIndex(
+            PurchaseOrder.objects.filter(vendor=self.vendor).order_by("issue_date", "id")[
+                :101
+            ]
+        )
+        self.assertUsesIndex(
+            PurchaseOrder.objects.filter(issue_date__gt=now).order_by("issue_date", "id")[
+                :101
+            ]
+        )
+
+    def test_purchase_order_list_version(self):
+        self.assertUsesIndex(
+            PurchaseOrder.objects.filter(vendor=self.vendor)
+            .values("vendor_id")
+            .annotate(**LIST_VERSION)
+            .order_by()
+        )
+
+    def test_sku_lookups(self):
+        line_items = PurchaseOrderLineItem.objects.filter(sku="A1")
+        self.assertUsesIndex(
+            line_items.values("vendor_id").annotate(Sum("quantity")).order_by()
+        )
+        self.assertUsesIndex(
+            PurchaseOrder.objects.filter(
+                pk__in=line_items.filter(vendor=self.vendor).values("purchase_order_id")
+            ).order_by("issue_date", "id")[:101]
+        )
+
+    def test_performance_history_range(self):
+        self.assertUsesIndex(
+            HistoricalPerfomance.objects.filter(
+                vendor=self.vendor, date__gte=timezone.now()
+            )
+        )
+
+    def test_vendor_rankings(self):
+        vendors = Vendor.objects.filter(total_pos__gte=10)
+        for order in [
+            ("-performance_score", "id"),
+            ("-on_time_delivery_rate", "id"),
+            ("-quality_rating_avg", "id"),
+            ("-fulfillment_rate", "id"),
+        ]:
+            self.assertUsesIndex(vendors.order_by(*order)[:10])
+        self.assertUsesIndex(
+            vendors.filter(response_time_count__gt=0).order_by(
+                "average_response_time", "id"
+            )[:10]
+        )
+
+    def test_metrics_queue(self):
+        self.assertUsesIndex(
+            VendorMetricsQueue.objects.filter(queued_at__lte=timezone.now()).order_by(
+                "queued_at"
+            )
+        )
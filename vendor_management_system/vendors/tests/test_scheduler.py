@@ -0,0 +1,245 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from vendors import jobs
+from vendors.cache import performance_cache
+from vendors.models import HistoricalPerfomance, PurchaseOrder, ScheduledJob, Vendor
+from vendors.scheduler import CronTrigger, Scheduler, claim_job, run_job, sync_jobs
+
+
+def failing_task():
+    raise RuntimeError("boom")
+
+
+def at(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class CronTriggerTestCase(TestCase):
+    def test_next_after(self):
+        for expression, moment, expected in [
+            ("55 23 * * *", at(2026, 10, 18, 12), at(2026, 10, 18, 23, 55)),
+            ("55 23 * * *", at(2026, 10, 18, 23, 55), at(2026, 10, 19, 23, 55)),
+            # Friday evening to Monday morning.
+            ("*/15 9-17 * * 1-5", at(2026, 10, 16, 17, 50), at(2026, 10, 19, 9)),
+            ("5/20 * * * *", at(2026, 10, 18, 12, 30), at(2026, 10, 18, 12, 45)),
+            # Either the first of the month or a Sunday.
+            ("0 0 1 * 0", at(2026, 10, 19), at(2026, 10, 25)),
+            ("0 0 1 * 7", at(2026, 10, 26), at(2026, 11, 1)),
+            ("0 12 29 2 *", at(2026, 3, 1), at(2028, 2, 29, 12)),
+        ]:
+            with self.subTest(expression, moment=moment):
+                self.assertEqual(
+                    CronTrigger.parse(expression).next_after(moment), expected
+                )
+
+    def test_invalid_expressions(self):
+        for expression in ["* * * *", "60 * * * *", "0 0 0 * *", "5-1 * * * *", "x"]:
+            with self.subTest(expression), self.assertRaises(ValueError):
+                CronTrigger.parse(expression)
+        with self.assertRaises(ValueError):
+            CronTrigger.parse("0 0 31 2 *").next_after(at(2026, 1, 1))
+
+
+@override_settings(SCHEDULER_JOBS={}, SCHEDULER_LOCK_TIMEOUT=60)
+class SchedulerTestCase(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.job = ScheduledJob.objects.create(
+            name="failing",
+            task="vendors.tests.test_scheduler.failing_task",
+            interval_seconds=300,
+            next_run_at=self.now - timedelta(seconds=1),
+        )
+
+    def test_sync_jobs(self):
+        definitions = {
+            "snapshot": {
+                "task": "vendors.jobs.snapshot_vendor_kpis",
+                "cron": "0 1 * * *",
+            }
+        }
+        sync_jobs(definitions, now=at(2026, 10, 18, 12))
+        job = ScheduledJob.objects.get(name="snapshot")
+        self.assertEqual(job.next_run_at, at(2026, 10, 19, 1))
+
+        # An unchanged definition keeps the schedule and the stats.
+        ScheduledJob.objects.filter(pk=job.pk).update(run_count=3)
+        sync_jobs(definitions, now=at(2026, 10, 18, 13))
+        job.refresh_from_db()
+        self.assertEqual((job.next_run_at, job.run_count), (at(2026, 10, 19, 1), 3))
+
+        definitions["snapshot"] = {
+            "task": "vendors.jobs.snapshot_vendor_kpis",
+            "interval": 60,
+        }
+        sync_jobs(definitions, now=at(2026, 10, 18, 13))
+        job.refresh_from_db()
+        self.assertEqual((job.cron, job.interval_seconds), ("", 60))
+        self.assertEqual(job.next_run_at, at(2026, 10, 18, 13, 1))
+        self.assertEqual(job.run_count, 3)
+
+        # Removed from the settings: disabled, unlike the jobs of the admin.
+        sync_jobs({}, now=at(2026, 10, 18, 14))
+        job.refresh_from_db()
+        self.assertEqual((job.enabled, job.run_count), (False, 3))
+        self.job.refresh_from_db()
+        self.assertTrue(self.job.enabled)
+
+        with self.assertRaises(ValueError):
+            sync_jobs({"broken": {"task": "vendors.jobs.snapshot_vendor_kpis"}})
+
+    def test_one_node_claims_a_run(self):
+        self.assertTrue(claim_job(self.job, "node-a", self.now))
+        self.assertFalse(claim_job(self.job, "node-b", self.now))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.locked_by, "node-a")
+        self.assertEqual(self.job.next_run_at, self.now + timedelta(seconds=300))
+
+        # A lock left by a dead node expires, then the next due run is claimable.
+        later = self.now + timedelta(seconds=301)
+        self.assertTrue(claim_job(self.job, "node-b", later))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.locked_by, "node-b")
+
+        # The expired owner finishing late does not release the new lock.
+        with self.assertLogs("vendors.scheduler", "ERROR"):
+            run_job(self.job, "node-a")
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.locked_by, "node-b")
+
+    def test_run_stats(self):
+        scheduler = Scheduler("node")
+        with self.assertLogs("vendors.scheduler", "ERROR"):
+            self.assertEqual(scheduler.run_pending(), [self.job])
+        # Not due again until the next run.
+        self.assertEqual(scheduler.run_pending(), [])
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.last_status, "failed")
+        self.assertIn("RuntimeError: boom", self.job.last_error)
+        self.assertEqual((self.job.run_count, self.job.failure_count), (1, 1))
+        self.assertEqual(self.job.locked_until, None)
+
+        self.job.task = "vendors.jobs.warm_vendor_performance"
+        self.job.save()
+        self.assertTrue(scheduler.run_now(self.job))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.last_status, "succeeded")
+        self.assertEqual(
+            self.job.last_result, "Warmed the performance payloads of 0 vendor(s)."
+        )
+        self.assertEqual((self.job.run_count, self.job.failure_count), (2, 1))
+        self.assertAlmostEqual(self.job.average_runtime, self.job.total_runtime / 2)
+        self.assertGreaterEqual(self.job.max_runtime, self.job.last_runtime)
+
+    def test_new_jobs_are_scheduled(self):
+        job = ScheduledJob.objects.create(
+            name="new", task="vendors.jobs.snapshot_vendor_kpis", cron="0 1 * * *"
+        )
+        self.assertEqual(Scheduler("node").claim_due_jobs(), [self.job])
+        job.refresh_from_db()
+        self.assertGreater(job.next_run_at, self.now)
+
+    def test_database_errors_do_not_stop_the_scheduler(self):
+        stop, polls = threading.Event(), []
+
+        def run_pending(executor):
+            polls.append(executor)
+            if len(polls) == 1:
+                raise OperationalError("server closed the connection")
+            stop.set()
+            return []
+
+        scheduler = Scheduler("node", poll_interval=0.01)
+        with mock.patch.object(
+            scheduler, "run_pending", side_effect=run_pending
+        ), mock.patch("vendors.scheduler.close_old_connections") as close:
+            with self.assertLogs("vendors.scheduler", "ERROR"):
+                scheduler.run(stop)
+        self.assertEqual((len(polls), close.call_count), (2, 2))
+
+
+@override_settings(
+    SCHEDULER_JOBS={
+        "snapshot_vendor_kpis": {
+            "task": "vendors.jobs.snapshot_vendor_kpis",
+            "cron": "55 23 * * *",
+        },
+        "warm_vendor_performance": {
+            "task": "vendors.jobs.warm_vendor_performance",
+            "interval": 240,
+        },
+    }
+)
+class ScheduledTasksTestCase(TestCase):
+    def setUp(self):
+        self.vendors = [
+            Vendor.objects.create(
+                name=f"Vendor {name}",
+                contact_details="1234567890",
+                address="123 Main St",
+                vendor_code=f"TEST-{name}",
+            )
+            for name in "AB"
+        ]
+        now = timezone.now()
+        PurchaseOrder.objects.create(
+            vendor=self.vendors[0],
+            order_date=now,
+            delivery_date=now,
+            items={},
+            quantity=1,
+            status="completed",
+        )
+        performance_cache.backend.clear()
+
+    def test_scheduler_command(self):
+        stdout = StringIO()
+        call_command(
+            "run_scheduler",
+            "--run=snapshot_vendor_kpis",
+            "--run=warm_vendor_performance",
+            stdout=stdout,
+        )
+        self.assertIn("Stored day snapshots for 2 vendor(s).", stdout.getvalue())
+        snapshot = HistoricalPerfomance.objects.get(vendor=self.vendors[0])
+        self.assertEqual(snapshot.fulfillment_rate, 100.0)
+
+        # The warmed payloads are served as they would have been computed.
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user("user"))
+        payloads = [performance_cache.get(vendor.pk)[0] for vendor in self.vendors]
+        performance_cache.backend.clear()
+        for vendor, payload in zip(self.vendors, payloads):
+            url = reverse("vendor-performance", args=[vendor.pk])
+            self.assertEqual(client.get(url).json(), payload)
+
+        stdout = StringIO()
+        call_command("run_scheduler", "--list", stdout=stdout)
+        listing = stdout.getvalue()
+        self.assertIn("snapshot_vendor_kpis (55 23 * * *, enabled)", listing)
+        self.assertIn("runs: 1, failures: 0", listing)
+
+    def test_warming_skips_vendors_written_meanwhile(self):
+        compute_metrics_by_vendor = jobs.compute_metrics_by_vendor
+
+        # A purchase order write commits while the chunk is being computed.
+        def concurrent_write(vendors):
+            Vendor.objects.filter(pk=self.vendors[0].pk).update(total_pos=2)
+            return compute_metrics_by_vendor(vendors)
+
+        with mock.patch.object(jobs, "compute_metrics_by_vendor", concurrent_write):
+            result = jobs.warm_vendor_performance()
+        self.assertEqual(result, "Warmed the performance payloads of 1 vendor(s).")
+        self.assertIsNone(performance_cache.get(self.vendors[0].pk))
+        self.assertIsNotNone(performance_cache.get(self.vendors[1].pk))
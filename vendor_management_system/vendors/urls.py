@@ -3,12 +3,32 @@ from .views import (
     VendorListCreateAPIView,
     VendorRetrieveUpdateDestroyAPIView,
     PurchaseOrderListCreateAPIView,
+    PurchaseOrderBulkCreateAPIView,
+    PurchaseOrderBulkAcknowledgeAPIView,
+    PurchaseOrderBulkCompleteAPIView,
+    PurchaseOrderExportAPIView,
+    VendorScorecardExportAPIView,
     PurchaseOrderRetrieveUpdateDestroyAPIView,
     VendorPerformanceAPIView,
+    PerformanceCacheStatsAPIView,
+    VendorPerformanceHistoryAPIView,
+    VendorRankingAPIView,
+    RequestMetricsAPIView,
     MyObtainTokenPairView,
     LogoutView,
     AcknowledgePurchaseOrderAPIView,
     PurchaseOrderByVendorAPIView,
+    PurchaseOrderSkuSummaryAPIView,
+    PurchaseOrderByNumberAPIView,
+    ResponseTimeAnalyticsAPIView,
+    OnTimeHistogramAnalyticsAPIView,
+    MonthlyCohortAnalyticsAPIView,
+)
+from .async_views import (
+    AsyncVendorListAPIView,
+    AsyncVendorRetrieveAPIView,
+    AsyncPurchaseOrderByVendorAPIView,
+    AsyncVendorPerformanceAPIView,
 )
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -25,6 +45,12 @@ urlpatterns = [
     path("logout/", LogoutView.as_view(), name="auth_logout"),
     # URLs for managing vendors
     path("vendors/", VendorListCreateAPIView.as_view(), name="vendor-list-create"),
+    path(
+        "vendors/export/",
+        VendorScorecardExportAPIView.as_view(),
+        name="vendor-scorecard-export",
+    ),
+    path("vendors/ranking/", VendorRankingAPIView.as_view(), name="vendor-ranking"),
     path(
         "vendors/<int:pk>/",
         VendorRetrieveUpdateDestroyAPIView.as_view(),
@@ -36,6 +62,26 @@ urlpatterns = [
         PurchaseOrderListCreateAPIView.as_view(),
         name="purchase-order-list-create",
     ),
+    path(
+        "purchase_orders/bulk/",
+        PurchaseOrderBulkCreateAPIView.as_view(),
+        name="purchase-order-bulk-create",
+    ),
+    path(
+        "purchase_orders/acknowledge/bulk/",
+        PurchaseOrderBulkAcknowledgeAPIView.as_view(),
+        name="purchase-order-bulk-acknowledge",
+    ),
+    path(
+        "purchase_orders/complete/bulk/",
+        PurchaseOrderBulkCompleteAPIView.as_view(),
+        name="purchase-order-bulk-complete",
+    ),
+    path(
+        "purchase_orders/export/",
+        PurchaseOrderExportAPIView.as_view(),
+        name="purchase-order-export",
+    ),
     path(
         "purchase_orders/<int:pk>/",
         PurchaseOrderRetrieveUpdateDestroyAPIView.as_view(),
@@ -47,16 +93,73 @@ urlpatterns = [
         PurchaseOrderByVendorAPIView.as_view(),
         name="purchase-order-by-vendor",
     ),
+    # Totals of one SKU over the purchase order line items
+    path(
+        "purchase_orders/skus/<str:sku>/",
+        PurchaseOrderSkuSummaryAPIView.as_view(),
+        name="purchase-order-sku-summary",
+    ),
+    # Purchase order by number, including the archived ones
+    path(
+        "purchase_orders/number/<str:po_number>/",
+        PurchaseOrderByNumberAPIView.as_view(),
+        name="purchase-order-by-number",
+    ),
     # URL for retrieving vendor performance metrics
     path(
         "vendors/<int:pk>/performance/",
         VendorPerformanceAPIView.as_view(),
         name="vendor-performance",
     ),
+    path(
+        "vendors/performance/cache_stats/",
+        PerformanceCacheStatsAPIView.as_view(),
+        name="vendor-performance-cache-stats",
+    ),
+    path(
+        "vendors/<int:pk>/performance/history/",
+        VendorPerformanceHistoryAPIView.as_view(),
+        name="vendor-performance-history",
+    ),
     # URL for acknowledging purchase orders
     path(
         "purchase_orders/<int:pk>/acknowledge/",
         AcknowledgePurchaseOrderAPIView.as_view(),
         name="acknowledge-purchase-order",
     ),
+    # Fleet-wide KPI distributions, computed with numpy
+    path(
+        "analytics/response_times/",
+        ResponseTimeAnalyticsAPIView.as_view(),
+        name="analytics-response-times",
+    ),
+    path(
+        "analytics/on_time_histogram/",
+        OnTimeHistogramAnalyticsAPIView.as_view(),
+        name="analytics-on-time-histogram",
+    ),
+    path(
+        "analytics/cohorts/",
+        MonthlyCohortAnalyticsAPIView.as_view(),
+        name="analytics-cohorts",
+    ),
+    # Request metrics of the instrumentation middleware, for Prometheus
+    path("_metrics/", RequestMetricsAPIView.as_view(), name="request-metrics"),
+    # Async variants of the read endpoints, served on the event loop under ASGI
+    path("async/vendors/", AsyncVendorListAPIView.as_view(), name="async-vendor-list"),
+    path(
+        "async/vendors/<int:pk>/",
+        AsyncVendorRetrieveAPIView.as_view(),
+        name="async-vendor-retrieve",
+    ),
+    path(
+        "async/vendors/<int:pk>/performance/",
+        AsyncVendorPerformanceAPIView.as_view(),
+        name="async-vendor-performance",
+    ),
+    path(
+        "async/purchase_orders/by_vendor/<int:vendor_id>/",
+        AsyncPurchaseOrderByVendorAPIView.as_view(),
+        name="async-purchase-order-by-vendor",
+    ),
 ]
@@ -1,16 +1,238 @@
 from rest_framework import generics, permissions
-from .models import Vendor, PurchaseOrder
+from .models import Vendor, PurchaseOrder, PurchaseOrderLineItem
 from rest_framework_simplejwt.views import TokenObtainPairView
 from .serializers import (
     VendorSerializer,
     PurchaseOrderSerializer,
+    PurchaseOrderBulkSerializer,
+    PurchaseOrderBulkAcknowledgeSerializer,
+    PurchaseOrderBulkCompleteSerializer,
+    PerformanceHistorySerializer,
     MyTokenObtainPairSerializer,
 )
+from .parsers import NDJSONParser
+from rest_framework.parsers import JSONParser
+from django.conf import settings
+from django.db.models import Avg
+from django.db.models.functions import TruncDay, TruncWeek, TruncMonth
+from django.shortcuts import get_object_or_404
+from rest_framework import serializers
+from .models import HistoricalPerfomance
+from .pagination import KeysetPagination
+from .export import (
+    EXPORT_FORMATS,
+    PURCHASE_ORDER_EXPORT_FIELDS,
+    VENDOR_SCORECARD_FIELDS,
+    iter_purchase_order_rows,
+    iter_vendor_scorecard_rows,
+    stream_rows,
+)
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.http import parse_etags
+from rest_framework.negotiation import DefaultContentNegotiation
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
+from .metrics import compute_vendor_metrics
+from .cache import performance_cache
+from .authentication import revoked_tokens
+from .instrumentation import PROMETHEUS_CONTENT_TYPE, request_metrics
+from .fast_serializers import values_serializer
+from .conditional import LIST_VERSION, Validators, row_version
+from .line_items import sku_summary
+from . import analytics
+from .archive import find_archived_purchase_order
+from rest_framework.exceptions import APIException, NotFound
+
+
+DATETIME_PARAM_FIELD = serializers.DateTimeField(
+    input_formats=["iso-8601", "%Y-%m-%d"]
+)
+
+
+def get_datetime_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        return DATETIME_PARAM_FIELD.run_validation(value)
+    except serializers.ValidationError as exc:
+        raise serializers.ValidationError({name: exc.detail})
+
+
+def get_int_param(request, name, default, minimum=None, maximum=None):
+    value = request.query_params.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise serializers.ValidationError({name: ["A valid integer is required."]})
+    if minimum is not None and value < minimum:
+        raise serializers.ValidationError(
+            {name: [f"Ensure this value is greater than or equal to {minimum}."]}
+        )
+    if maximum is not None:
+        value = min(value, maximum)
+    return value
+
+
+def get_vendor_param(request):
+    vendor = request.query_params.get("vendor")
+    if vendor and not vendor.isdigit():
+        raise serializers.ValidationError({"vendor": ["Must be a vendor id."]})
+    return int(vendor) if vendor else None
+
+
+def get_status_param(request):
+    value = request.query_params.get("status")
+    choices = [choice for choice, _ in PurchaseOrder.STATUS_CHOICES]
+    if value and value not in choices:
+        raise serializers.ValidationError(
+            {"status": [f"Must be one of: {', '.join(choices)}."]}
+        )
+    return value or None
+
+
+# ``?vendor=``, ``?status=`` and ``?sku=`` filters of purchase order querysets.
+# The SKU is matched through the line item index, as a semi-join on its
+# (sku, vendor) index rather than a scan of the items JSON.
+def filter_purchase_orders(request, queryset):
+    vendor = get_vendor_param(request)
+    if vendor is not None:
+        queryset = queryset.filter(vendor_id=vendor)
+    status_value = get_status_param(request)
+    if status_value:
+        queryset = queryset.filter(status=status_value)
+    sku = request.query_params.get("sku")
+    if sku:
+        line_items = PurchaseOrderLineItem.objects.filter(sku=sku)
+        if vendor is not None:
+            line_items = line_items.filter(vendor_id=vendor)
+        queryset = queryset.filter(pk__in=line_items.values("purchase_order_id"))
+    return queryset
+
+
+def get_percentiles_param(request):
+    value = request.query_params.get("percentiles")
+    if not value:
+        return analytics.DEFAULT_PERCENTILES
+    try:
+        percentiles = tuple(float(part) for part in value.split(","))
+    except ValueError:
+        percentiles = ()
+    if not percentiles or not all(0 <= p <= 100 for p in percentiles):
+        raise serializers.ValidationError(
+            {"percentiles": ["Must be comma separated numbers from 0 to 100."]}
+        )
+    return percentiles
+
+
+class IgnoreFormatContentNegotiation(DefaultContentNegotiation):
+    # The export views use ``?format=`` for the file format, not the renderer.
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
+
+
+class SparseFieldsViewMixin:
+    # ``?fields=a,b`` narrows both the serialized fields and the selected columns.
+    fields_query_param = "fields"
+
+    def get_requested_fields(self):
+        if hasattr(self, "_requested_fields"):
+            return self._requested_fields
+        self._requested_fields = None
+        raw = self.request.query_params.get(self.fields_query_param)
+        if raw and self.request.method == "GET":
+            names = [name.strip() for name in raw.split(",") if name.strip()]
+            available = self.get_serializer_class()().fields
+            unknown = [name for name in names if name not in available]
+            if unknown:
+                raise serializers.ValidationError(
+                    {self.fields_query_param: [f"Unknown fields: {', '.join(unknown)}."]}
+                )
+            self._requested_fields = names
+        return self._requested_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_requested_fields()
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        names = self.get_requested_fields()
+        if not names:
+            return queryset
+        concrete = {field.name for field in queryset.model._meta.concrete_fields}
+        columns = {name for name in names if name in concrete}
+        columns.update(getattr(self, "keyset_ordering", ("id",)))
+        return queryset.only(*columns)
+
+
+class ValuesListMixin(SparseFieldsViewMixin):
+    # Lists through a ValuesSerializer of the serializer class: same response,
+    # without model instances and per row DRF field calls.
+    def get_values_serializer(self):
+        names = self.get_requested_fields()
+        return values_serializer(
+            self.get_serializer_class(), tuple(names) if names else None
+        )
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        rows = serializer.values(
+            self.filter_queryset(self.get_queryset()),
+            getattr(self, "keyset_ordering", ()),
+        )
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
+
+
+class ConditionalGetMixin:
+    # Answers If-None-Match and If-Modified-Since from get_validators(), a
+    # lookup of the version marker made before the full fetch, and sends the
+    # ETag and Last-Modified validators with full responses.
+    def get_validators(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+        status_code = validators.precondition_status(request)
+        if status_code:
+            return Response(status=status_code, headers=validators.headers())
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            for header, value in validators.headers().items():
+                response[header] = value
+        return response
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    # Versioned by the updated_at of the row, missing rows fall through to 404.
+    def get_validators(self):
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        updated_at = row_version(self.get_queryset(), lookup)
+        if updated_at is None:
+            return None
+        renderer_format = self.request.accepted_renderer.format
+        return Validators(self.request, renderer_format, updated_at)
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    # Versioned by MAX(updated_at) and COUNT(*) of the unpaginated queryset.
+    def get_validators(self):
+        return Validators.from_list_version(
+            self.request,
+            self.request.accepted_renderer.format,
+            self.get_queryset().aggregate(**LIST_VERSION),
+        )
 
 
 class MyObtainTokenPairView(TokenObtainPairView):
@@ -27,49 +249,224 @@ class LogoutView(APIView):
             refresh_token = request.data["refresh_token"]
             token = RefreshToken(refresh_token)
             token.blacklist()
+            # Also revoke the access token the request was made with.
+            revoked_tokens.revoke(request.auth)
             return Response(status=status.HTTP_205_RESET_CONTENT)
         except Exception as e:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
 
 # View for listing and creating vendors
-class VendorListCreateAPIView(generics.ListCreateAPIView):
+class VendorListCreateAPIView(ValuesListMixin, generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     queryset = Vendor.objects.all()
     serializer_class = VendorSerializer
+    pagination_class = KeysetPagination
 
 
 # View for retrieving, updating, and deleting vendors
-class VendorRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class VendorRetrieveUpdateDestroyAPIView(
+    ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView
+):
     permission_classes = [permissions.IsAuthenticated]
     queryset = Vendor.objects.all()
     serializer_class = VendorSerializer
 
 
 # View for listing and creating purchase orders
-class PurchaseOrderListCreateAPIView(generics.ListCreateAPIView):
+class PurchaseOrderListCreateAPIView(ValuesListMixin, generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     queryset = PurchaseOrder.objects.all()
     serializer_class = PurchaseOrderSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ("issue_date", "id")
+
+    def filter_queryset(self, queryset):
+        queryset = filter_purchase_orders(self.request, queryset)
+        return super().filter_queryset(queryset)
+
+
+# View for creating purchase orders in bulk from a JSON list or NDJSON
+class PurchaseOrderBulkCreateAPIView(generics.CreateAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = PurchaseOrderBulkSerializer
+    parser_classes = [JSONParser, NDJSONParser]
+
+    def get_batch_size(self):
+        try:
+            batch_size = int(self.request.query_params["batch_size"])
+        except (KeyError, ValueError):
+            return settings.PURCHASE_ORDER_BULK_BATCH_SIZE
+        return max(1, min(batch_size, settings.PURCHASE_ORDER_BULK_BATCH_SIZE_MAX))
+
+    def create(self, request, *args, **kwargs):
+        rows = request.data
+        vendor_ids = set()
+        if isinstance(rows, list):
+            for row in rows:
+                if isinstance(row, dict) and str(row.get("vendor", "")).isdigit():
+                    vendor_ids.add(int(row["vendor"]))
+        context = self.get_serializer_context()
+        context["vendors"] = Vendor.objects.in_bulk(vendor_ids)
+        context["batch_size"] = self.get_batch_size()
+        serializer = self.get_serializer_class()(data=rows, many=True, context=context)
+        serializer.is_valid(raise_exception=True)
+        created = serializer.save()
+        errors = serializer.row_errors
+        if not created:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif errors:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response(
+            {
+                "created": len(created),
+                "failed": len(errors),
+                "po_numbers": [po.po_number for po in created],
+                "errors": errors,
+            },
+            status=response_status,
+        )
+
+
+class PurchaseOrderBulkTransitionAPIView(generics.CreateAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    # Response key of the selected rows the transition did not apply to.
+    unchanged_key = "unchanged"
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save()
+        result[self.unchanged_key] = result.pop("unchanged")
+        not_found = result["not_found"]
+        if not_found["ids"] or not_found["po_numbers"] or result[self.unchanged_key]:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_200_OK
+        return Response(result, status=response_status)
+
+
+# View for acknowledging purchase orders in bulk
+class PurchaseOrderBulkAcknowledgeAPIView(PurchaseOrderBulkTransitionAPIView):
+    serializer_class = PurchaseOrderBulkAcknowledgeSerializer
+    unchanged_key = "already_acknowledged"
+
+
+# View for completing purchase orders in bulk
+class PurchaseOrderBulkCompleteAPIView(PurchaseOrderBulkTransitionAPIView):
+    serializer_class = PurchaseOrderBulkCompleteSerializer
+    unchanged_key = "already_completed"
+
+
+class ExportAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    content_negotiation_class = IgnoreFormatContentNegotiation
+    filename = "export"
+    fields = []
+
+    def get_rows(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.query_params.get("format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            raise serializers.ValidationError(
+                {"format": [f"Must be one of: {', '.join(EXPORT_FORMATS)}."]}
+            )
+        gzip = request.query_params.get("gzip") in ("1", "true")
+        rows = self.get_rows()
+        filename = f"{self.filename}.{export_format}"
+        if gzip:
+            filename += ".gz"
+        response = StreamingHttpResponse(
+            stream_rows(rows, self.fields, export_format, gzip=gzip),
+            content_type="application/gzip" if gzip else EXPORT_FORMATS[export_format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+# View for streaming all purchase orders as NDJSON or CSV
+class PurchaseOrderExportAPIView(ExportAPIView):
+    filename = "purchase_orders"
+    fields = PURCHASE_ORDER_EXPORT_FIELDS
+
+    def get_rows(self):
+        queryset = filter_purchase_orders(self.request, PurchaseOrder.objects.all())
+        since = get_datetime_param(self.request, "since")
+        if since:
+            queryset = queryset.filter(issue_date__gte=since)
+        return iter_purchase_order_rows(queryset)
+
+
+# View for streaming every vendor with its performance metrics
+class VendorScorecardExportAPIView(ExportAPIView):
+    filename = "vendor_scorecards"
+    fields = VENDOR_SCORECARD_FIELDS
+
+    def get_rows(self):
+        return iter_vendor_scorecard_rows()
 
 
 # View for retrieving, updating, and deleting purchase orders
-class PurchaseOrderRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class PurchaseOrderRetrieveUpdateDestroyAPIView(
+    ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView
+):
     permission_classes = [permissions.IsAuthenticated]
     queryset = PurchaseOrder.objects.all()
     serializer_class = PurchaseOrderSerializer
 
 
+# View for retrieving a purchase order by its number, from the live rows or
+# else from the archive segments, with an ``archived`` flag
+class PurchaseOrderByNumberAPIView(generics.RetrieveAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    queryset = PurchaseOrder.objects.all()
+    serializer_class = PurchaseOrderSerializer
+
+    def retrieve(self, request, po_number):
+        purchase_order = self.get_queryset().filter(po_number=po_number).first()
+        archived = purchase_order is None
+        if archived:
+            purchase_order = find_archived_purchase_order(po_number)
+            if purchase_order is None:
+                raise NotFound()
+        serializer = self.get_serializer(purchase_order)
+        return Response({**serializer.data, "archived": archived})
+
+
 # view for retrieving purchase orders by vendor
-class PurchaseOrderByVendorAPIView(generics.ListAPIView):
+class PurchaseOrderByVendorAPIView(
+    ConditionalListMixin, ValuesListMixin, generics.ListAPIView
+):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = PurchaseOrderSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ("issue_date", "id")
 
     def get_queryset(self):
         vendor_id = self.kwargs.get("vendor_id")
         return PurchaseOrder.objects.filter(vendor_id=vendor_id)
 
 
+# View for the totals of one SKU over the indexed purchase order line items,
+# overall and per vendor, optionally for one vendor or purchase order status
+class PurchaseOrderSkuSummaryAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, sku):
+        line_items = PurchaseOrderLineItem.objects.all()
+        vendor = get_vendor_param(request)
+        if vendor is not None:
+            line_items = line_items.filter(vendor_id=vendor)
+        status_value = get_status_param(request)
+        if status_value:
+            line_items = line_items.filter(purchase_order__status=status_value)
+        return Response(sku_summary(sku, line_items))
+
+
 # View for retrieving vendor performance metrics
 class VendorPerformanceAPIView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -77,11 +474,167 @@ class VendorPerformanceAPIView(generics.RetrieveAPIView):
     serializer_class = VendorSerializer
     lookup_field = "pk"
 
+    def get_object(self):
+        vendor = super().get_object()
+        return compute_vendor_metrics(vendor).apply_to(vendor)
+
+    def retrieve(self, request, *args, **kwargs):
+        vendor_id = self.kwargs[self.lookup_field]
+        entry = performance_cache.get(vendor_id)
+        if entry is None:
+            serializer = self.get_serializer(self.get_object())
+            entry = performance_cache.set(vendor_id, serializer.data)
+        payload, etag = entry
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return Response(payload, headers={"ETag": etag})
+
+
+# View for the performance cache hit/miss counters of this process
+class PerformanceCacheStatsAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(performance_cache.stats())
+
+
+# View for the request histograms of this process, in the Prometheus text format
+class RequestMetricsAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(
+            request_metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE
+        )
+
+
+class AnalyticsUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Analytics require numpy (pip install numpy)."
+    default_code = "analytics_unavailable"
+
+
+# Base view of the /api/analytics/ reports, computed with numpy over the
+# purchase orders, optionally of one vendor (?vendor=) and issued between
+# ?from= and ?to=
+class AnalyticsReportAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    report = None
+
+    def get_params(self):
+        return {}
+
+    def get(self, request):
+        if not analytics.available():
+            raise AnalyticsUnavailable()
+        queryset = PurchaseOrder.objects.all()
+        vendor = get_vendor_param(request)
+        if vendor is not None:
+            queryset = queryset.filter(vendor_id=vendor)
+        start = get_datetime_param(request, "from")
+        end = get_datetime_param(request, "to")
+        if start:
+            queryset = queryset.filter(issue_date__gte=start)
+        if end:
+            queryset = queryset.filter(issue_date__lte=end)
+        return Response(
+            analytics.run_report(self.report, queryset, **self.get_params())
+        )
+
+
+# View for the percentiles of the response time, per purchase order and vendor
+class ResponseTimeAnalyticsAPIView(AnalyticsReportAPIView):
+    report = "response_times"
+
+    def get_params(self):
+        return {"percentiles": get_percentiles_param(self.request)}
+
+
+# View for the histogram of the vendors' on-time delivery rates
+class OnTimeHistogramAnalyticsAPIView(AnalyticsReportAPIView):
+    report = "on_time_histogram"
+
+    def get_params(self):
+        return {"bins": get_int_param(self.request, "bins", 10, minimum=1, maximum=100)}
+
+
+# View for the KPIs of the purchase orders issued in each month
+class MonthlyCohortAnalyticsAPIView(AnalyticsReportAPIView):
+    report = "cohorts"
+
+
+# Ranking key -> order of the vendors, each backed by an index on Vendor.
+RANKING_ORDERS = {
+    "performance_score": ("-performance_score", "id"),
+    "on_time_delivery_rate": ("-on_time_delivery_rate", "id"),
+    "quality_rating_avg": ("-quality_rating_avg", "id"),
+    "fulfillment_rate": ("-fulfillment_rate", "id"),
+    "average_response_time": ("average_response_time", "id"),
+}
+
+
+# View for the top vendors by a stored metric with a minimum order volume
+class VendorRankingAPIView(ValuesListMixin, generics.ListAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = VendorSerializer
+
     def get_queryset(self):
-        vendor_id = self.kwargs["pk"]
-        vendor = Vendor.objects.get(pk=vendor_id)
-        vendor.on_time_delivery_rate = vendor.calculate_on_time_delivery_rate()
-        return Vendor.objects.filter(pk=vendor_id)
+        by = self.request.query_params.get("by", "performance_score")
+        if by not in RANKING_ORDERS:
+            raise serializers.ValidationError(
+                {"by": [f"Must be one of: {', '.join(RANKING_ORDERS)}."]}
+            )
+        min_orders = get_int_param(self.request, "min_orders", 0, minimum=0)
+        queryset = Vendor.objects.filter(total_pos__gte=min_orders)
+        if by == "average_response_time":
+            # Vendors without acknowledged orders have no response time.
+            queryset = queryset.filter(response_time_count__gt=0)
+        return queryset.order_by(*RANKING_ORDERS[by])
+
+    def filter_queryset(self, queryset):
+        limit = get_int_param(
+            self.request,
+            "limit",
+            10,
+            minimum=1,
+            maximum=settings.VENDOR_RANKING_MAX_LIMIT,
+        )
+        return super().filter_queryset(queryset)[:limit]
+
+
+HISTORY_BUCKETS = {"day": TruncDay, "week": TruncWeek, "month": TruncMonth}
+
+
+# View for the time series of a vendor's performance snapshots, averaged per bucket
+class VendorPerformanceHistoryAPIView(generics.ListAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = PerformanceHistorySerializer
+
+    def get_queryset(self):
+        vendor = get_object_or_404(Vendor.objects.only("pk"), pk=self.kwargs["pk"])
+        bucket = self.request.query_params.get("bucket", "day")
+        if bucket not in HISTORY_BUCKETS:
+            raise serializers.ValidationError(
+                {"bucket": [f"Must be one of: {', '.join(HISTORY_BUCKETS)}."]}
+            )
+        snapshots = HistoricalPerfomance.objects.filter(vendor=vendor)
+        start = get_datetime_param(self.request, "from")
+        end = get_datetime_param(self.request, "to")
+        if start:
+            snapshots = snapshots.filter(date__gte=start)
+        if end:
+            snapshots = snapshots.filter(date__lte=end)
+        return (
+            snapshots.annotate(bucket=HISTORY_BUCKETS[bucket]("date"))
+            .values("bucket")
+            .annotate(
+                on_time_delivery_rate=Avg("on_time_delivery_rate"),
+                quality_rating_avg=Avg("quality_rating_avg"),
+                average_response_time=Avg("average_response_time"),
+                fulfillment_rate=Avg("fulfillment_rate"),
+            )
+            .order_by("bucket")
+        )
 
 
 # View for acknowledging purchase orders